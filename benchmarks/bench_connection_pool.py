@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Connection pool benchmark
+Compares per-call latency of WordPressClient with and without keep-alive
+
+Run with: python benchmarks/bench_connection_pool.py --calls 500
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+from fake_wordpress import run_fake_wordpress
+
+os.environ.setdefault("WP_ALLOW_HTTP", "true")
+os.environ.setdefault("RATE_LIMIT", "1000000")
+
+from wp_client import WordPressClient  # noqa: E402
+
+
+def _percentile(samples, pct):
+    """Nearest-rank percentile of a list of samples"""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+async def _run(base_url: str, fake, keepalive: bool, calls: int) -> dict:
+    """Issue sequential GETs and record per-call latency"""
+    fake.reset_counters()
+    
+    client = WordPressClient(base_url, "bench", "bench", keepalive=keepalive)
+    latencies = []
+    try:
+        for i in range(calls):
+            start = time.perf_counter()
+            await client.get(f"posts/{i + 1}")
+            latencies.append((time.perf_counter() - start) * 1000)
+    finally:
+        await client.close()
+    
+    return {
+        "mode": "keep-alive" if keepalive else "force-close",
+        "calls": calls,
+        "p50_ms": statistics.median(latencies),
+        "p99_ms": _percentile(latencies, 99),
+        "mean_ms": statistics.fmean(latencies),
+        "connections": fake.connections
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=300)
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="Server-side latency per request in seconds")
+    args = parser.parse_args()
+    
+    async with run_fake_wordpress(latency=args.latency, items=args.calls) as (fake, base_url):
+        results = [
+            await _run(base_url, fake, keepalive=False, calls=args.calls),
+            await _run(base_url, fake, keepalive=True, calls=args.calls)
+        ]
+    
+    print(f"{'mode':<12} {'calls':>6} {'p50 ms':>8} {'p99 ms':>8} {'mean ms':>8} {'conns':>6}")
+    for r in results:
+        print(f"{r['mode']:<12} {r['calls']:>6} {r['p50_ms']:>8.3f} "
+              f"{r['p99_ms']:>8.3f} {r['mean_ms']:>8.3f} {r['connections']:>6}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+JSON backend micro-benchmark
+Times decode/encode of realistic post and product payloads for each
+installed JSON library, and the request-size check against the
+serialization it replaced
+
+Run with: python benchmarks/bench_json.py --items 100 --repeat 50
+"""
+
+import argparse
+import json
+import timeit
+
+from fake_wordpress import make_post, make_product
+
+from jsoncodec import encoded_size  # noqa: E402
+
+
+def available_backends() -> dict:
+    """Map backend name to (loads, compact dumps, pretty dumps)"""
+    backends = {
+        "json": (
+            json.loads,
+            lambda obj: json.dumps(obj, separators=(",", ":"), ensure_ascii=False),
+            lambda obj: json.dumps(obj, indent=2)
+        )
+    }
+    try:
+        import orjson
+        backends["orjson"] = (
+            orjson.loads,
+            lambda obj: orjson.dumps(obj).decode(),
+            lambda obj: orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+        )
+    except ImportError:
+        pass
+    try:
+        import ujson
+        backends["ujson"] = (
+            ujson.loads,
+            lambda obj: ujson.dumps(obj, ensure_ascii=False),
+            lambda obj: ujson.dumps(obj, indent=2)
+        )
+    except ImportError:
+        pass
+    return backends
+
+
+def _best_ms(func, repeat: int) -> float:
+    """Best-of-five mean time of ``func`` in milliseconds"""
+    return min(timeit.repeat(func, number=repeat, repeat=5)) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=100, help="Items per payload")
+    parser.add_argument("--repeat", type=int, default=50, help="Iterations per timing")
+    args = parser.parse_args()
+
+    payloads = {
+        "posts": [make_post(i) for i in range(1, args.items + 1)],
+        "products": [make_product(i) for i in range(1, args.items + 1)]
+    }
+
+    print(f"{'payload':<9} {'backend':<7} {'KB':>7} {'loads ms':>9} {'dumps ms':>9} {'indent ms':>10}")
+    for name, payload in payloads.items():
+        body = json.dumps(payload).encode()
+        for backend, (loads, dumps, dumps_pretty) in available_backends().items():
+            print(f"{name:<9} {backend:<7} {len(body) / 1024:>7.1f} "
+                  f"{_best_ms(lambda: loads(body), args.repeat):>9.3f} "
+                  f"{_best_ms(lambda: dumps(payload), args.repeat):>9.3f} "
+                  f"{_best_ms(lambda: dumps_pretty(payload), args.repeat):>10.3f}")
+
+    # Request-size guard: the stdlib serialization it replaced vs encoded_size
+    print()
+    print(f"{'payload':<9} {'check':<22} {'ms':>8}")
+    for name, payload in payloads.items():
+        print(f"{name:<9} {'len(json.dumps(...))':<22} "
+              f"{_best_ms(lambda: len(json.dumps(payload)), args.repeat):>8.3f}")
+        print(f"{name:<9} {'encoded_size(...)':<22} "
+              f"{_best_ms(lambda: encoded_size(payload), args.repeat):>8.3f}")
+
+if __name__ == "__main__":
+    main()
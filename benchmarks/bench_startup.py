@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Server startup benchmark
+Reports the import-time profile of server_mcp and, by spawning the server
+over stdio against the local fake WordPress, the time until the MCP
+initialize response and the first tools/list response arrive
+
+Run with: python benchmarks/bench_startup.py --runs 5 --top 15
+          python benchmarks/bench_startup.py --budget-ms 1500   (fails when initialize is slower)
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import statistics
+import sys
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+from fake_wordpress import ROOT, run_fake_wordpress
+
+SERVER_DIR = ROOT / "mcp-server"
+IMPORT_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+async def import_profile() -> List[Tuple[str, int, int]]:
+    """Run ``python -X importtime`` and return (module, cumulative us, depth) rows"""
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, "-X", "importtime", "-c", "import server_mcp",
+        cwd=str(SERVER_DIR),
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.PIPE
+    )
+    _, stderr = await process.communicate()
+    rows = []
+    for line in stderr.decode().splitlines():
+        match = IMPORT_LINE.match(line)
+        if match:
+            rows.append((match.group(4), int(match.group(2)), len(match.group(3)) // 2))
+    return rows
+
+
+async def _send(process, message: Dict) -> None:
+    process.stdin.write(json.dumps(message).encode() + b"\n")
+    await process.stdin.drain()
+
+
+async def _response(process, request_id: int) -> Dict:
+    """Read stdout lines until the response to ``request_id`` arrives"""
+    while True:
+        line = await process.stdout.readline()
+        if not line:
+            raise RuntimeError("Server exited before responding")
+        message = json.loads(line)
+        if message.get("id") == request_id:
+            return message
+
+
+async def time_handshake(config_path: str, timeout: float) -> Dict[str, float]:
+    """Spawn the server and time initialize and tools/list from process start"""
+    env = dict(os.environ, WP_MCP_CONFIG=config_path, WP_ALLOW_HTTP="true")
+    start = time.perf_counter()
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, "server_mcp.py",
+        cwd=str(SERVER_DIR), env=env,
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL
+    )
+    try:
+        await _send(process, {
+            "jsonrpc": "2.0", "id": 1, "method": "initialize",
+            "params": {
+                "protocolVersion": "2024-11-05",
+                "capabilities": {},
+                "clientInfo": {"name": "bench_startup", "version": "1.0"}
+            }
+        })
+        await asyncio.wait_for(_response(process, 1), timeout)
+        initialized = time.perf_counter()
+
+        await _send(process, {"jsonrpc": "2.0", "method": "notifications/initialized"})
+        await _send(process, {"jsonrpc": "2.0", "id": 2, "method": "tools/list"})
+        listing = await asyncio.wait_for(_response(process, 2), timeout)
+        listed = time.perf_counter()
+    finally:
+        if process.returncode is None:
+            process.kill()
+        await process.wait()
+
+    return {
+        "initialize_ms": (initialized - start) * 1000,
+        "tools_list_ms": (listed - start) * 1000,
+        "tools": len(listing.get("result", {}).get("tools", []))
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Server spawns to time")
+    parser.add_argument("--top", type=int, default=15, help="Slowest direct imports to list")
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="Server-side latency per request in seconds")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Seconds to wait for each response")
+    parser.add_argument("--budget-ms", type=float,
+                        help="Exit non-zero if the median initialize time exceeds this")
+    args = parser.parse_args()
+
+    rows = await import_profile()
+    total_us = next((cumulative for module, cumulative, _ in rows if module == "server_mcp"), 0)
+    print(f"import server_mcp: {total_us / 1000:.1f} ms")
+    print(f"{'direct import':<40} {'cumulative ms':>14}")
+    direct = sorted((r for r in rows if r[2] == 1), key=lambda r: r[1], reverse=True)
+    for module, cumulative, _ in direct[:args.top]:
+        print(f"{module:<40} {cumulative / 1000:>14.1f}")
+    print()
+
+    async with run_fake_wordpress(latency=args.latency) as (fake, base_url):
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+            json.dump({"site_url": base_url, "username": "bench", "app_password": "bench"}, f)
+        try:
+            results = [await time_handshake(f.name, args.timeout) for _ in range(args.runs)]
+        finally:
+            os.unlink(f.name)
+
+    initialize = statistics.median(r["initialize_ms"] for r in results)
+    tools_list = statistics.median(r["tools_list_ms"] for r in results)
+    print(f"{'runs':>5} {'initialize ms':>14} {'tools/list ms':>14} {'tools':>6}")
+    print(f"{args.runs:>5} {initialize:>14.1f} {tools_list:>14.1f} {results[-1]['tools']:>6}")
+
+    if args.budget_ms is not None and initialize > args.budget_ms:
+        print(f"initialize took {initialize:.1f} ms, over the {args.budget_ms:.0f} ms budget")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+End-to-end tool benchmark
+Drives the MCP tools through WordPressMCPServer.call_tool against the local
+fake WordPress/WooCommerce server and reports, per scenario, tool calls per
+second, latency percentiles, memory high-water and upstream request counts
+
+Run with: python benchmarks/bench_tools.py --calls 200 --concurrency 8 --latency 0.002
+          python benchmarks/bench_tools.py --quick --json results.json   (CI smoke run)
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import resource
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+from fake_wordpress import run_fake_wordpress
+
+os.environ.setdefault("WP_ALLOW_HTTP", "true")
+os.environ.setdefault("RATE_LIMIT", "1000000")
+os.environ.setdefault("RATE_LIMIT_BURST", "1000000")
+
+from monitoring import LatencyHistogram  # noqa: E402
+from server_mcp import WordPressMCPServer  # noqa: E402
+
+
+class Scenario:
+    """One tool and the arguments it is called with"""
+
+    __slots__ = ("name", "tool", "arguments", "calls")
+
+    def __init__(self, name: str, tool: str, arguments: Callable[[int], Dict[str, Any]],
+                 calls: Optional[int] = None):
+        """
+        Args:
+            name: Label in the report
+            tool: MCP tool name
+            arguments: Builds the arguments for call number ``i``
+            calls: Fixed call count, overriding --calls (for heavy scenarios)
+        """
+        self.name = name
+        self.tool = tool
+        self.arguments = arguments
+        self.calls = calls
+
+
+def default_scenarios(items: int) -> List[Scenario]:
+    """Read and write paths the tools use most"""
+    def spread(i):
+        return i % items + 1
+
+    products = [{"id": i, "regular_price": "21.00"} for i in range(1, min(items, 200) + 1)]
+    return [
+        Scenario("posts list", "wp_get_posts", lambda i: {"per_page": 20, "page": i % 3 + 1}),
+        Scenario("posts fetch_all", "wp_get_posts", lambda i: {"fetch_all": True}, calls=10),
+        Scenario("post hot", "wp_get_post", lambda i: {"post_id": 1}),
+        Scenario("post spread", "wp_get_post", lambda i: {"post_id": spread(i)}),
+        Scenario("posts by 50 ids", "wp_get_posts_by_ids",
+                 lambda i: {"ids": [spread(i * 50 + n) for n in range(50)]}),
+        Scenario("posts search", "wp_search_posts", lambda i: {"search": f"number {spread(i)}"}),
+        Scenario("pages list", "wp_get_pages", lambda i: {"per_page": 20}),
+        Scenario("media list", "wp_get_media", lambda i: {"per_page": 20}),
+        Scenario("products list", "wc_get_products", lambda i: {"per_page": 20}),
+        Scenario("orders list", "wc_get_orders", lambda i: {"per_page": 20, "customer": spread(i) % 40 + 1}),
+        Scenario("customers", "wc_get_customers", lambda i: {"per_page": 20}),
+        Scenario("system info", "wp_get_system_info", lambda i: {}),
+        Scenario("create post", "wp_create_post",
+                 lambda i: {"title": f"Bench {i}", "content": "<p>Body</p>"}),
+        Scenario("bulk posts batch", "wp_bulk_update_posts",
+                 lambda i: {"posts": [{"id": n, "status": "publish"} for n in range(1, min(items, 100) + 1)]},
+                 calls=5),
+        Scenario("bulk prices batch", "wc_bulk_update_prices",
+                 lambda i: {"products": products, "backend": "batch"}, calls=5),
+        Scenario("bulk prices plugin", "wc_bulk_update_prices",
+                 lambda i: {"products": products, "backend": "plugin"}, calls=5),
+    ]
+
+
+async def start_server(base_url: str, sync: bool = False) -> WordPressMCPServer:
+    """Initialize the MCP server against the fake site, bypassing config.json"""
+    if sync:
+        os.environ["WP_SYNC"] = "true"
+    server = WordPressMCPServer()
+    server._load_config = lambda: {"site_url": base_url, "username": "bench", "app_password": "bench"}
+    await server.initialize(None)
+    await server.verify_connection()
+    if server.start_sync() is not None:
+        await server.sync_engine.refresh_all()
+    return server
+
+
+def _rss_mb() -> float:
+    """Process peak resident set size in MB (Linux reports KB, macOS bytes)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+async def run_scenario(server: WordPressMCPServer, fake, scenario: Scenario,
+                       calls: int, concurrency: int, trace_memory: bool) -> Dict[str, Any]:
+    """Call one tool ``calls`` times with ``concurrency`` callers in flight"""
+    calls = scenario.calls or calls
+    latencies = LatencyHistogram()
+    errors = 0
+    counter = iter(range(calls))
+
+    async def caller():
+        nonlocal errors
+        for i in counter:
+            start = time.perf_counter()
+            content = await server.call_tool(scenario.tool, scenario.arguments(i))
+            latencies.record(time.perf_counter() - start)
+            if content[0].text.startswith(("Error:", "Unknown tool")):
+                errors += 1
+
+    fake.reset_counters()
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    await asyncio.gather(*(caller() for _ in range(min(concurrency, calls))))
+    elapsed = time.perf_counter() - start
+    peak_kb = None
+    if trace_memory:
+        peak_kb = tracemalloc.get_traced_memory()[1] / 1024
+        tracemalloc.stop()
+
+    summary = latencies.summary()
+    return {
+        "scenario": scenario.name,
+        "tool": scenario.tool,
+        "calls": calls,
+        "errors": errors,
+        "calls_per_second": round(calls / elapsed, 1) if elapsed > 0 else 0.0,
+        "p50_ms": round(summary["p50"] * 1000, 3),
+        "p90_ms": round(summary["p90"] * 1000, 3),
+        "p99_ms": round(summary["p99"] * 1000, 3),
+        "max_ms": round(summary["max"] * 1000, 3),
+        "upstream_requests": fake.requests,
+        "upstream_per_call": round(fake.requests / calls, 2),
+        "rate_limited": fake.rate_limited,
+        "traced_peak_kb": round(peak_kb, 1) if peak_kb is not None else None,
+        "rss_high_water_mb": round(_rss_mb(), 1)
+    }
+
+
+def print_report(results: List[Dict[str, Any]]) -> None:
+    """Print results as a fixed-width table"""
+    print(f"{'scenario':<20} {'calls':>6} {'err':>4} {'calls/s':>9} {'p50 ms':>8} {'p90 ms':>8} "
+          f"{'p99 ms':>8} {'upstream':>8} {'/call':>6} {'429s':>5} {'peak KB':>9} {'rss MB':>7}")
+    for r in results:
+        peak = f"{r['traced_peak_kb']:.0f}" if r["traced_peak_kb"] is not None else "-"
+        print(f"{r['scenario']:<20} {r['calls']:>6} {r['errors']:>4} {r['calls_per_second']:>9.1f} "
+              f"{r['p50_ms']:>8.2f} {r['p90_ms']:>8.2f} {r['p99_ms']:>8.2f} {r['upstream_requests']:>8} "
+              f"{r['upstream_per_call']:>6.2f} {r['rate_limited']:>5} {peak:>9} {r['rss_high_water_mb']:>7.1f}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=200, help="Tool calls per scenario")
+    parser.add_argument("--concurrency", type=int, default=8, help="Tool calls in flight")
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="Server-side latency per request in seconds")
+    parser.add_argument("--items", type=int, default=250, help="Items per fake collection")
+    parser.add_argument("--rate-limit-every", type=int, default=0,
+                        help="Answer every Nth upstream request with 429")
+    parser.add_argument("--retry-after", default="0", help="Retry-After sent with injected 429s")
+    parser.add_argument("--scenario", action="append",
+                        help="Only run scenarios whose name contains this text (repeatable)")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Report tracemalloc peak per scenario (slows the run)")
+    parser.add_argument("--sync", action="store_true",
+                        help="Enable the local mirror (WP_SYNC) and fill it before the first scenario")
+    parser.add_argument("--quick", action="store_true", help="Small run for CI smoke checks")
+    parser.add_argument("--json", metavar="PATH", help="Also write results as JSON")
+    args = parser.parse_args()
+
+    if args.quick:
+        args.calls, args.items = 20, 60
+    logging.getLogger().setLevel(logging.WARNING)
+
+    scenarios = default_scenarios(args.items)
+    if args.scenario:
+        scenarios = [s for s in scenarios if any(text in s.name for text in args.scenario)]
+    if args.quick:
+        for scenario in scenarios:
+            if scenario.calls:
+                scenario.calls = min(scenario.calls, 3)
+
+    results = []
+    async with run_fake_wordpress(latency=args.latency, items=args.items,
+                                  rate_limit_every=args.rate_limit_every,
+                                  retry_after=args.retry_after) as (fake, base_url):
+        server = await start_server(base_url, sync=args.sync)
+        try:
+            for scenario in scenarios:
+                results.append(await run_scenario(server, fake, scenario, args.calls,
+                                                  args.concurrency, args.trace_memory))
+        finally:
+            await server.close()
+
+    print_report(results)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"options": vars(args), "results": results}, f, indent=2)
+
+    if any(r["errors"] for r in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
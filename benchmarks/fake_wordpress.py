@@ -0,0 +1,538 @@
+"""
+Local stand-in for the WordPress and WooCommerce REST APIs
+Used by the benchmarks so they run offline against a predictable server
+
+Implements the wp/v2, wc/v3 and mcp/v1 routes the tools call, with
+WordPress-style pagination headers, ``_fields`` filtering, optional
+per-request latency and optional 429 injection.
+"""
+
+import asyncio
+import sys
+from collections import Counter
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from aiohttp import web
+
+# Make the mcp-server modules importable for the benchmark scripts
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT / "mcp-server"))
+
+PARAGRAPH = ("<p>Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do "
+             "eiusmod tempor incididunt ut labore et dolore magna aliqua. Été "
+             "“quoted” text &amp; entities.</p>\n")
+
+# WordPress rejects larger per_page values with 400 rest_invalid_param
+MAX_PER_PAGE = 100
+# Sub-requests accepted by one batch/v1 call (WordPress' default)
+MAX_BATCH_SIZE = 25
+
+
+def _links(route: str, item_id: int) -> dict:
+    """_links block like the one WordPress adds to every item"""
+    return {
+        rel: [{"href": f"https://example.com/wp-json/{route}/{item_id}", "embeddable": True}]
+        for rel in ("self", "collection", "about", "author", "replies",
+                    "version-history", "wp:featuredmedia", "wp:attachment", "wp:term")
+    }
+
+
+def make_post(post_id: int, paragraphs: int = 40) -> dict:
+    """A wp/v2/posts item shaped like a real response (context=view)"""
+    return {
+        "id": post_id,
+        "date": "2024-03-01T12:00:00",
+        "date_gmt": "2024-03-01T12:00:00",
+        "guid": {"rendered": f"https://example.com/?p={post_id}"},
+        "modified": "2024-03-02T08:30:00",
+        "modified_gmt": "2024-03-02T08:30:00",
+        "slug": f"post-{post_id}",
+        "status": "publish",
+        "type": "post",
+        "link": f"https://example.com/post-{post_id}/",
+        "title": {"rendered": f"Post number {post_id}"},
+        "content": {"rendered": PARAGRAPH * paragraphs, "protected": False},
+        "excerpt": {"rendered": PARAGRAPH, "protected": False},
+        "author": 1,
+        "featured_media": post_id * 3,
+        "comment_status": "open",
+        "ping_status": "open",
+        "sticky": False,
+        "template": "",
+        "format": "standard",
+        "meta": {"footnotes": ""},
+        "categories": [1, 4, 9],
+        "tags": [12, 15],
+        "_links": _links("wp/v2/posts", post_id)
+    }
+
+
+def make_page(page_id: int) -> dict:
+    """A wp/v2/pages item"""
+    page = make_post(page_id, paragraphs=20)
+    page.update({
+        "type": "page",
+        "slug": f"page-{page_id}",
+        "link": f"https://example.com/page-{page_id}/",
+        "title": {"rendered": f"Page {page_id}"},
+        "parent": 0,
+        "menu_order": 0,
+        "_links": _links("wp/v2/pages", page_id)
+    })
+    for key in ("categories", "tags", "sticky", "format"):
+        page.pop(key)
+    return page
+
+
+def make_media(media_id: int) -> dict:
+    """A wp/v2/media item for an image attachment"""
+    url = f"https://example.com/wp-content/uploads/2024/03/image-{media_id}.jpg"
+    return {
+        "id": media_id,
+        "date": "2024-03-01T12:00:00",
+        "modified": "2024-03-01T12:00:00",
+        "slug": f"image-{media_id}",
+        "status": "inherit",
+        "type": "attachment",
+        "link": f"https://example.com/image-{media_id}/",
+        "title": {"rendered": f"image-{media_id}"},
+        "author": 1,
+        "caption": {"rendered": ""},
+        "alt_text": "",
+        "media_type": "image",
+        "mime_type": "image/jpeg",
+        "media_details": {
+            "width": 1920, "height": 1080, "file": f"2024/03/image-{media_id}.jpg",
+            "sizes": {
+                size: {"file": f"image-{media_id}-{w}x{h}.jpg", "width": w, "height": h,
+                       "mime_type": "image/jpeg", "source_url": url.replace(".jpg", f"-{w}x{h}.jpg")}
+                for size, w, h in (("thumbnail", 150, 150), ("medium", 300, 169),
+                                   ("medium_large", 768, 432), ("large", 1024, 576))
+            }
+        },
+        "source_url": url,
+        "_links": _links("wp/v2/media", media_id)
+    }
+
+
+def make_product(product_id: int) -> dict:
+    """A wc/v3/products item shaped like a real response"""
+    return {
+        "id": product_id,
+        "name": f"Product {product_id}",
+        "slug": f"product-{product_id}",
+        "permalink": f"https://example.com/product/product-{product_id}/",
+        "date_created": "2024-01-10T10:00:00",
+        "date_modified": "2024-02-01T10:00:00",
+        "date_modified_gmt": "2024-02-01T10:00:00",
+        "type": "simple",
+        "status": "publish",
+        "featured": False,
+        "description": "<p>Hand-made product with a long description.</p>\n" * 15,
+        "short_description": "<p>Short description.</p>",
+        "sku": f"SKU-{product_id:05d}",
+        "price": "19.99",
+        "regular_price": "24.99",
+        "sale_price": "19.99",
+        "on_sale": True,
+        "total_sales": product_id * 7,
+        "manage_stock": True,
+        "stock_quantity": product_id % 50,
+        "stock_status": "instock",
+        "weight": "0.5",
+        "dimensions": {"length": "10", "width": "5", "height": "2"},
+        "categories": [{"id": 15, "name": "Clothing", "slug": "clothing"}],
+        "tags": [{"id": 30, "name": "Summer", "slug": "summer"}],
+        "images": [
+            {"id": product_id * 10 + i, "src": f"https://example.com/wp-content/uploads/p{product_id}-{i}.jpg",
+             "name": f"p{product_id}-{i}", "alt": ""}
+            for i in range(4)
+        ],
+        "attributes": [{"id": 1, "name": "Size", "options": ["S", "M", "L", "XL"], "visible": True}],
+        "meta_data": [{"id": product_id * 100 + i, "key": f"_meta_{i}", "value": str(i)} for i in range(10)],
+        "_links": {"self": [{"href": f"https://example.com/wp-json/wc/v3/products/{product_id}"}],
+                   "collection": [{"href": "https://example.com/wp-json/wc/v3/products"}]}
+    }
+
+
+def make_order(order_id: int) -> dict:
+    """A wc/v3/orders item"""
+    address = {"first_name": "Ada", "last_name": "Lovelace", "address_1": "1 Main St",
+               "city": "London", "postcode": "N1", "country": "GB",
+               "email": f"customer{order_id % 40}@example.com", "phone": "555-0100"}
+    return {
+        "id": order_id,
+        "status": "processing",
+        "currency": "USD",
+        "date_created": "2024-03-05T09:00:00",
+        "total": f"{19.99 * (order_id % 5 + 1):.2f}",
+        "customer_id": order_id % 40 + 1,
+        "billing": address,
+        "shipping": {k: v for k, v in address.items() if k not in ("email", "phone")},
+        "payment_method": "stripe",
+        "line_items": [{"id": order_id * 10 + i, "product_id": i + 1, "quantity": 1,
+                        "total": "19.99", "sku": f"SKU-{i + 1:05d}"} for i in range(3)],
+        "meta_data": [],
+        "_links": {"self": [{"href": f"https://example.com/wp-json/wc/v3/orders/{order_id}"}]}
+    }
+
+
+def make_customer(customer_id: int) -> dict:
+    """A wc/v3/customers item"""
+    return {
+        "id": customer_id,
+        "date_created": "2023-11-01T10:00:00",
+        "email": f"customer{customer_id}@example.com",
+        "first_name": "Ada",
+        "last_name": f"Customer {customer_id}",
+        "role": "customer",
+        "username": f"customer{customer_id}",
+        "billing": {"city": "London", "country": "GB"},
+        "shipping": {"city": "London", "country": "GB"},
+        "is_paying_customer": True,
+        "avatar_url": "https://secure.gravatar.com/avatar/0",
+        "meta_data": [],
+        "_links": {"self": [{"href": f"https://example.com/wp-json/wc/v3/customers/{customer_id}"}]}
+    }
+
+
+SYSTEM_INFO = {
+    "wordpress": {"version": "6.5", "site_url": "https://example.com",
+                  "active_theme": "twentytwentyfour", "is_multisite": False},
+    "php": {"version": "8.2", "memory_limit": "256M", "max_execution_time": "30"},
+    "server": {"software": "nginx", "mysql_version": "8.0"},
+    "woocommerce": {"version": "8.7"}
+}
+
+PLUGINS = [
+    {"plugin": f"plugin-{i}/plugin-{i}.php", "name": f"Plugin {i}", "version": "1.0.0",
+     "status": "active" if i % 3 else "inactive", "author": "Example", "description": {"raw": "", "rendered": ""}}
+    for i in range(20)
+]
+
+THEMES = [
+    {"stylesheet": name, "name": {"rendered": name.title()}, "version": "1.0",
+     "status": "active" if name == "twentytwentyfour" else "inactive", "author": {"rendered": "WordPress"}}
+    for name in ("twentytwentyfour", "twentytwentythree", "astra")
+]
+
+
+def _modified(item: dict) -> str:
+    """Last-modified timestamp of a post-like or WooCommerce item"""
+    return item.get("modified") or item.get("date_modified_gmt") or ""
+
+
+def _touch(item: dict) -> None:
+    """Bump the modified timestamps after a write, as WordPress does"""
+    now = datetime.now(timezone.utc).replace(microsecond=0, tzinfo=None).isoformat()
+    for key in ("modified", "modified_gmt", "date_modified", "date_modified_gmt"):
+        if key in item:
+            item[key] = now
+
+
+def project(item: dict, fields: List[str]) -> dict:
+    """Apply a WordPress ``_fields`` list, including dotted nested fields"""
+    result: Dict = {}
+    for field in fields:
+        source, target = item, result
+        parts = field.split(".")
+        for depth, part in enumerate(parts):
+            if not isinstance(source, dict) or part not in source:
+                break
+            if depth == len(parts) - 1:
+                target[part] = source[part]
+            else:
+                source = source[part]
+                target = target.setdefault(part, {})
+    return result
+
+
+class FakeWordPress:
+    """aiohttp application emulating the routes the tools use"""
+
+    def __init__(self, latency: float = 0.0, items: int = 250,
+                 rate_limit_every: int = 0, retry_after: str = "0"):
+        """
+        Args:
+            latency: Seconds added to every request
+            items: Items in each collection (posts, pages, media, products, orders, customers)
+            rate_limit_every: Answer every Nth request with 429 (0 disables)
+            retry_after: Retry-After header value sent with injected 429s
+        """
+        self.latency = latency
+        self.rate_limit_every = rate_limit_every
+        self.retry_after = retry_after
+        self.requests = 0
+        self.connections = 0
+        self.rate_limited = 0
+        self.bytes_received = 0
+        self.routes: Counter = Counter()
+        self._seen_peers = set()
+
+        self.collections: Dict[str, Dict[int, dict]] = {
+            "wp/v2/posts": {i: make_post(i) for i in range(1, items + 1)},
+            "wp/v2/pages": {i: make_page(i) for i in range(1, items + 1)},
+            "wp/v2/media": {i: make_media(i) for i in range(1, items + 1)},
+            "wc/v3/products": {i: make_product(i) for i in range(1, items + 1)},
+            "wc/v3/orders": {i: make_order(i) for i in range(1, items + 1)},
+            "wc/v3/customers": {i: make_customer(i) for i in range(1, items + 1)}
+        }
+
+        self.app = web.Application(middlewares=[self._count_middleware],
+                                    client_max_size=1024 ** 3)
+        router = self.app.router
+        router.add_get("/wp-json/wp/v2/users/me", self.users_me)
+        router.add_get("/wp-json/wp/v2/plugins", self.plugins)
+        router.add_get("/wp-json/wp/v2/themes", self.themes)
+        router.add_post("/wp-json/wp/v2/media", self.upload_media)
+        router.add_post("/wp-json/wc/v3/products/batch", self.products_batch)
+        router.add_post("/wp-json/batch/v1", self.batch_v1)
+        router.add_get("/wp-json/mcp/v1/system/info", self.system_info)
+        router.add_post("/wp-json/mcp/v1/woocommerce/bulk-update", self.plugin_bulk_update)
+        for route in self.collections:
+            router.add_get(f"/wp-json/{route}", self.list_items)
+            router.add_post(f"/wp-json/{route}", self.create_item)
+            router.add_get(f"/wp-json/{route}/{{id:\\d+}}", self.get_item)
+            router.add_route("PUT", f"/wp-json/{route}/{{id:\\d+}}", self.update_item)
+            router.add_post(f"/wp-json/{route}/{{id:\\d+}}", self.update_item)
+            router.add_delete(f"/wp-json/{route}/{{id:\\d+}}", self.delete_item)
+
+    @web.middleware
+    async def _count_middleware(self, request, handler):
+        """Count requests and connections, add latency and inject 429s"""
+        self.requests += 1
+        resource = request.match_info.route.resource
+        self.routes[f"{request.method} {resource.canonical if resource else request.path}"] += 1
+        peer = request.transport.get_extra_info("peername") if request.transport else None
+        if peer not in self._seen_peers:
+            self._seen_peers.add(peer)
+            self.connections += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.rate_limit_every and self.requests % self.rate_limit_every == 0:
+            self.rate_limited += 1
+            await request.read()
+            return web.json_response(
+                {"code": "rest_too_many_requests", "message": "Too many requests"},
+                status=429, headers={"Retry-After": self.retry_after}
+            )
+        return await handler(request)
+
+    def reset_counters(self):
+        """Zero the request and connection counters between runs"""
+        self.requests = 0
+        self.connections = 0
+        self.rate_limited = 0
+        self.bytes_received = 0
+        self.routes.clear()
+        self._seen_peers.clear()
+
+    # Helpers
+
+    def _collection(self, request) -> Dict[int, dict]:
+        route = request.match_info.route.resource.canonical[len("/wp-json/"):]
+        return self.collections[route.split("/{")[0]]
+
+    @staticmethod
+    def _fields(request) -> Optional[List[str]]:
+        value = request.query.get("_fields")
+        return [f for f in value.split(",") if f] if value else None
+
+    def _respond(self, request, data, status: int = 200, headers: Optional[dict] = None):
+        fields = self._fields(request)
+        if fields:
+            data = [project(i, fields) for i in data] if isinstance(data, list) else project(data, fields)
+        return web.json_response(data, status=status, headers=headers)
+
+    @staticmethod
+    def _error(code: str, message: str, status: int):
+        return web.json_response({"code": code, "message": message, "data": {"status": status}},
+                                 status=status)
+
+    # wp/v2 and wc/v3 collections
+
+    async def list_items(self, request):
+        query = request.query
+        items = list(self._collection(request).values())
+
+        if "include" in query:
+            wanted = {int(i) for i in query["include"].split(",") if i}
+            items = [i for i in items if i["id"] in wanted]
+        if "search" in query:
+            term = query["search"].lower()
+            items = [i for i in items
+                     if term in str(i.get("title", {}).get("rendered", i.get("name", ""))).lower()]
+        if "modified_after" in query:
+            items = [i for i in items if _modified(i) > query["modified_after"]]
+        if query.get("status") not in (None, "any"):
+            items = [i for i in items if i.get("status") == query["status"]]
+        if "parent" in query and items and "parent" in items[0]:
+            items = [i for i in items if str(i["parent"]) == query["parent"]]
+
+        per_page = int(query.get("per_page", 10))
+        page = int(query.get("page", 1))
+        if per_page < 1 or per_page > MAX_PER_PAGE:
+            return self._error("rest_invalid_param", "Invalid parameter(s): per_page", 400)
+        total_pages = max(1, -(-len(items) // per_page))
+        if page > total_pages and items:
+            return self._error("rest_post_invalid_page_number",
+                               "The page number requested is larger than the number of pages available.", 400)
+
+        chunk = items[(page - 1) * per_page:page * per_page]
+        headers = {"X-WP-Total": str(len(items)), "X-WP-TotalPages": str(total_pages)}
+        return self._respond(request, chunk, headers=headers)
+
+    async def get_item(self, request):
+        item = self._collection(request).get(int(request.match_info["id"]))
+        if item is None:
+            return self._error("rest_post_invalid_id", "Invalid ID.", 404)
+        return self._respond(request, item)
+
+    async def create_item(self, request):
+        collection = self._collection(request)
+        data = await request.json()
+        item_id = max(collection, default=0) + 1
+        item = {**data, "id": item_id, "link": f"https://example.com/?p={item_id}"}
+        collection[item_id] = item
+        return self._respond(request, item, status=201)
+
+    async def update_item(self, request):
+        collection = self._collection(request)
+        item = collection.get(int(request.match_info["id"]))
+        if item is None:
+            return self._error("rest_post_invalid_id", "Invalid ID.", 404)
+        item.update(await request.json())
+        _touch(item)
+        return self._respond(request, item)
+
+    async def delete_item(self, request):
+        item = self._collection(request).pop(int(request.match_info["id"]), None)
+        if item is None:
+            return self._error("rest_post_invalid_id", "Invalid ID.", 404)
+        return web.json_response({"deleted": True, "previous": item})
+
+    # Other wp/v2 routes
+
+    async def users_me(self, request):
+        return web.json_response({"id": 1, "name": "bench"})
+
+    async def plugins(self, request):
+        status = request.query.get("status")
+        return self._respond(request, [p for p in PLUGINS if not status or p["status"] == status])
+
+    async def themes(self, request):
+        return self._respond(request, THEMES)
+
+    async def upload_media(self, request):
+        size = 0
+        async for chunk in request.content.iter_chunked(256 * 1024):
+            size += len(chunk)
+        self.bytes_received += size
+        media = self.collections["wp/v2/media"]
+        media_id = max(media, default=0) + 1
+        item = make_media(media_id)
+        item["title"]["rendered"] = request.query.get("title", item["title"]["rendered"])
+        media[media_id] = item
+        return web.json_response(item, status=201)
+
+    # Core batch framework
+
+    async def batch_v1(self, request):
+        """Run wp/v2 collection writes the way WordPress' batch/v1 does"""
+        body = await request.json()
+        requests = body.get("requests", [])
+        if len(requests) > MAX_BATCH_SIZE:
+            return self._error("rest_invalid_param",
+                               f"requests must contain at most {MAX_BATCH_SIZE} items.", 400)
+        responses = []
+        for sub in requests:
+            path = sub.get("path", "").split("?")[0].strip("/")
+            route, _, item_id = path.rpartition("/")
+            if not item_id.isdigit():
+                route, item_id = path, ""
+            collection = self.collections.get(route) if route.startswith("wp/v2/") else None
+            if collection is None:
+                responses.append({"status": 404, "body": {"code": "rest_no_route",
+                                                          "message": "No route was found matching the URL and request method."}})
+                continue
+            method = sub.get("method", "POST").upper()
+            data = sub.get("body") or {}
+            if not item_id and method == "POST":
+                new_id = max(collection, default=0) + 1
+                collection[new_id] = {**data, "id": new_id, "link": f"https://example.com/?p={new_id}"}
+                responses.append({"status": 201, "body": collection[new_id]})
+                continue
+            item = collection.get(int(item_id)) if item_id else None
+            if item is None:
+                responses.append({"status": 404, "body": {"code": "rest_post_invalid_id", "message": "Invalid post ID."}})
+            elif method == "DELETE":
+                responses.append({"status": 200, "body": {"deleted": True, "previous": collection.pop(item["id"])}})
+            else:
+                item.update(data)
+                _touch(item)
+                responses.append({"status": 200, "body": item})
+        return web.json_response({"responses": responses}, status=207)
+
+    # wc/v3 batch and mcp/v1 routes
+
+    async def products_batch(self, request):
+        products = self.collections["wc/v3/products"]
+        body = await request.json()
+        response = {}
+        for product in body.get("create", []):
+            product_id = max(products, default=0) + 1
+            products[product_id] = {**product, "id": product_id}
+            response.setdefault("create", []).append(products[product_id])
+        for product in body.get("update", []):
+            if product.get("id") in products:
+                products[product["id"]].update(product)
+                _touch(products[product["id"]])
+                response.setdefault("update", []).append(products[product["id"]])
+            else:
+                response.setdefault("update", []).append(
+                    {"id": product.get("id"), "error": {"code": "woocommerce_rest_product_invalid_id",
+                                                        "message": "Invalid ID."}})
+        for product_id in body.get("delete", []):
+            deleted = products.pop(product_id, None)
+            response.setdefault("delete", []).append(
+                deleted or {"id": product_id, "error": {"code": "woocommerce_rest_product_invalid_id",
+                                                        "message": "Invalid ID."}})
+        return web.json_response(response)
+
+    async def system_info(self, request):
+        return web.json_response(SYSTEM_INFO)
+
+    async def plugin_bulk_update(self, request):
+        products = self.collections["wc/v3/products"]
+        body = await request.json()
+        results = []
+        for product in body.get("items", []):
+            found = products.get(product.get("id"))
+            if found is None:
+                results.append({"id": product.get("id"), "success": False, "error": "Product not found"})
+                continue
+            found.update({k: v for k, v in product.items() if k != "id"})
+            _touch(found)
+            results.append({"id": product["id"], "success": True})
+        return web.json_response({"success": True, "results": results})
+
+
+@asynccontextmanager
+async def run_fake_wordpress(latency: float = 0.0, host: str = "127.0.0.1", **options):
+    """Start the stand-in server on a free port and yield (server, base_url)
+
+    Extra keyword arguments are passed to FakeWordPress.
+    """
+    fake = FakeWordPress(latency=latency, **options)
+    runner = web.AppRunner(fake.app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, host, 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    try:
+        yield fake, f"http://{host}:{port}"
+    finally:
+        await runner.cleanup()
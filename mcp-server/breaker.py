@@ -0,0 +1,161 @@
+"""
+Circuit breakers for WordPress MCP
+Stops sending requests to an API namespace that keeps failing and lets a
+single probe through after a cool-down to find out whether it recovered
+"""
+
+import logging
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+from cache import ResponseCache
+
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+# Value of the circuit_state gauge for each state
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request while a circuit is open"""
+    
+    def __init__(self, family: str, retry_in: float):
+        super().__init__(f"WordPress API {family} is failing; not retrying for {retry_in:.0f} more seconds")
+        self.family = family
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker for one API namespace
+    
+    Closed: requests flow and consecutive failures are counted. After
+    ``failure_threshold`` of them the breaker opens and every request fails
+    immediately for ``reset_timeout`` seconds. It then goes half-open and
+    lets one probe request through: success closes it, failure opens it
+    for another ``reset_timeout``.
+    
+    Only timeouts, connection errors and 5xx responses count as failures;
+    any other answer shows the host is up.
+    """
+    
+    __slots__ = ('family', 'failure_threshold', 'reset_timeout', 'state', 'failures',
+                 'opened_at', 'probing', 'trips')
+    
+    def __init__(self, family: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.family = family
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probing = False
+        self.trips = 0
+    
+    def _now(self) -> float:
+        return time.monotonic()
+    
+    def retry_in(self) -> float:
+        """Seconds until an open breaker lets a probe through"""
+        if self.state != OPEN:
+            return 0.0
+        return max(0.0, self.opened_at + self.reset_timeout - self._now())
+    
+    def before_request(self) -> None:
+        """Admit a request or raise CircuitOpenError"""
+        if self.state == OPEN and self.retry_in() <= 0:
+            self.state = HALF_OPEN
+            logger.info(f"Circuit {self.family} half-open, sending a probe request")
+        if self.state == HALF_OPEN:
+            if self.probing:
+                raise CircuitOpenError(self.family, 0.0)
+            self.probing = True
+        elif self.state == OPEN:
+            raise CircuitOpenError(self.family, self.retry_in())
+    
+    def record(self, status: Optional[str]) -> None:
+        """
+        Record the outcome of an admitted request
+        
+        Args:
+            status: Response status code, "error" when no response arrived,
+                or None when the request was abandoned (cancelled) before
+                an outcome was known
+        """
+        if self.state == HALF_OPEN:
+            self.probing = False
+        if status is None:
+            return
+        if status == 'error' or status.startswith('5'):
+            self._failure()
+        else:
+            if self.state != CLOSED:
+                logger.info(f"Circuit {self.family} closed, API is answering again")
+            self.state = CLOSED
+            self.failures = 0
+    
+    def _failure(self) -> None:
+        self.failures += 1
+        if self.state == HALF_OPEN or (self.state == CLOSED and self.failures >= self.failure_threshold):
+            self.state = OPEN
+            self.opened_at = self._now()
+            self.trips += 1
+            logger.warning(f"Circuit {self.family} open after {self.failures} failures; "
+                           f"failing fast for {self.reset_timeout:.0f}s")
+    
+    def status(self) -> Dict[str, object]:
+        """State summary for health checks"""
+        return {
+            'state': self.state,
+            'failures': self.failures,
+            'trips': self.trips,
+            'retry_in_seconds': round(self.retry_in(), 1)
+        }
+
+
+class CircuitBreakers:
+    """One CircuitBreaker per API namespace (wp/v2, wc/v3, mcp/v1, ...)
+    
+    Breakers are created on first use. Settings come from
+    WP_BREAKER_THRESHOLD and WP_BREAKER_RESET; WP_BREAKER=false disables
+    them so every request is sent.
+    """
+    
+    def __init__(self, failure_threshold: Optional[int] = None, reset_timeout: Optional[float] = None,
+                 enabled: Optional[bool] = None):
+        if enabled is None:
+            enabled = os.getenv('WP_BREAKER', 'true').lower() == 'true'
+        self.enabled = enabled
+        self.failure_threshold = failure_threshold or int(os.getenv('WP_BREAKER_THRESHOLD', '5'))
+        self.reset_timeout = reset_timeout or float(os.getenv('WP_BREAKER_RESET', '30'))
+        self.breakers: Dict[str, CircuitBreaker] = {}
+    
+    @staticmethod
+    def family_for(url: str) -> str:
+        """API namespace of a URL, e.g. 'wc/v3' for .../wp-json/wc/v3/products/5"""
+        route = ResponseCache.route_for(url)
+        return '/'.join(route.split('/')[:2]) or 'index'
+    
+    def for_url(self, url: str) -> Optional[CircuitBreaker]:
+        """Breaker guarding ``url``, or None when breakers are disabled"""
+        if not self.enabled:
+            return None
+        family = self.family_for(url)
+        breaker = self.breakers.get(family)
+        if breaker is None:
+            breaker = self.breakers[family] = CircuitBreaker(family, self.failure_threshold,
+                                                             self.reset_timeout)
+        return breaker
+    
+    def status(self) -> Dict[str, Dict[str, object]]:
+        """Namespace -> breaker state summary"""
+        return {family: breaker.status() for family, breaker in self.breakers.items()}
+    
+    def samples(self) -> List[Tuple[Dict[str, str], int]]:
+        """circuit_state gauge samples (0 closed, 1 half-open, 2 open)"""
+        return [({"family": family}, STATE_VALUES[breaker.state])
+                for family, breaker in self.breakers.items()]
@@ -0,0 +1,220 @@
+"""
+Bulk execution helpers for WordPress MCP
+Runs per-item API calls concurrently with a bounded number of workers
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# WordPress and WooCommerce list at most 100 items per request
+MAX_PER_PAGE = 100
+
+
+class BulkExecutor:
+    """Bounded-concurrency executor for per-item tool loops"""
+    
+    def __init__(self, concurrency: Optional[int] = None):
+        """
+        Initialize bulk executor
+        
+        Args:
+            concurrency: Maximum number of items in flight (default BULK_CONCURRENCY or 5)
+        """
+        if concurrency is None:
+            concurrency = int(os.getenv('BULK_CONCURRENCY', '5'))
+        self.concurrency = max(1, concurrency)
+    
+    @classmethod
+    def for_client(cls, wp_client, concurrency: Optional[int] = None) -> "BulkExecutor":
+        """Create an executor sized to the client's connection pool
+        
+        Workers never outnumber the client's per-host connection limit, so
+        requests do not queue inside the connector. Each request still goes
+        through the client's rate limiter.
+        """
+        executor = cls(concurrency)
+        per_host = getattr(wp_client, 'pool_limit_per_host', None)
+        if per_host:
+            executor.concurrency = min(executor.concurrency, per_host)
+        return executor
+    
+    async def map(self, items: Iterable[Any],
+                  worker: Callable[[Any], Awaitable[Any]]) -> Tuple[List[Any], Dict[str, Any]]:
+        """
+        Run ``worker`` over every item
+        
+        Args:
+            items: Items to process
+            worker: Coroutine function called once per item
+            
+        Returns:
+            Tuple of (results, stats). ``results`` matches the input order and
+            holds either the worker's return value or the exception it raised,
+            like ``asyncio.gather(..., return_exceptions=True)``.
+        """
+        items = list(items)
+        results: List[Any] = [None] * len(items)
+        pending = iter(enumerate(items))
+        
+        async def run_worker():
+            # The iterator is shared between workers; next() never awaits,
+            # so each index is handed to exactly one worker
+            for index, item in pending:
+                try:
+                    results[index] = await worker(item)
+                except Exception as e:
+                    results[index] = e
+        
+        start = time.perf_counter()
+        workers = min(self.concurrency, len(items))
+        if workers:
+            await asyncio.gather(*(run_worker() for _ in range(workers)))
+        elapsed = time.perf_counter() - start
+        
+        stats = summarize(results, elapsed)
+        stats["concurrency"] = workers
+        
+        if items:
+            logger.info(f"Bulk run: {stats['processed']} items in {stats['elapsed_seconds']}s "
+                        f"({stats['items_per_second']}/s, {stats['failed']} failed)")
+        
+        return results, stats
+
+
+def chunked(items: List[Any], size: int) -> List[List[Any]]:
+    """Split a list into consecutive chunks of at most ``size`` items"""
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def bulk_response(items: List[Any], results: List[Any], stats: Dict[str, Any],
+                  identify: Callable[[Any, Any], Dict]) -> Dict[str, Any]:
+    """
+    Pair bulk results with their inputs, keeping input order
+    
+    Args:
+        items: Inputs of the bulk run
+        results: Value-or-exception per input, as returned by BulkExecutor.map
+        stats: Run stats merged into the response
+        identify: Builds the entry for (item, result); result is None on failure
+    """
+    formatted = []
+    for item, result in zip(items, results):
+        entry = identify(item, None if isinstance(result, Exception) else result)
+        if isinstance(result, Exception):
+            entry.update({"success": False, "error": str(result)})
+        else:
+            entry["success"] = True
+        formatted.append(entry)
+    
+    return {
+        **stats,
+        "results": formatted
+    }
+
+
+def unpack_chunks(chunks: List[List[Any]], outcomes: List[Any], chunk_stats: Dict[str, Any], elapsed: float,
+                  resolve: Callable[[Any, int, Any], Any]) -> Tuple[List[Any], Dict[str, Any]]:
+    """
+    Map the answers to chunked requests back onto the items they carried
+    
+    Args:
+        chunks: Items as sent, one list per request
+        outcomes: Answer or exception per chunk, as returned by BulkExecutor.map
+        chunk_stats: Stats of the chunk run (for its concurrency)
+        elapsed: Seconds the whole run took
+        resolve: Returns the value or exception for (item, index in chunk, answer)
+    
+    Returns:
+        Tuple of (results, stats) per item, like BulkExecutor.map. Every
+        item of a failed request gets that request's exception.
+    """
+    results: List[Any] = []
+    for chunk, outcome in zip(chunks, outcomes):
+        if isinstance(outcome, Exception):
+            results.extend([outcome] * len(chunk))
+        else:
+            results.extend(resolve(item, index, outcome) for index, item in enumerate(chunk))
+    
+    stats = summarize(results, elapsed)
+    stats["requests"] = len(chunks)
+    stats["concurrency"] = chunk_stats["concurrency"]
+    return results, stats
+
+
+def summarize(results: List[Any], elapsed: float) -> Dict[str, Any]:
+    """Build throughput stats for a list of per-item results"""
+    failed = sum(1 for r in results if isinstance(r, Exception))
+    return {
+        "processed": len(results),
+        "succeeded": len(results) - failed,
+        "failed": failed,
+        "elapsed_seconds": round(elapsed, 3),
+        "items_per_second": round(len(results) / elapsed, 2) if elapsed > 0 else 0.0
+    }
+
+
+async def fetch_by_ids(wp_client, endpoint: str, ids: Iterable[int], params: Optional[Dict] = None,
+                       executor: Optional[BulkExecutor] = None,
+                       chunk_size: int = MAX_PER_PAGE) -> Tuple[Dict[int, Dict], Dict[str, Any]]:
+    """
+    Fetch collection items by ID with ``include=`` list requests
+    
+    IDs are de-duplicated and split into chunks of ``chunk_size``; the
+    chunks are requested concurrently, so N items cost ceil(N / 100)
+    requests instead of N.
+    
+    Args:
+        wp_client: WordPressClient
+        endpoint: Collection endpoint, e.g. "posts" or "wc/products"
+        ids: Item IDs
+        params: Extra query parameters (status, _fields, ...)
+        executor: Executor bounding concurrent chunks (default: sized to the client)
+        chunk_size: IDs per request, at most MAX_PER_PAGE
+        
+    Returns:
+        Tuple of (items, report). ``items`` maps ID -> item in request
+        order. ``report`` counts what was found, lists IDs the site did not
+        return under "missing" and IDs whose request failed under "failed".
+    """
+    ids = list(dict.fromkeys(int(i) for i in ids))
+    chunks = chunked(ids, min(chunk_size, MAX_PER_PAGE))
+    params = dict(params or {})
+    fields = params.get("_fields")
+    if fields and "id" not in fields.split(","):
+        params["_fields"] = f"{fields},id"
+    
+    async def fetch(chunk):
+        return await wp_client.get(endpoint, {
+            **params,
+            "include": ",".join(str(i) for i in chunk),
+            "per_page": len(chunk)
+        })
+    
+    executor = executor or BulkExecutor.for_client(wp_client)
+    start = time.perf_counter()
+    results, stats = await executor.map(chunks, fetch)
+    
+    fetched: Dict[int, Dict] = {}
+    failed = []
+    for chunk, outcome in zip(chunks, results):
+        if isinstance(outcome, Exception):
+            failed.append({"ids": chunk, "error": str(outcome)})
+        elif isinstance(outcome, list):
+            fetched.update((item["id"], item) for item in outcome if isinstance(item, dict) and "id" in item)
+    
+    failed_ids = {i for entry in failed for i in entry["ids"]}
+    items = {i: fetched[i] for i in ids if i in fetched}
+    return items, {
+        "requested": len(ids),
+        "found": len(items),
+        "missing": [i for i in ids if i not in items and i not in failed_ids],
+        "failed": failed,
+        "requests": len(chunks),
+        "concurrency": stats["concurrency"],
+        "elapsed_seconds": round(time.perf_counter() - start, 3)
+    }
@@ -0,0 +1,209 @@
+"""
+Response cache for WordPress MCP
+In-process LRU cache for read-only GET responses with TTL and ETag revalidation
+"""
+
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+
+logger = logging.getLogger(__name__)
+
+# Seconds a response stays fresh, matched by route prefix (after /wp-json/).
+# Routes that are not listed are never cached.
+DEFAULT_TTLS: List[Tuple[str, float]] = [
+    ("wp/v2/posts", 30),
+    ("wp/v2/pages", 30),
+    ("wp/v2/media", 60),
+    ("wp/v2/themes", 300),
+    ("wp/v2/plugins", 300),
+    ("mcp/v1/system/info", 60),
+    ("mcp/v1/templates", 60),
+    ("wc/v3/products", 30),
+]
+
+
+class CacheEntry:
+    """A cached response body with its validators"""
+    
+    __slots__ = ('data', 'route', 'size', 'expires_at', 'etag', 'last_modified')
+    
+    def __init__(self, data: Any, route: str, size: int, expires_at: float,
+                 etag: Optional[str] = None, last_modified: Optional[str] = None):
+        self.data = data
+        self.route = route
+        self.size = size
+        self.expires_at = expires_at
+        self.etag = etag
+        self.last_modified = last_modified
+    
+    def is_fresh(self, now: float) -> bool:
+        """Check if the entry can be served without contacting the server"""
+        return now < self.expires_at
+    
+    def validators(self) -> Dict[str, str]:
+        """Conditional request headers for revalidating a stale entry"""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """Byte-bounded LRU cache of GET responses"""
+    
+    def __init__(self, max_bytes: Optional[int] = None,
+                 ttls: Optional[List[Tuple[str, float]]] = None, metrics=None):
+        """
+        Initialize response cache
+        
+        Args:
+            max_bytes: Upper bound on cached body bytes (default WP_CACHE_MAX_BYTES or 16MB)
+            ttls: (route prefix, seconds) pairs; longest matching prefix wins
+            metrics: Optional MetricsCollector receiving cache_* counters
+        """
+        if max_bytes is None:
+            max_bytes = int(os.getenv('WP_CACHE_MAX_BYTES', str(16 * 1024 * 1024)))
+        self.max_bytes = max_bytes
+        self.ttls = sorted(ttls if ttls is not None else DEFAULT_TTLS,
+                           key=lambda rule: len(rule[0]), reverse=True)
+        self.metrics = metrics
+        
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self.total_bytes = 0
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'revalidations': 0,
+            'evictions': 0,
+            'invalidations': 0
+        }
+    
+    # Keys and routes
+    
+    @staticmethod
+    def route_for(url: str) -> str:
+        """Return the REST route of a URL, e.g. 'wp/v2/posts/5'"""
+        path = urlsplit(url).path
+        marker = '/wp-json/'
+        if marker in path:
+            path = path.split(marker, 1)[1]
+        return path.strip('/')
+    
+    @staticmethod
+    def make_key(url: str, params: Optional[Dict] = None) -> str:
+        """Normalize URL and params into a cache key"""
+        parts = urlsplit(url)
+        query = []
+        if parts.query:
+            for pair in parts.query.split('&'):
+                name, _, value = pair.partition('=')
+                query.append((name, value))
+        if params:
+            query.extend((str(k), str(v)) for k, v in params.items() if v is not None)
+        base = f"{parts.scheme}://{parts.netloc.lower()}{parts.path.rstrip('/')}"
+        return f"{base}?{urlencode(sorted(query))}" if query else base
+    
+    @staticmethod
+    def family_for(route: str) -> str:
+        """Collection a route belongs to, e.g. 'wp/v2/posts' for 'wp/v2/posts/5'"""
+        return '/'.join(route.split('/')[:3])
+    
+    def ttl_for(self, url: str) -> float:
+        """TTL in seconds for a URL, 0 when the route is not cacheable"""
+        route = self.route_for(url)
+        for prefix, ttl in self.ttls:
+            if route == prefix or route.startswith(prefix + '/'):
+                return ttl
+        return 0
+    
+    # Lookups
+    
+    def lookup(self, key: str) -> Tuple[Optional[CacheEntry], bool]:
+        """
+        Find a cached entry
+        
+        Returns:
+            Tuple of (entry, fresh). A stale entry is still returned so its
+            validators can be used for a conditional request.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self._count('misses')
+            return None, False
+        
+        self._entries.move_to_end(key)
+        if entry.is_fresh(time.monotonic()):
+            self._count('hits')
+            return entry, True
+        
+        self._count('misses')
+        return entry, False
+    
+    def store(self, key: str, url: str, data: Any, size: int, headers=None) -> None:
+        """Cache a response body"""
+        ttl = self.ttl_for(url)
+        if ttl <= 0 or size > self.max_bytes:
+            return
+        
+        headers = headers or {}
+        self._remove(key)
+        self._entries[key] = CacheEntry(
+            data=data,
+            route=self.route_for(url),
+            size=size,
+            expires_at=time.monotonic() + ttl,
+            etag=headers.get('ETag'),
+            last_modified=headers.get('Last-Modified')
+        )
+        self.total_bytes += size
+        
+        while self.total_bytes > self.max_bytes and self._entries:
+            evicted_key = next(iter(self._entries))
+            self._remove(evicted_key)
+            self._count('evictions')
+    
+    def revalidated(self, key: str, url: str) -> Optional[CacheEntry]:
+        """Mark a stale entry fresh again after a 304 Not Modified"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        entry.expires_at = time.monotonic() + self.ttl_for(url)
+        self._count('revalidations')
+        return entry
+    
+    # Invalidation
+    
+    def invalidate(self, url: str) -> int:
+        """Drop every entry in the collection a write to ``url`` touches"""
+        family = self.family_for(self.route_for(url))
+        stale = [key for key, entry in self._entries.items()
+                 if entry.route == family or entry.route.startswith(family + '/')]
+        for key in stale:
+            self._remove(key)
+        if stale:
+            self._count('invalidations', len(stale))
+        return len(stale)
+    
+    def clear(self) -> None:
+        """Remove all entries"""
+        self._entries.clear()
+        self.total_bytes = 0
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.total_bytes -= entry.size
+    
+    def _count(self, stat: str, value: int = 1) -> None:
+        self.stats[stat] += value
+        if self.metrics is not None:
+            self.metrics.increment(f"cache_{stat}", value)
@@ -0,0 +1,168 @@
+"""
+Adaptive concurrency for WordPress MCP
+Finds how many requests a site can take at once: the in-flight limit grows
+by one while latency stays flat and shrinks multiplicatively on 429s, 5xx
+answers, failed connections or a rising p90 latency (AIMD)
+"""
+
+import asyncio
+import logging
+import os
+from collections import deque
+from typing import Deque, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class AdaptiveLimiter:
+    """AIMD limit on concurrent requests to one site
+    
+    Every ``window`` successful requests the p90 latency of the window is
+    compared with a baseline that follows the lowest p90 seen (and creeps
+    up slowly so it can track a site that got slower for good). If the p90
+    rose past ``tolerance`` times the baseline the limit is cut by
+    ``backoff``; otherwise, if the limit was actually reached during the
+    window, it grows by one. Overload answers cut the limit immediately,
+    but only once per epoch: responses to requests sent before the last
+    cut do not cut it again.
+    
+    Waiters are served in arrival order.
+    """
+    
+    __slots__ = ('maximum', 'minimum', 'limit', 'window', 'tolerance', 'backoff', 'in_flight',
+                 'baseline', 'increases', 'decreases', '_waiters', '_latencies', '_completed',
+                 '_saturated', '_epoch')
+    
+    # Share of the gap to a higher p90 the baseline moves per window
+    BASELINE_DRIFT = 0.05
+    
+    def __init__(self, maximum: int, initial: Optional[int] = None, minimum: Optional[int] = None,
+                 window: int = 20, tolerance: float = 1.5, backoff: float = 0.7):
+        """
+        Initialize adaptive limiter
+        
+        Args:
+            maximum: Highest limit (the connection pool's per-host limit)
+            initial: Starting limit (default WP_CONCURRENCY_INITIAL or half of maximum)
+            minimum: Lowest limit (default WP_CONCURRENCY_MIN or 1)
+            window: Successful requests per latency evaluation
+            tolerance: p90 / baseline ratio treated as rising latency
+            backoff: Factor applied to the limit on overload
+        """
+        if minimum is None:
+            minimum = int(os.getenv('WP_CONCURRENCY_MIN', '1'))
+        if initial is None:
+            initial = int(os.getenv('WP_CONCURRENCY_INITIAL', str(max(1, maximum // 2))))
+        self.maximum = max(1, maximum)
+        self.minimum = max(1, min(minimum, self.maximum))
+        self.limit = float(min(max(initial, self.minimum), self.maximum))
+        self.window = window
+        self.tolerance = tolerance
+        self.backoff = backoff
+        
+        self.in_flight = 0
+        self.baseline: Optional[float] = None
+        self.increases = 0
+        self.decreases = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self._completed = 0
+        self._saturated = False
+        self._epoch = 0
+    
+    @classmethod
+    def from_env(cls, maximum: int) -> Optional["AdaptiveLimiter"]:
+        """Limiter for a client, or None when WP_ADAPTIVE_CONCURRENCY=false"""
+        if os.getenv('WP_ADAPTIVE_CONCURRENCY', 'true').lower() != 'true':
+            return None
+        return cls(maximum)
+    
+    @property
+    def current(self) -> int:
+        """Requests allowed in flight right now"""
+        return int(self.limit)
+    
+    async def acquire(self) -> int:
+        """
+        Wait for a free slot
+        
+        Returns:
+            Token to hand back to release()
+        """
+        if self.in_flight < self.current and not self._waiters:
+            self.in_flight += 1
+        else:
+            self._saturated = True
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                elif not waiter.cancelled():
+                    # The slot was handed over just as we were cancelled
+                    self.in_flight -= 1
+                    self._wake()
+                raise
+        if self.in_flight >= self.current:
+            self._saturated = True
+        return self._epoch
+    
+    def release(self, token: int, status: Optional[str], latency: float) -> None:
+        """
+        Free a slot and learn from the request's outcome
+        
+        Args:
+            token: Value returned by acquire()
+            status: Response status code, "error" when no response arrived,
+                or None when the request was abandoned
+            latency: Seconds the request took
+        """
+        self.in_flight -= 1
+        if status is None:
+            pass
+        elif status == 'error' or status == '429' or status.startswith('5'):
+            if token == self._epoch:
+                self._decrease(f"HTTP {status}" if status != 'error' else "request error")
+        else:
+            self._latencies.append(latency)
+            self._completed += 1
+            if self._completed >= self.window:
+                self._evaluate()
+        self._wake()
+    
+    def _evaluate(self) -> None:
+        """Compare the window's p90 latency with the baseline and adjust"""
+        latencies = sorted(self._latencies)
+        p90 = latencies[int(0.9 * (len(latencies) - 1))]
+        self._completed = 0
+        if self.baseline is None or p90 < self.baseline:
+            self.baseline = p90
+        else:
+            self.baseline += (p90 - self.baseline) * self.BASELINE_DRIFT
+        
+        if p90 > self.baseline * self.tolerance:
+            self._decrease(f"p90 {p90 * 1000:.0f}ms over baseline {self.baseline * 1000:.0f}ms")
+        elif self._saturated and self.limit < self.maximum:
+            self.limit = min(self.maximum, self.limit + 1)
+            self.increases += 1
+        self._saturated = False
+    
+    def _decrease(self, reason: str) -> None:
+        previous = self.current
+        self.limit = max(self.minimum, self.limit * self.backoff)
+        self.decreases += 1
+        self._epoch += 1
+        self._completed = 0
+        self._saturated = False
+        if self.current != previous:
+            logger.info(f"Concurrency limit {previous} -> {self.current} ({reason})")
+    
+    def _wake(self) -> None:
+        """Hand free slots to waiters in arrival order"""
+        while self._waiters and self.in_flight < self.current:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
@@ -0,0 +1,38 @@
+"""
+Response field projection for WordPress MCP
+Builds the ``_fields`` parameter so the REST API only sends what a tool returns
+"""
+
+from typing import Any, Dict, Iterable, List, Optional
+
+# Schema for the optional ``fields`` argument of list/get tools
+FIELDS_SCHEMA = {
+    "type": "array",
+    "description": "Return only these REST fields (e.g. ['id', 'title', 'meta.footnotes']) "
+                   "as raw objects instead of the default summary",
+    "items": {"type": "string"}
+}
+
+
+def fields_param(default: Iterable[str], fields: Optional[List[str]] = None) -> Dict[str, str]:
+    """
+    Build the ``_fields`` query parameter
+
+    Args:
+        default: Fields the tool's summary reads
+        fields: Fields requested by the caller, replacing the default
+
+    Returns:
+        Params dict to merge into the request
+    """
+    return {"_fields": ",".join(fields or default)}
+
+
+def project(item: Dict[str, Any], fields: List[str]) -> Dict[str, Any]:
+    """Keep the top-level keys of ``item`` named by ``fields``
+
+    The server already filters the response; this also covers sites that
+    ignore ``_fields`` and keeps the output to what was asked for.
+    """
+    keys = {field.split('.', 1)[0] for field in fields}
+    return {key: value for key, value in item.items() if key in keys}
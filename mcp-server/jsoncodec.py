@@ -0,0 +1,195 @@
+"""
+JSON encoding for WordPress MCP
+Picks the fastest available JSON library (orjson, ujson, then the standard library)
+"""
+
+import codecs
+import json
+import logging
+import os
+import re
+from typing import Any, List, Union
+
+logger = logging.getLogger(__name__)
+
+# Set JSON_BACKEND to force a backend: auto (default), orjson, ujson or json
+_PREFERRED = os.getenv('JSON_BACKEND', 'auto').lower()
+
+# Tool results are compact unless JSON_COMPACT=false
+COMPACT = os.getenv('JSON_COMPACT', 'true').lower() == 'true'
+
+orjson = None
+ujson = None
+
+if _PREFERRED in ('auto', 'orjson'):
+    try:
+        import orjson
+    except ImportError:
+        orjson = None
+
+if orjson is None and _PREFERRED in ('auto', 'ujson'):
+    try:
+        import ujson
+    except ImportError:
+        ujson = None
+
+if orjson is not None:
+    BACKEND = 'orjson'
+elif ujson is not None:
+    BACKEND = 'ujson'
+else:
+    BACKEND = 'json'
+
+if _PREFERRED not in ('auto', BACKEND):
+    logger.warning(f"JSON backend '{_PREFERRED}' not available, using {BACKEND}")
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Decode JSON from bytes or text"""
+    if orjson is not None:
+        return orjson.loads(data)
+    if ujson is not None:
+        return ujson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any, pretty: bool = False) -> str:
+    """
+    Encode ``obj`` as JSON text
+
+    Args:
+        obj: Value to encode
+        pretty: Indent with two spaces instead of the compact form
+
+    Returns:
+        JSON string. Non-string keys (e.g. the integer IDs of by-ID
+        results) become strings as with the standard library. Values the
+        fast backend rejects (e.g. integers wider than 64 bits) are encoded
+        with the standard library instead.
+    """
+    if orjson is not None:
+        try:
+            option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+            return orjson.dumps(obj, option=option).decode()
+        except TypeError:
+            pass
+    elif ujson is not None:
+        try:
+            return ujson.dumps(obj, indent=2 if pretty else 0, ensure_ascii=False)
+        except (TypeError, OverflowError):
+            pass
+    if pretty:
+        return json.dumps(obj, indent=2, ensure_ascii=False)
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False)
+
+
+def dumps_result(obj: Any) -> str:
+    """Encode a tool result, compact unless JSON_COMPACT=false"""
+    return dumps(obj, pretty=not COMPACT)
+
+
+def encoded_size(obj: Any) -> int:
+    """
+    Length in bytes of the compact UTF-8 JSON encoding of ``obj``
+
+    Exact, and with orjson faster than any walk over the value in Python.
+    """
+    if orjson is not None:
+        try:
+            return len(orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS))
+        except TypeError:
+            pass
+    return len(dumps(obj).encode())
+
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+# ArrayStream states: before '[', before the first element, after a comma,
+# after an element, and after the closing ']'
+_START, _FIRST, _ELEMENT, _SEPARATOR, _DONE = range(5)
+
+
+class ArrayStream:
+    """Incremental parser for a JSON array that arrives in chunks
+
+    ``feed`` returns the elements each chunk completes, so a collection
+    page is decoded one item at a time and only the unfinished element is
+    held in memory. Elements are read with the standard library's C
+    scanner; one split across chunks is retried only after the buffered
+    text has doubled, which keeps the work linear in the body size.
+    """
+
+    __slots__ = ('_decoder', '_utf8', '_buffer', '_pending', '_pending_length', '_retry_at', '_state')
+
+    def __init__(self):
+        self._decoder = json.JSONDecoder()
+        self._utf8 = codecs.getincrementaldecoder('utf-8')()
+        self._buffer = ''
+        self._pending: List[str] = []
+        self._pending_length = 0
+        self._retry_at = 0
+        self._state = _START
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        """Add the next chunk of the body and return the elements it completed"""
+        text = self._utf8.decode(chunk)
+        self._pending.append(text)
+        self._pending_length += len(text)
+        if len(self._buffer) + self._pending_length < self._retry_at:
+            return []
+        return self._parse(final=False)
+
+    def close(self) -> List[Any]:
+        """
+        Finish the body and return the remaining elements
+
+        Raises:
+            ValueError: The body is not a complete JSON array
+        """
+        self._pending.append(self._utf8.decode(b'', final=True))
+        items = self._parse(final=True)
+        if self._state != _DONE:
+            raise ValueError("Truncated JSON array")
+        return items
+
+    def _parse(self, final: bool) -> List[Any]:
+        text = self._buffer + ''.join(self._pending)
+        self._pending = []
+        self._pending_length = 0
+        items = []
+        position = 0
+        self._retry_at = 0
+        while self._state != _DONE:
+            position = _WHITESPACE.match(text, position).end()
+            if position >= len(text):
+                break
+            char = text[position]
+            if self._state == _START:
+                if char != '[':
+                    raise ValueError("Expected a JSON array")
+                self._state = _FIRST
+                position += 1
+            elif self._state == _SEPARATOR or (self._state == _FIRST and char == ']'):
+                if char == ']':
+                    self._state = _DONE
+                elif char == ',' and self._state == _SEPARATOR:
+                    self._state = _ELEMENT
+                else:
+                    raise ValueError(f"Unexpected {char!r} in JSON array")
+                position += 1
+            else:
+                try:
+                    item, end = self._decoder.raw_decode(text, position)
+                except json.JSONDecodeError:
+                    if final:
+                        raise
+                    end = len(text)
+                # A number at the end of the buffer may continue in the next chunk
+                if end == len(text) and not final:
+                    self._retry_at = 2 * (len(text) - position)
+                    break
+                items.append(item)
+                self._state = _SEPARATOR
+                position = end
+        self._buffer = text[position:]
+        return items
@@ -4,44 +4,97 @@ WordPress MCP Server Launcher
 Handles dependency installation for DXT package
 """
 
+import json
 import subprocess
 import sys
 import os
 from pathlib import Path
 
-# Print debug info
-print("WordPress MCP Server launcher starting...", file=sys.stderr)
-print(f"Python version: {sys.version}", file=sys.stderr)
+script_dir = Path(__file__).resolve().parent
 
-# Check Python version
-if sys.version_info < (3, 9):
-    print("\n" + "="*60, file=sys.stderr)
-    print("ERROR: Python 3.9 or higher is required", file=sys.stderr)
-    print(f"Current version: Python {sys.version_info.major}.{sys.version_info.minor}.{sys.version_info.micro}", file=sys.stderr)
-    print("\nPlease install Python 3.9+ from https://python.org", file=sys.stderr)
-    print("="*60 + "\n", file=sys.stderr)
-    sys.exit(1)
+# (import name, distribution name) pairs the server needs
+REQUIRED = [
+    ("mcp", "mcp"),
+    ("dotenv", "python-dotenv"),
+    ("aiohttp", "aiohttp"),
+    ("jsonschema", "jsonschema")
+]
 
-# Change to script directory
-script_dir = Path(__file__).parent
-os.chdir(script_dir)
+# Fingerprint of the last environment that passed the check
+CACHE_FILE = script_dir / '.launcher_cache.json'
 
-def install_dependencies():
-    """Install required dependencies"""
-    required = [
-        ("mcp", "mcp"),
-        ("dotenv", "python-dotenv"),
-        ("aiohttp", "aiohttp"),
-        ("jsonschema", "jsonschema")
-    ]
+def check_python_version():
+    """Exit with a readable message on unsupported interpreters"""
+    if sys.version_info < (3, 9):
+        print("\n" + "="*60, file=sys.stderr)
+        print("ERROR: Python 3.9 or higher is required", file=sys.stderr)
+        print(f"Current version: Python {sys.version_info.major}.{sys.version_info.minor}.{sys.version_info.micro}", file=sys.stderr)
+        print("\nPlease install Python 3.9+ from https://python.org", file=sys.stderr)
+        print("="*60 + "\n", file=sys.stderr)
+        sys.exit(1)
+
+def environment_fingerprint():
+    """Interpreter and installed versions of the required distributions
+    
+    Reads package metadata only; nothing is imported.
+    """
+    from importlib import metadata
     
-    missing = []
-    for import_name, package_name in required:
+    packages = {}
+    for _, package_name in REQUIRED:
         try:
-            __import__(import_name)
+            packages[package_name] = metadata.version(package_name)
+        except metadata.PackageNotFoundError:
+            packages[package_name] = None
+    return {
+        "python": sys.executable,
+        "version": sys.version,
+        "packages": packages
+    }
+
+def load_cached_fingerprint():
+    """Fingerprint recorded by the last successful check, if any"""
+    try:
+        with open(CACHE_FILE, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def save_fingerprint(fingerprint):
+    """Record a verified environment; an unwritable directory just skips the cache"""
+    try:
+        with open(CACHE_FILE, 'w') as f:
+            json.dump(fingerprint, f, indent=2)
+    except OSError as e:
+        print(f"⚠ Could not write {CACHE_FILE}: {e}", file=sys.stderr)
+
+def clear_fingerprint():
+    """Force a full check on the next launch"""
+    try:
+        CACHE_FILE.unlink()
+    except OSError:
+        pass
+
+def find_missing(fingerprint):
+    """Distributions that are not installed or whose module cannot be found"""
+    from importlib.util import find_spec
+    
+    return [
+        package_name for import_name, package_name in REQUIRED
+        if fingerprint["packages"].get(package_name) is None or find_spec(import_name) is None
+    ]
+
+def install_dependencies():
+    """Install required dependencies unless this environment was already verified"""
+    fingerprint = environment_fingerprint()
+    if fingerprint == load_cached_fingerprint():
+        print("✓ Dependencies unchanged since last check", file=sys.stderr)
+        return
+    
+    missing = find_missing(fingerprint)
+    for _, package_name in REQUIRED:
+        if package_name not in missing:
             print(f"✓ {package_name} already installed", file=sys.stderr)
-        except ImportError:
-            missing.append(package_name)
     
     if missing:
         print(f"Installing missing packages: {', '.join(missing)}", file=sys.stderr)
@@ -63,9 +116,27 @@ def install_dependencies():
                 print("✓ All dependencies installed (user)", file=sys.stderr)
             except Exception as e:
                 print(f"⚠ Installation failed: {e}", file=sys.stderr)
+                return
+        
+        # Metadata written by pip is not picked up by cached path finders
+        import importlib
+        importlib.invalidate_caches()
+        fingerprint = environment_fingerprint()
+        if find_missing(fingerprint):
+            return
+    
+    save_fingerprint(fingerprint)
 
 def main():
     """Main launcher function"""
+    # Print debug info
+    print("WordPress MCP Server launcher starting...", file=sys.stderr)
+    print(f"Python version: {sys.version}", file=sys.stderr)
+    check_python_version()
+    
+    # Change to script directory
+    os.chdir(script_dir)
+    
     # Install dependencies
     print("Checking dependencies...", file=sys.stderr)
     install_dependencies()
@@ -82,6 +153,7 @@ def main():
         
     except ImportError as e:
         print(f"Import error: {e}", file=sys.stderr)
+        clear_fingerprint()
         print("\nTrying to install missing package...", file=sys.stderr)
         
         # Try to identify and install the missing package
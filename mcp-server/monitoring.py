@@ -5,7 +5,10 @@ Production-ready monitoring with metrics collection
 
 import time
 import json
-from typing import Dict, Any, Optional
+import math
+import re
+from bisect import bisect_left
+from typing import Callable, Dict, Any, List, Optional, Tuple, Union
 from collections import defaultdict, deque
 from datetime import datetime, timedelta
 import asyncio
@@ -13,6 +16,116 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Upper bounds (seconds) of the buckets exposed to Prometheus
+PROMETHEUS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# A gauge callback returns a plain number or (labels, value) samples
+GaugeValue = Union[int, float, List[Tuple[Dict[str, str], Union[int, float]]]]
+
+class LatencyHistogram:
+    """Fixed-memory latency histogram with log-spaced buckets
+    
+    Count, sum, min and max are exact. Quantiles are read from buckets that
+    grow by ``growth`` each step, so the relative error of a quantile is at
+    most ``growth - 1`` (5% by default). Recording is O(1) and memory does
+    not grow with the number of samples.
+    """
+    
+    def __init__(self, min_value: float = 0.0001, max_value: float = 600.0,
+                 growth: float = 1.05):
+        """
+        Initialize histogram
+        
+        Args:
+            min_value: Smallest distinguishable value in seconds (default 0.1ms)
+            max_value: Values above this land in the last bucket (default 10min)
+            growth: Ratio between consecutive bucket bounds
+        """
+        self.min_value = min_value
+        self.growth = growth
+        self._log_growth = math.log(growth)
+        self.bucket_count = int(math.ceil(math.log(max_value / min_value) / self._log_growth)) + 1
+        self.buckets = [0] * self.bucket_count
+        
+        # Exact counts for the Prometheus bucket bounds (last slot is +Inf)
+        self.export_bounds = PROMETHEUS_BUCKETS
+        self.export_counts = [0] * (len(PROMETHEUS_BUCKETS) + 1)
+        
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+    
+    def record(self, value: float) -> None:
+        """Add one sample"""
+        self.buckets[self._bucket_index(value)] += 1
+        self.export_counts[bisect_left(self.export_bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+    
+    def _bucket_index(self, value: float) -> int:
+        if value <= self.min_value:
+            return 0
+        index = int(math.log(value / self.min_value) / self._log_growth) + 1
+        return min(index, self.bucket_count - 1)
+    
+    def bucket_upper_bound(self, index: int) -> float:
+        """Largest value that falls into a bucket"""
+        return self.min_value * (self.growth ** index)
+    
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+    
+    def quantile(self, q: float) -> float:
+        """Estimate the q-quantile (0 <= q <= 1)"""
+        if not self.count:
+            return 0.0
+        
+        rank = max(1, int(math.ceil(q * self.count)))
+        seen = 0
+        for index, bucket in enumerate(self.buckets):
+            seen += bucket
+            if seen >= rank:
+                if index == 0:
+                    estimate = self.min_value
+                elif index == self.bucket_count - 1:
+                    # Overflow bucket has no upper bound
+                    estimate = self.max
+                else:
+                    # Geometric midpoint of the bucket
+                    estimate = self.bucket_upper_bound(index) / math.sqrt(self.growth)
+                return min(max(estimate, self.min), self.max)
+        return self.max
+    
+    def cumulative_buckets(self) -> List[Tuple[str, int]]:
+        """(le, cumulative count) pairs in Prometheus histogram order"""
+        pairs = []
+        running = 0
+        for bound, bucket in zip(self.export_bounds, self.export_counts):
+            running += bucket
+            pairs.append((_format_bound(bound), running))
+        pairs.append(("+Inf", self.count))
+        return pairs
+    
+    def summary(self) -> Dict[str, float]:
+        """Count, sum and latency statistics for reporting"""
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'avg': self.mean,
+            'min': self.min if self.min is not None else 0.0,
+            'max': self.max if self.max is not None else 0.0,
+            'p50': self.quantile(0.5),
+            'p90': self.quantile(0.9),
+            'p99': self.quantile(0.99)
+        }
+
+
 class MetricsCollector:
     """Collects and aggregates metrics for monitoring"""
     
@@ -31,7 +144,14 @@ class MetricsCollector:
         
         # Time series data (using deque for efficient windowing)
         self.request_times = defaultdict(lambda: deque(maxlen=1000))
-        self.response_times = defaultdict(list)
+        self.response_times = defaultdict(LatencyHistogram)
+        
+        # Labelled histograms for Prometheus export
+        self.request_durations: Dict[Tuple[str, str, str], LatencyHistogram] = defaultdict(LatencyHistogram)
+        self.upstream_durations: Dict[Tuple[str, str, str], LatencyHistogram] = defaultdict(LatencyHistogram)
+        
+        # Gauges read at export time: name -> (help, callback)
+        self.gauges: Dict[str, Tuple[str, Callable[[], GaugeValue]]] = {}
         
         # Error tracking
         self.errors = defaultdict(int)
@@ -46,10 +166,14 @@ class MetricsCollector:
         """Increment a counter metric"""
         self.counters[metric] += value
     
-    def record_request(self, tool: str, response_time: float, success: bool) -> None:
+    def record_request(self, tool: str, response_time: float, success: bool,
+                       backend: str = "default") -> None:
         """Record a request with its response time"""
         now = time.time()
         
+        status = "success" if success else "error"
+        self.request_durations[(tool, status, backend)].record(response_time)
+        
         # Update counters
         self.counters['total_requests'] += 1
         if success:
@@ -59,7 +183,7 @@ class MetricsCollector:
         
         # Record response time
         self.request_times[tool].append(now)
-        self.response_times[tool].append(response_time)
+        self.response_times[tool].record(response_time)
         
         # Track requests per minute
         current_minute = int(now / 60)
@@ -74,6 +198,21 @@ class MetricsCollector:
         if response_time > 5.0:
             logger.warning(f"Slow request: {tool} took {response_time:.2f}s")
     
+    def record_upstream(self, method: str, url: str, status: str, duration: float) -> None:
+        """Record one HTTP call to WordPress, grouped by normalized endpoint"""
+        self.upstream_durations[(method, normalize_endpoint(url), status)].record(duration)
+    
+    def register_gauge(self, name: str, help_text: str, callback: Callable[[], GaugeValue]) -> None:
+        """
+        Register a gauge evaluated on every export
+        
+        Args:
+            name: Metric name without the wordpress_mcp_ prefix
+            help_text: HELP line for the metric
+            callback: Returns a number, or a list of (labels, value) pairs
+        """
+        self.gauges[name] = (help_text, callback)
+    
     def record_error(self, error_type: str, details: str = "") -> None:
         """Record an error occurrence"""
         self.errors[error_type] += 1
@@ -96,15 +235,9 @@ class MetricsCollector:
         
         # Calculate average response times
         avg_response_times = {}
-        for tool, times in self.response_times.items():
-            if times:
-                recent_times = times[-100:]  # Last 100 requests
-                avg_response_times[tool] = {
-                    'avg': sum(recent_times) / len(recent_times),
-                    'min': min(recent_times),
-                    'max': max(recent_times),
-                    'count': len(times)
-                }
+        for tool, histogram in self.response_times.items():
+            if histogram.count:
+                avg_response_times[tool] = histogram.summary()
         
         # Calculate current request rate
         rpm = sum(self.requests_per_minute) / max(1, len(self.requests_per_minute))
@@ -163,15 +296,158 @@ class MetricsCollector:
         lines.append("# TYPE wordpress_mcp_rate_limited counter")
         lines.append(f"wordpress_mcp_rate_limited {self.counters.get('rate_limited', 0)}")
         
-        # Response times per tool
-        for tool, times in self.response_times.items():
-            if times:
-                avg_time = sum(times[-100:]) / len(times[-100:])
-                lines.append(f"# HELP wordpress_mcp_response_time_{tool} Average response time for {tool}")
-                lines.append(f"# TYPE wordpress_mcp_response_time_{tool} gauge")
-                lines.append(f"wordpress_mcp_response_time_{tool} {avg_time:.3f}")
-        
-        return "\n".join(lines)
+        lines.append("# HELP wordpress_mcp_coalesced_requests_total GETs served by joining an identical in-flight request")
+        lines.append("# TYPE wordpress_mcp_coalesced_requests_total counter")
+        lines.append(f"wordpress_mcp_coalesced_requests_total {self.counters.get('coalesced_requests', 0)}")
+        
+        lines.append("# HELP wordpress_mcp_retries_total WordPress requests sent again after a retryable failure")
+        lines.append("# TYPE wordpress_mcp_retries_total counter")
+        lines.append(f"wordpress_mcp_retries_total {self.counters.get('retries', 0)}")
+        
+        lines.append("# HELP wordpress_mcp_retries_denied_total Retries skipped because the retry budget was spent")
+        lines.append("# TYPE wordpress_mcp_retries_denied_total counter")
+        lines.append(f"wordpress_mcp_retries_denied_total {self.counters.get('retries_denied', 0)}")
+        
+        lines.append("# HELP wordpress_mcp_mirror_hits_total GETs answered from the local mirror")
+        lines.append("# TYPE wordpress_mcp_mirror_hits_total counter")
+        lines.append(f"wordpress_mcp_mirror_hits_total {self.counters.get('mirror_hits', 0)}")
+        
+        lines.append("# HELP wordpress_mcp_mirror_misses_total Mirrored-collection GETs sent to the site")
+        lines.append("# TYPE wordpress_mcp_mirror_misses_total counter")
+        lines.append(f"wordpress_mcp_mirror_misses_total {self.counters.get('mirror_misses', 0)}")
+        
+        # Tool call latency
+        self._export_histogram(
+            lines, "wordpress_mcp_request_duration_seconds",
+            "Tool call duration in seconds",
+            ("tool", "status", "backend"), self.request_durations
+        )
+        
+        # WordPress HTTP call latency
+        self._export_histogram(
+            lines, "wordpress_mcp_upstream_request_duration_seconds",
+            "WordPress REST API call duration in seconds",
+            ("method", "endpoint", "status"), self.upstream_durations
+        )
+        
+        # Cache events recorded as cache_* counters
+        cache_events = sorted((k[len('cache_'):], v) for k, v in self.counters.items()
+                              if k.startswith('cache_'))
+        if cache_events:
+            lines.append("# HELP wordpress_mcp_cache_events_total Response cache events")
+            lines.append("# TYPE wordpress_mcp_cache_events_total counter")
+            for event, value in cache_events:
+                lines.append(f'wordpress_mcp_cache_events_total{{event="{_escape_label(event)}"}} {value}')
+        
+        # Registered gauges (cache size, connection pool, ...)
+        for name, (help_text, callback) in sorted(self.gauges.items()):
+            try:
+                value = callback()
+            except Exception as e:
+                logger.debug(f"Gauge {name} failed: {type(e).__name__}")
+                continue
+            metric = f"wordpress_mcp_{name}"
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} gauge")
+            if isinstance(value, (int, float)):
+                lines.append(f"{metric} {value}")
+            else:
+                for labels, sample in value:
+                    lines.append(f"{metric}{_format_labels(labels)} {sample}")
+        
+        return "\n".join(lines) + "\n"
+    
+    def _export_histogram(self, lines: List[str], metric: str, help_text: str,
+                          label_names: Tuple[str, ...],
+                          histograms: Dict[Tuple[str, ...], LatencyHistogram]) -> None:
+        """Append one labelled Prometheus histogram"""
+        if not histograms:
+            return
+        
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} histogram")
+        for label_values, histogram in sorted(histograms.items()):
+            labels = dict(zip(label_names, label_values))
+            for le, count in histogram.cumulative_buckets():
+                lines.append(f"{metric}_bucket{_format_labels({**labels, 'le': le})} {count}")
+            lines.append(f"{metric}_sum{_format_labels(labels)} {histogram.sum:.6f}")
+            lines.append(f"{metric}_count{_format_labels(labels)} {histogram.count}")
+
+
+_ID_SEGMENT = re.compile(r'^\d+$')
+
+
+def normalize_endpoint(url: str) -> str:
+    """Reduce a request URL to a low-cardinality endpoint label
+    
+    'https://site/wp-json/wp/v2/posts/42?x=1' becomes 'wp/v2/posts/:id'.
+    """
+    path = url.split('?', 1)[0]
+    if '/wp-json/' in path:
+        path = path.split('/wp-json/', 1)[1]
+    segments = [':id' if _ID_SEGMENT.match(seg) else seg for seg in path.strip('/').split('/')]
+    return '/'.join(segments)
+
+
+def _format_bound(bound: float) -> str:
+    return repr(float(bound))
+
+
+def _escape_label(value: Any) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels: Dict[str, Any]) -> str:
+    if not labels:
+        return ""
+    inner = ",".join(f'{key}="{_escape_label(value)}"' for key, value in labels.items())
+    return "{" + inner + "}"
+
+
+class MetricsServer:
+    """Minimal local HTTP listener exposing /metrics and /health"""
+    
+    def __init__(self, metrics: MetricsCollector, health_checker: Optional["HealthChecker"] = None,
+                 host: str = "127.0.0.1", port: int = 9464):
+        self.metrics = metrics
+        self.health_checker = health_checker
+        self.host = host
+        self.port = port
+        self._runner = None
+    
+    async def start(self) -> None:
+        """Start serving in the current event loop"""
+        from aiohttp import web
+        
+        app = web.Application()
+        app.router.add_get("/metrics", self._handle_metrics)
+        app.router.add_get("/health", self._handle_health)
+        
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        logger.info(f"Metrics listener on http://{self.host}:{self.port}/metrics")
+    
+    async def stop(self) -> None:
+        """Stop the listener"""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+    
+    async def _handle_metrics(self, request):
+        from aiohttp import web
+        return web.Response(
+            text=self.metrics.export_prometheus(),
+            headers={"Content-Type": "text/plain; version=0.0.4; charset=utf-8"}
+        )
+    
+    async def _handle_health(self, request):
+        from aiohttp import web
+        if self.health_checker is None:
+            return web.json_response({"status": "unknown"})
+        status = self.health_checker.get_status()
+        return web.json_response(status, status=200 if status['status'] == 'healthy' else 503)
 
 
 class HealthChecker:
@@ -192,6 +468,21 @@ class HealthChecker:
             'session_manager': True,
             'auth_manager': True
         }
+        self._breakers = None
+    
+    def track_breakers(self, breakers) -> None:
+        """Report a client's circuit breakers (breaker.CircuitBreakers) as components
+        
+        Each API namespace appears as ``circuit:<namespace>`` and is
+        unhealthy while its breaker is open.
+        """
+        self._breakers = breakers
+    
+    def _refresh_breakers(self) -> None:
+        if self._breakers is None:
+            return
+        for family, status in self._breakers.status().items():
+            self.components[f'circuit:{family}'] = status['state'] != 'open'
     
     def set_healthy(self, healthy: bool, error: Optional[str] = None) -> None:
         """Set health status"""
@@ -216,6 +507,7 @@ class HealthChecker:
     def is_healthy(self) -> bool:
         """Check if server is healthy"""
         # Overall health requires all components to be healthy
+        self._refresh_breakers()
         return self.healthy and all(self.components.values())
     
     def get_uptime(self) -> float:
@@ -239,6 +531,7 @@ class HealthChecker:
             'checks_failed': self.checks_failed,
             'success_rate': round(success_rate, 2),
             'components': self.components.copy(),
+            'circuits': self._breakers.status() if self._breakers is not None else {},
             'timestamp': datetime.now().isoformat()
         }
     
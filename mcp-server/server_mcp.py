@@ -5,11 +5,13 @@ Provides comprehensive WordPress and WooCommerce control via MCP protocol
 """
 
 import asyncio
+import importlib
 import json
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 import sys
 import os
+import time
 
 # Set up logging first
 logging.basicConfig(level=logging.INFO)
@@ -26,22 +28,33 @@ except ImportError:
     logger.error("Or install all requirements: pip install -r requirements.txt")
     sys.exit(1)
 
-# Our imports
-from wp_client import WordPressClient
-from tools.posts import PostTools
-from tools.pages import PageTools
-from tools.media import MediaTools
-from tools.woocommerce import WooCommerceTools
-from tools.templates import TemplateTools
-from tools.system import SystemTools
+# Our imports (the WordPress client and tool modules load on first use)
+import jsoncodec
+from monitoring import HealthChecker, MetricsCollector, MetricsServer
+from sites import ALL_SITES, SitePool, load_sites, with_site_argument
+from tools.registry import TOOL_MODULES, ToolRegistry
+
 
 class WordPressMCPServer:
     """Main MCP server for WordPress integration"""
     
     def __init__(self):
-        self.wp_client: Optional[WordPressClient] = None
+        self.wp_client = None
+        self.config: Dict[str, str] = {}
+        self.pool: Optional[SitePool] = None
         self.tools = {}
+        self._site_modules: Dict[Tuple[str, str], Any] = {}
+        self._site_tool_list: Optional[List[Tool]] = None
+        self._site_tool_source: Optional[List[Tool]] = None
+        self.registry = ToolRegistry()
         self.initialized = False
+        self.connection_ok: Optional[bool] = None
+        self._verify_task: Optional[asyncio.Task] = None
+        self.sync_engine = None
+        self._sync_task: Optional[asyncio.Task] = None
+        self.metrics = MetricsCollector()
+        self.metrics_server: Optional[MetricsServer] = None
+        self.health = HealthChecker()
         self.server = Server("wordpress-mcp")
         
         # Register handlers
@@ -58,47 +71,91 @@ class WordPressMCPServer:
             return await self.list_resources()
     
     async def initialize(self, options: InitializationOptions) -> None:
-        """Initialize the server with WordPress connection details"""
+        """
+        Prepare the server without touching the network
+        
+        Tool modules are registered lazily and the WordPress client is
+        created on first use; the connection itself is checked in the
+        background by verify_connection() once stdio is up.
+        """
         logger.info("Initializing WordPress MCP Server...")
         
         # Get configuration from environment or config file
         config = self._load_config()
         
-        if not config.get('username') or config.get('username') == 'your_wordpress_username':
+        try:
+            sites = load_sites(config)
+        except ValueError as e:
+            logger.error(f"Please update config.json with your WordPress credentials! ({e})")
+            raise Exception("Configuration not set up")
+        if any(site['username'] == 'your_wordpress_username' for site in sites.values()):
             logger.error("Please update config.json with your WordPress credentials!")
             raise Exception("Configuration not set up")
+        self.config = config
+        self.pool = SitePool(sites, default=config.get('default_site'), metrics=self.metrics)
+        if len(sites) > 1:
+            logger.info(f"Managing {len(sites)} sites: {', '.join(sites)} (default: {self.pool.default})")
         
-        # Initialize WordPress client
-        self.wp_client = WordPressClient(
-            site_url=config['site_url'],
-            username=config['username'],
-            app_password=config['app_password']
-        )
-        
-        # Test connection
-        if await self.wp_client.test_connection():
-            logger.info(f"Connected to WordPress site: {config['site_url']}")
-        else:
-            logger.error("Failed to connect to WordPress site")
-            raise Exception("WordPress connection failed")
-        
-        # Initialize tool modules
-        self.tools = {
-            'posts': PostTools(self.wp_client),
-            'pages': PageTools(self.wp_client),
-            'media': MediaTools(self.wp_client),
-            'woocommerce': WooCommerceTools(self.wp_client),
-            'templates': TemplateTools(self.wp_client),
-            'system': SystemTools(self.wp_client)
-        }
+        for module_name, (class_name, hints) in TOOL_MODULES.items():
+            self.registry.register_lazy(module_name, self._module_loader(module_name, class_name), hints)
         
         self.initialized = True
-        logger.info("WordPress MCP Server initialized successfully")
+        logger.info("WordPress MCP Server initialized (tools load on first use)")
+    
+    def _module_loader(self, module_name: str, class_name: str):
+        """Build a loader that imports and instantiates one tool module"""
+        def load():
+            module_class = getattr(importlib.import_module(f"tools.{module_name}"), class_name)
+            module = module_class(self.get_client())
+            self.tools[module_name] = module
+            return module
+        return load
+    
+    def get_client(self):
+        """Create the WordPress client on first use"""
+        if self.wp_client is None:
+            self.wp_client = self.pool.client()
+            self.health.track_breakers(self.wp_client.breakers)
+        return self.wp_client
+    
+    def start_sync(self):
+        """Create the local mirror's SyncEngine when WP_SYNC=true, otherwise None"""
+        if self.sync_engine is None and os.getenv('WP_SYNC', 'false').lower() == 'true':
+            from sync import SyncEngine
+            
+            self.sync_engine = SyncEngine(self.get_client(), metrics=self.metrics)
+        return self.sync_engine
+    
+    async def run_sync(self) -> None:
+        """Refresh the local mirror in the background; does nothing unless WP_SYNC=true"""
+        engine = self.start_sync()
+        if engine is not None:
+            await engine.run()
+    
+    async def verify_connection(self) -> bool:
+        """Check the WordPress connection; failures are logged, not fatal"""
+        try:
+            self.connection_ok = await self.get_client().test_connection()
+        except Exception as e:
+            logger.error(f"Connection check failed: {e}")
+            self.connection_ok = False
+        self.health.set_healthy(self.connection_ok, None if self.connection_ok else "Connection check failed")
+        
+        if self.connection_ok:
+            logger.info(f"Connected to WordPress site: {self.wp_client.site_url}")
+        else:
+            logger.error("Failed to connect to WordPress site; tool calls will report the error")
+        return self.connection_ok
+    
+    @staticmethod
+    def _config_path() -> str:
+        """Location of config.json (override with WP_MCP_CONFIG)"""
+        return os.environ.get('WP_MCP_CONFIG') or os.path.join(os.path.dirname(__file__), 'config.json')
     
     def _load_config(self) -> Dict[str, str]:
         """Load configuration from file or environment"""
         # Try to load from config file first
-        config_path = os.path.join(os.path.dirname(__file__), 'config.json')
+        config_path = self._config_path()
         if os.path.exists(config_path):
             with open(config_path, 'r') as f:
                 return json.load(f)
@@ -115,10 +172,13 @@ class WordPressMCPServer:
         if not self.initialized:
             return []
         
-        all_tools = []
-        for module in self.tools.values():
-            all_tools.extend(module.get_tools())
-        
+        all_tools = self.registry.list_tools()
+        if len(self.pool.sites) > 1:
+            # Rebuilt only when the registry's listing changes
+            if self._site_tool_source is not all_tools:
+                self._site_tool_list = with_site_argument(all_tools, self.pool.names, self.pool.default)
+                self._site_tool_source = all_tools
+            all_tools = self._site_tool_list
         logger.info(f"Listing {len(all_tools)} tools")
         return all_tools
     
@@ -129,26 +189,71 @@ class WordPressMCPServer:
         if not self.initialized:
             return [TextContent(type="text", text="Server not initialized")]
         
-        try:
-            # Find which module handles this tool
-            for module in self.tools.values():
-                if module.handles_tool(name):
-                    result = await module.execute_tool(name, arguments)
-                    return [TextContent(type="text", text=json.dumps(result, indent=2))]
-            
+        tool = self.registry.get(name)
+        if tool is None:
+            self.metrics.increment('unknown_tools')
             return [TextContent(type="text", text=f"Unknown tool: {name}")]
+        
+        arguments = dict(arguments or {})
+        site = arguments.pop('site', None)
+        
+        start_time = time.perf_counter()
+        try:
+            if site == ALL_SITES:
+                result = await self.pool.fan_out(
+                    lambda name: self._call_on_site(tool, arguments, name),
+                    on_result=self._report_site_progress
+                )
+            elif site is None or self.pool.resolve(site) == self.pool.default:
+                result = await tool(arguments)
+            else:
+                result = await self._call_on_site(tool, arguments, site)
+            self.metrics.record_request(name, time.perf_counter() - start_time, True, backend=tool.module)
+            return [TextContent(type="text", text=jsoncodec.dumps_result(result))]
         except Exception as e:
+            self.metrics.record_request(name, time.perf_counter() - start_time, False, backend=tool.module)
             logger.error(f"Error executing tool {name}: {e}")
             return [TextContent(type="text", text=f"Error: {str(e)}")]
     
+    async def _call_on_site(self, tool, arguments: Dict[str, Any], site: str) -> Any:
+        """Run a tool with the module instance bound to ``site``'s client"""
+        site = self.pool.resolve(site)
+        if site == self.pool.default:
+            return await tool(arguments)
+        
+        key = (site, tool.module)
+        module = self._site_modules.get(key)
+        if module is None:
+            class_name = TOOL_MODULES[tool.module][0]
+            module_class = getattr(importlib.import_module(f"tools.{tool.module}"), class_name)
+            module = self._site_modules[key] = module_class(self.pool.client(site))
+        return await module.tools[tool.name](**arguments)
+    
+    async def _report_site_progress(self, site: str, result: Dict[str, Any], done: int, total: int) -> None:
+        """Send an MCP progress notification as each site of a fan-out finishes"""
+        try:
+            context = self.server.request_context
+        except LookupError:
+            return
+        token = context.meta.progressToken if context.meta else None
+        if token is None:
+            return
+        status = "ok" if result["success"] else f"failed: {result['error']}"
+        await context.session.send_progress_notification(token, done, total=total, message=f"{site}: {status}")
+    
     async def list_resources(self) -> List[Resource]:
         """List available resources"""
         return []
     
+    async def close(self) -> None:
+        """Close every site's client"""
+        if self.pool is not None:
+            await self.pool.close()
+    
     async def run(self):
         """Run the server"""
         # Check for config
-        config_path = os.path.join(os.path.dirname(__file__), 'config.json')
+        config_path = self._config_path()
         if not os.path.exists(config_path):
             logger.error("config.json not found!")
             logger.error("Please copy config.json.example to config.json and update with your credentials.")
@@ -165,13 +270,34 @@ class WordPressMCPServer:
         )
         await self.initialize(init_options)
         
-        # Run with stdio
-        async with stdio_server() as (read_stream, write_stream):
-            await self.server.run(
-                read_stream,
-                write_stream,
-                init_options
+        # Optional local Prometheus endpoint
+        metrics_port = os.environ.get('METRICS_PORT')
+        if metrics_port:
+            self.metrics_server = MetricsServer(
+                self.metrics,
+                self.health,
+                host=os.environ.get('METRICS_HOST', '127.0.0.1'),
+                port=int(metrics_port)
             )
+            await self.metrics_server.start()
+        
+        # Run with stdio; the connection check runs alongside the handshake
+        async with stdio_server() as (read_stream, write_stream):
+            self._verify_task = asyncio.create_task(self.verify_connection())
+            
+            # Local mirror refreshes in the background when WP_SYNC=true; the client
+            # and sync module are only loaded there, off the handshake path
+            self._sync_task = asyncio.create_task(self.run_sync())
+            try:
+                await self.server.run(
+                    read_stream,
+                    write_stream,
+                    init_options
+                )
+            finally:
+                self._verify_task.cancel()
+                self._sync_task.cancel()
+                await self.close()
 
 async def main():
     """Main entry point"""
@@ -5,6 +5,7 @@ Comprehensive security, monitoring, and error handling
 """
 
 import asyncio
+import importlib
 import json
 import logging
 import os
@@ -26,15 +27,14 @@ from mcp.types import Tool, TextContent, Resource
 from .wp_client_secure import SecureWordPressClient
 from .rate_limiter import RateLimiter
 from .validators import InputValidator, ValidationError
-from .monitoring import MetricsCollector, HealthChecker
+from .monitoring import MetricsCollector, HealthChecker, MetricsServer
+from .jsoncodec import dumps_result, encoded_size
 
-# Tool imports
-from .tools.posts import PostTools
-from .tools.pages import PageTools
-from .tools.media import MediaTools
-from .tools.woocommerce import WooCommerceTools
-from .tools.templates import TemplateTools
-from .tools.system import SystemTools
+# Tool modules are imported on first use through the registry
+from .tools.registry import TOOL_MODULES, ToolRegistry
+
+# Registered only once the startup probe finds WooCommerce
+WOOCOMMERCE_MODULE = 'woocommerce'
 
 # Load environment variables
 load_dotenv()
@@ -82,7 +82,13 @@ class SecureWordPressMCPServer:
     def __init__(self):
         self.wp_client: Optional[SecureWordPressClient] = None
         self.tools = {}
+        self.registry = ToolRegistry()
         self.initialized = False
+        self._startup_task: Optional[asyncio.Task] = None
+        # Low-level MCP server (set by run_server) and the session that listed
+        # tools, told to list them again when WooCommerce tools are added
+        self.mcp_server = None
+        self._listing_session = None
         
         # Security components
         self.rate_limiter = RateLimiter(
@@ -156,7 +162,13 @@ class SecureWordPressMCPServer:
         return origins
     
     async def initialize(self, options: InitializationOptions) -> None:
-        """Initialize server with security measures"""
+        """
+        Initialize server with security measures
+        
+        Runs during the MCP handshake, so it does no network I/O: tool
+        modules are registered lazily and the connection check and
+        WooCommerce probe run in the background (see _startup_checks).
+        """
         logger.info("Initializing Secure WordPress MCP Server...")
         
         try:
@@ -169,49 +181,82 @@ class SecureWordPressMCPServer:
                 rate_limit=self.config['rate_limit']
             )
             
-            # Test connection
-            if not await self.wp_client.test_connection():
-                raise Exception("WordPress connection failed")
-            
-            logger.info(f"Connected to WordPress site: [REDACTED]")
-            
-            # Initialize tool modules with dependency injection
-            self.tools = {
-                'posts': PostTools(self.wp_client),
-                'pages': PageTools(self.wp_client),
-                'media': MediaTools(self.wp_client),
-                'templates': TemplateTools(self.wp_client),
-                'system': SystemTools(self.wp_client)
-            }
+            # Initialize tool modules with dependency injection, on first use
+            for module_name, (class_name, hints) in TOOL_MODULES.items():
+                if module_name != WOOCOMMERCE_MODULE:
+                    self.registry.register_lazy(module_name, self._module_loader(module_name, class_name), hints)
             
-            # Check for WooCommerce
-            try:
-                wc_check = await self.wp_client.get("wc/v3/system_status")
-                if wc_check:
-                    self.tools['woocommerce'] = WooCommerceTools(self.wp_client)
-                    logger.info("WooCommerce detected and tools enabled")
-            except Exception:
-                logger.info("WooCommerce not detected")
+            self._startup_task = asyncio.create_task(self._startup_checks())
             
             self.initialized = True
-            self.health_checker.set_healthy(True)
-            logger.info("WordPress MCP Server initialized successfully")
+            logger.info("WordPress MCP Server initialized; verifying connection in the background")
             
         except Exception as e:
             logger.error(f"Initialization failed: {e}")
             self.health_checker.set_healthy(False, str(e))
             raise
     
+    def _module_loader(self, module_name: str, class_name: str):
+        """Build a loader that imports and instantiates one tool module"""
+        def load():
+            module_class = getattr(importlib.import_module(f".tools.{module_name}", __package__), class_name)
+            module = module_class(self.wp_client)
+            self.tools[module_name] = module
+            return module
+        return load
+    
+    async def _startup_checks(self) -> None:
+        """Verify the connection and probe for WooCommerce after the handshake"""
+        try:
+            if not await self.wp_client.test_connection():
+                raise Exception("WordPress connection failed")
+            logger.info(f"Connected to WordPress site: [REDACTED]")
+            self.health_checker.set_healthy(True)
+        except Exception as e:
+            logger.error(f"Connection check failed: {e}")
+            self.health_checker.set_healthy(False, str(e))
+            return
+        
+        # Check for WooCommerce
+        try:
+            wc_check = await self.wp_client.get("wc/v3/system_status")
+            if wc_check:
+                class_name, hints = TOOL_MODULES[WOOCOMMERCE_MODULE]
+                self.registry.register_lazy(WOOCOMMERCE_MODULE, self._module_loader(WOOCOMMERCE_MODULE, class_name),
+                                            hints)
+                logger.info("WooCommerce detected and tools enabled")
+                await self._announce_tool_list_changed()
+        except Exception:
+            logger.info("WooCommerce not detected")
+    
     async def list_tools(self) -> List[Tool]:
-        """List available tools"""
+        """
+        List available tools
+        
+        Answers at once, without waiting for the startup checks. WooCommerce
+        tools join the listing when the probe finds WooCommerce, and a
+        client that listed tools before that is sent tools/list_changed.
+        """
         if not self.initialized:
             return []
         
-        all_tools = []
-        for module in self.tools.values():
-            all_tools.extend(module.get_tools())
+        if self._startup_task is not None and not self._startup_task.done() and self.mcp_server is not None:
+            try:
+                self._listing_session = self.mcp_server.request_context.session
+            except LookupError:
+                pass
         
-        return all_tools
+        return self.registry.list_tools()
+    
+    async def _announce_tool_list_changed(self) -> None:
+        """Tell a client that listed tools early to list them again"""
+        session, self._listing_session = self._listing_session, None
+        if session is None:
+            return
+        try:
+            await session.send_tool_list_changed()
+        except Exception as e:
+            logger.warning(f"Could not send tool list change: {e}")
     
     async def call_tool(self, name: str, arguments: Any, context: RequestContext) -> List[TextContent]:
         """Execute tool with comprehensive security"""
@@ -239,8 +284,8 @@ class SecureWordPressMCPServer:
                 "retry_after": retry_after
             }))]
         
-        # Validate request size
-        request_size = len(json.dumps(arguments))
+        # Validate request size (bytes of the compact JSON encoding of the arguments)
+        request_size = encoded_size(arguments)
         if request_size > self.config['max_request_size']:
             self.metrics.increment('oversized_requests')
             return [TextContent(type="text", text=json.dumps({
@@ -258,22 +303,24 @@ class SecureWordPressMCPServer:
             # Input validation based on tool
             validated_args = self._validate_tool_arguments(name, arguments)
             
-            # Find handler
-            for module in self.tools.values():
-                if module.handles_tool(name):
-                    result = await module.execute_tool(name, validated_args)
-                    
-                    # Track metrics
-                    elapsed = time.time() - start_time
-                    self.metrics.record_request(name, elapsed, True)
-                    
-                    return [TextContent(type="text", text=json.dumps(result, indent=2))]
+            # Find handler (WooCommerce tools appear once the startup probe finishes)
+            tool = self.registry.get(name)
+            if tool is None and self._startup_task is not None and not self._startup_task.done():
+                await asyncio.shield(self._startup_task)
+                tool = self.registry.get(name)
+            if tool is None:
+                self.metrics.increment('unknown_tools')
+                return [TextContent(type="text", text=json.dumps({
+                    "error": f"Unknown tool: {name}"
+                }))]
             
-            # Tool not found
-            self.metrics.increment('unknown_tools')
-            return [TextContent(type="text", text=json.dumps({
-                "error": f"Unknown tool: {name}"
-            }))]
+            result = await tool(validated_args)
+            
+            # Track metrics
+            elapsed = time.time() - start_time
+            self.metrics.record_request(name, elapsed, True, backend=tool.module)
+            
+            return [TextContent(type="text", text=dumps_result(result))]
             
         except ValidationError as e:
             # Validation failed
@@ -410,11 +457,24 @@ async def main():
     # Create server
     server = SecureWordPressMCPServer()
     
+    # Optional local Prometheus endpoint (bound to localhost by default)
+    metrics_server = None
+    if os.getenv('METRICS_PORT'):
+        metrics_server = MetricsServer(
+            server.metrics,
+            server.health_checker,
+            host=os.getenv('METRICS_HOST', '127.0.0.1'),
+            port=int(os.getenv('METRICS_PORT'))
+        )
+        await metrics_server.start()
+    
     try:
         # Run server
         async with stdio_server() as (read_stream, write_stream):
             await run_server(server, read_stream, write_stream)
     finally:
+        if metrics_server:
+            await metrics_server.stop()
         await server.shutdown()
 
 async def run_server(server, read_stream, write_stream):
@@ -428,6 +488,7 @@ async def run_server(server, read_stream, write_stream):
     )
     
     mcp_server.on_initialize(server.initialize)
+    server.mcp_server = mcp_server
     
     try:
         await mcp_server.run(read_stream, write_stream)
@@ -0,0 +1,191 @@
+"""
+Site pool for WordPress MCP
+Holds one WordPressClient per configured site so a single server can manage
+many sites, and runs a tool call across all of them concurrently
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Name used for single-site configurations
+DEFAULT_SITE = 'default'
+
+# ``site`` value that runs a tool on every configured site
+ALL_SITES = '*'
+
+REQUIRED_KEYS = ('site_url', 'username', 'app_password')
+
+
+def load_sites(config: Dict[str, Any]) -> Dict[str, Dict[str, str]]:
+    """
+    Read site credentials from config.json
+    
+    A plain config (site_url, username, app_password) becomes one site named
+    'default'. A multi-site config lists sites by name:
+        
+        {"default_site": "shop", "sites": {"shop": {...}, "blog": {...}}}
+    
+    Returns:
+        Site name -> credentials, in configuration order
+    
+    Raises:
+        ValueError: A site is missing credentials or uses a reserved name
+    """
+    sites = config.get('sites') or {DEFAULT_SITE: config}
+    for name, site in sites.items():
+        if name == ALL_SITES:
+            raise ValueError(f"'{ALL_SITES}' is reserved and cannot be used as a site name")
+        missing = [key for key in REQUIRED_KEYS if not site.get(key)]
+        if missing:
+            raise ValueError(f"Site '{name}' is missing {', '.join(missing)}")
+    return {name: {key: site[key] for key in REQUIRED_KEYS} for name, site in sites.items()}
+
+
+class SitePool:
+    """One client per site, sharing a single connection pool
+    
+    Every client keeps its own rate limiter, response cache and session,
+    but the sessions draw connections from one connector: ``WP_POOL_LIMIT``
+    caps connections across all sites and ``WP_POOL_LIMIT_PER_HOST`` caps
+    each site. Clients are created the first time a site is used.
+    """
+    
+    def __init__(self, sites: Dict[str, Dict[str, str]], default: Optional[str] = None,
+                 metrics=None, fanout_concurrency: Optional[int] = None):
+        """
+        Initialize site pool
+        
+        Args:
+            sites: Site name -> credentials (see load_sites)
+            default: Site used when a tool call names none (default: the first)
+            metrics: MetricsCollector given to the default site's client
+            fanout_concurrency: Sites queried at once by fan_out (default WP_FANOUT_CONCURRENCY or 8)
+        """
+        if not sites:
+            raise ValueError("At least one site must be configured")
+        self.sites = sites
+        self.default = default or next(iter(sites))
+        if self.default not in sites:
+            raise ValueError(f"Default site '{self.default}' is not configured")
+        self.metrics = metrics
+        if fanout_concurrency is None:
+            fanout_concurrency = int(os.getenv('WP_FANOUT_CONCURRENCY', '8'))
+        self.fanout_concurrency = max(1, fanout_concurrency)
+        
+        self.clients: Dict[str, Any] = {}
+        self._connector = None
+    
+    @property
+    def names(self) -> List[str]:
+        """Configured site names"""
+        return list(self.sites)
+    
+    def resolve(self, site: Optional[str]) -> str:
+        """Site name for a tool argument; None means the default site"""
+        if site is None or site == '':
+            return self.default
+        if site not in self.sites:
+            raise ValueError(f"Unknown site '{site}'. Configured sites: {', '.join(self.sites)}")
+        return site
+    
+    def client(self, site: Optional[str] = None):
+        """WordPressClient for a site, created on first use"""
+        name = self.resolve(site)
+        client = self.clients.get(name)
+        if client is None:
+            from wp_client import WordPressClient
+            
+            credentials = self.sites[name]
+            client = WordPressClient(
+                site_url=credentials['site_url'],
+                username=credentials['username'],
+                app_password=credentials['app_password'],
+                metrics=self.metrics if name == self.default else None,
+                connector_factory=self._shared_connector if len(self.sites) > 1 else None
+            )
+            self.clients[name] = client
+        return client
+    
+    def _shared_connector(self):
+        """Connector every site's session uses, built by the first client"""
+        if self._connector is None or self._connector.closed:
+            first = self.clients.get(self.default) or next(iter(self.clients.values()))
+            self._connector = first._create_connector()
+        return self._connector
+    
+    async def fan_out(self, call: Callable[[str], Awaitable[Any]],
+                      sites: Optional[List[str]] = None,
+                      on_result: Optional[Callable[[str, Dict[str, Any], int, int], Awaitable[None]]] = None
+                      ) -> Dict[str, Any]:
+        """
+        Run ``call(site)`` for several sites concurrently
+        
+        Args:
+            call: Coroutine function taking a site name
+            sites: Sites to query (default: all)
+            on_result: Awaited as each site finishes with (site, result, done, total)
+        
+        Returns:
+            Dict with per-site results in completion order and a summary. A
+            failing site is reported with its error and does not stop the rest.
+        """
+        sites = [self.resolve(site) for site in sites] if sites else self.names
+        semaphore = asyncio.Semaphore(self.fanout_concurrency)
+        
+        async def run_site(site: str):
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    result = {"success": True, "result": await call(site)}
+                except Exception as e:
+                    logger.warning(f"Site {site} failed: {e}")
+                    result = {"success": False, "error": str(e)}
+                result["elapsed_seconds"] = round(time.perf_counter() - start, 3)
+                return site, result
+        
+        start = time.perf_counter()
+        results: Dict[str, Any] = {}
+        for finished in asyncio.as_completed([run_site(site) for site in sites]):
+            site, result = await finished
+            results[site] = result
+            if on_result is not None:
+                await on_result(site, result, len(results), len(sites))
+        
+        failed = sum(1 for result in results.values() if not result["success"])
+        return {
+            "sites": results,
+            "summary": {
+                "sites": len(sites),
+                "succeeded": len(sites) - failed,
+                "failed": failed,
+                "elapsed_seconds": round(time.perf_counter() - start, 3)
+            }
+        }
+    
+    async def close(self) -> None:
+        """Close every client session, then the shared connector"""
+        for client in self.clients.values():
+            await client.close()
+        if self._connector is not None:
+            await self._connector.close()
+
+
+def with_site_argument(tools: List[Any], names: List[str], default: str) -> List[Any]:
+    """Copies of tool definitions that accept a ``site`` argument"""
+    site_schema = {
+        "type": "string",
+        "enum": [*names, ALL_SITES],
+        "description": f"Site to run on (default: {default}); '{ALL_SITES}' runs on every site and "
+                       f"returns results keyed by site"
+    }
+    result = []
+    for tool in tools:
+        schema = dict(tool.inputSchema)
+        schema["properties"] = {**schema.get("properties", {}), "site": site_schema}
+        result.append(tool.model_copy(update={"inputSchema": schema}))
+    return result
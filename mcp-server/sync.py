@@ -0,0 +1,603 @@
+"""
+Local mirror for WordPress MCP
+Keeps posts, pages, media and WooCommerce products in a SQLite store that is
+refreshed incrementally with ``modified_after``, so list and get calls can be
+answered without a round trip while the mirror is fresh. Posts and pages are
+also indexed with SQLite FTS5 so ``search`` queries are ranked locally.
+"""
+
+import asyncio
+import html
+import logging
+import os
+import re
+import sqlite3
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import jsoncodec
+from cache import ResponseCache
+
+logger = logging.getLogger(__name__)
+
+# Query parameters the mirror understands besides per-collection filters
+PAGING_PARAMS = {'per_page', 'page', 'orderby', 'order', '_fields', 'search'}
+
+# orderby values -> SQL expression over the items table
+ORDER_COLUMNS = {
+    'date': 'items.date',
+    'modified': 'items.modified',
+    'title': 'items.title',
+    'id': 'items.id',
+    'slug': "json_extract(items.data, '$.slug')"
+}
+
+# Collections with a full-text index, and bm25 weights for title, excerpt, content
+SEARCHABLE = ('posts', 'pages')
+SEARCH_WEIGHTS = (10.0, 3.0, 1.0)
+
+TAG = re.compile(r'<[^>]+>')
+SEARCH_TOKEN = re.compile(r'"([^"]*)"|(\S+)')
+
+# WordPress caps per_page at 100 and rejects larger values
+MAX_PER_PAGE = 100
+
+# Filter fields stored as JSON numbers or booleans; every other filter is a string
+FILTER_TYPES = {'author': int, 'parent': int, 'sticky': bool, 'featured': bool}
+
+# Boolean spellings the REST API accepts in query strings
+BOOLEAN_TEXT = {'true': True, '1': True, 'false': False, '0': False}
+
+
+class MirrorCollection:
+    """How one REST collection is fetched and indexed"""
+    
+    __slots__ = ('name', 'endpoint', 'route', 'params', 'modified_field', 'date_field',
+                 'title_field', 'filters', 'defaults', 'gmt')
+    
+    def __init__(self, name: str, endpoint: str, route: str, params: Dict[str, Any],
+                 modified_field: str, date_field: str, title_field: str,
+                 filters: Iterable[str], defaults: Optional[Dict[str, Any]] = None,
+                 gmt: bool = False):
+        """
+        Args:
+            name: Key in WP_SYNC_COLLECTIONS (e.g. 'posts')
+            endpoint: Client endpoint (e.g. 'wc/products')
+            route: REST route the endpoint resolves to (e.g. 'wc/v3/products')
+            params: Query parameters sent on every sync request
+            modified_field: Item field compared by ``modified_after``
+            date_field: Item field used for orderby=date
+            title_field: Item field used for orderby=title
+            filters: Top-level fields that list queries may filter on by equality
+            defaults: Filters the REST API applies when a parameter is omitted
+            gmt: Send ``dates_are_gmt`` (WooCommerce) so the cursor is read as GMT
+        """
+        self.name = name
+        self.endpoint = endpoint
+        self.route = route
+        self.params = params
+        self.modified_field = modified_field
+        self.date_field = date_field
+        self.title_field = title_field
+        self.filters = frozenset(filters)
+        self.defaults = defaults or {}
+        self.gmt = gmt
+
+
+COLLECTIONS: Dict[str, MirrorCollection] = {
+    'posts': MirrorCollection('posts', 'posts', 'wp/v2/posts', {'status': 'any'},
+                              'modified', 'date', 'title', ('status', 'author', 'slug', 'sticky'),
+                              defaults={'status': 'publish'}),
+    'pages': MirrorCollection('pages', 'pages', 'wp/v2/pages', {'status': 'any'},
+                              'modified', 'date', 'title', ('status', 'author', 'slug', 'parent', 'type'),
+                              defaults={'status': 'publish'}),
+    'media': MirrorCollection('media', 'media', 'wp/v2/media', {},
+                              'modified', 'date', 'title', ('media_type', 'mime_type', 'author', 'slug')),
+    'products': MirrorCollection('products', 'wc/products', 'wc/v3/products', {'status': 'any'},
+                                 'date_modified_gmt', 'date_created', 'name',
+                                 ('status', 'stock_status', 'type', 'featured', 'sku', 'slug'), gmt=True),
+}
+
+
+def _text(value: Any) -> str:
+    """Plain value of a field that may be a {'rendered': ...} object"""
+    if isinstance(value, dict):
+        value = value.get('rendered', value.get('raw', ''))
+    return '' if value is None else str(value)
+
+
+def _plain(value: Any) -> str:
+    """Rendered HTML field as plain text for the search index"""
+    return html.unescape(TAG.sub(' ', _text(value)))
+
+
+def coerce_filter(field: str, value: Any) -> Any:
+    """
+    Convert a query parameter to the type of the item field it filters
+    
+    The REST API accepts ``author="1"`` or ``sticky="false"``; SQLite would
+    compare such text with the stored JSON number or boolean and never match.
+    
+    Raises:
+        ValueError: The value cannot stand for the field's type
+    """
+    kind = FILTER_TYPES.get(field, str)
+    if kind is bool:
+        if isinstance(value, bool):
+            return value
+        if isinstance(value, int) and value in (0, 1):
+            return bool(value)
+        if isinstance(value, str) and value.strip().lower() in BOOLEAN_TEXT:
+            return BOOLEAN_TEXT[value.strip().lower()]
+    elif kind is int:
+        if isinstance(value, int) and not isinstance(value, bool):
+            return value
+        if isinstance(value, str) and value.strip().isdigit():
+            return int(value)
+    elif isinstance(value, str):
+        return value
+    elif isinstance(value, int) and not isinstance(value, bool):
+        return str(value)
+    raise ValueError(f"Unsupported value for {field}: {value!r}")
+
+
+def fts_query(search: str) -> Optional[str]:
+    """
+    Translate a search box string into an FTS5 query
+    
+    Words must all match, ``"quoted text"`` matches a phrase, ``word*``
+    matches a prefix and ``-word`` excludes. Every term is quoted so FTS5
+    operators typed by the user are matched as text.
+    
+    Returns:
+        The query, or None when nothing searchable is left
+    """
+    include, exclude = [], []
+    for phrase, word in SEARCH_TOKEN.findall(search):
+        negate = word.startswith('-') and len(word) > 1
+        prefix = word.endswith('*')
+        text = phrase if phrase else word.lstrip('-').rstrip('*')
+        if not re.search(r'\w', text):
+            continue
+        term = '"' + text.replace('"', ' ') + '"' + ('*' if prefix else '')
+        (exclude if negate else include).append(term)
+    if not include:
+        return None
+    return ' '.join(include + [f"NOT {term}" for term in exclude])
+
+
+def _overlap(cursor: str, seconds: int = 1) -> str:
+    """Move a cursor back so items modified in the same second are not missed"""
+    try:
+        return (datetime.fromisoformat(cursor) - timedelta(seconds=seconds)).isoformat()
+    except ValueError:
+        return cursor
+
+
+class MirrorStore:
+    """SQLite tables holding mirrored items and per-collection sync state"""
+    
+    def __init__(self, path: str = ':memory:'):
+        """
+        Initialize the store
+        
+        Args:
+            path: Database file, or ':memory:' for a mirror that is rebuilt on start
+        """
+        self.path = path
+        self.db = sqlite3.connect(path)
+        if path != ':memory:':
+            self.db.execute("PRAGMA journal_mode=WAL")
+            self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS items (
+                collection TEXT NOT NULL,
+                id INTEGER NOT NULL,
+                status TEXT,
+                date TEXT,
+                modified TEXT,
+                title TEXT,
+                data TEXT NOT NULL,
+                PRIMARY KEY (collection, id)
+            );
+            CREATE INDEX IF NOT EXISTS items_date ON items (collection, date);
+            CREATE INDEX IF NOT EXISTS items_status_date ON items (collection, status, date);
+            CREATE INDEX IF NOT EXISTS items_modified ON items (collection, modified);
+            CREATE TABLE IF NOT EXISTS sync_state (
+                collection TEXT PRIMARY KEY,
+                cursor TEXT,
+                synced_at REAL
+            );
+        """)
+        self.fts = self._create_search_tables()
+    
+    def _create_search_tables(self) -> bool:
+        """Create one FTS5 table per searchable collection, keyed by item id"""
+        try:
+            for name in SEARCHABLE:
+                self.db.execute(f"CREATE VIRTUAL TABLE IF NOT EXISTS search_{name} USING fts5("
+                                f"title, excerpt, content, tokenize='unicode61 remove_diacritics 2')")
+        except sqlite3.OperationalError as e:
+            logger.info(f"SQLite full-text search unavailable ({e}); searches go to the site")
+            return False
+        return True
+    
+    def upsert(self, spec: MirrorCollection, items: List[Dict]) -> int:
+        """Insert or replace items; returns the number written"""
+        rows = []
+        for item in items:
+            item = {k: v for k, v in item.items() if k != '_links'}
+            rows.append((
+                spec.name, item['id'], item.get('status'),
+                _text(item.get(spec.date_field)), _text(item.get(spec.modified_field)),
+                _text(item.get(spec.title_field)), jsoncodec.dumps(item)
+            ))
+        with self.db:
+            self.db.executemany(
+                "INSERT OR REPLACE INTO items (collection, id, status, date, modified, title, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+            )
+            if self.fts and spec.name in SEARCHABLE:
+                table = f"search_{spec.name}"
+                self.db.executemany(f"DELETE FROM {table} WHERE rowid = ?", [(item['id'],) for item in items])
+                self.db.executemany(
+                    f"INSERT INTO {table} (rowid, title, excerpt, content) VALUES (?, ?, ?, ?)",
+                    [(item['id'], _plain(item.get('title')), _plain(item.get('excerpt')),
+                      _plain(item.get('content'))) for item in items]
+                )
+        return len(rows)
+    
+    def delete(self, collection: str, ids: Iterable[int]) -> int:
+        """Remove items by id"""
+        ids = list(ids)
+        with self.db:
+            cursor = self.db.executemany("DELETE FROM items WHERE collection = ? AND id = ?",
+                                         [(collection, i) for i in ids])
+            if self.fts and collection in SEARCHABLE:
+                self.db.executemany(f"DELETE FROM search_{collection} WHERE rowid = ?",
+                                    [(i,) for i in ids])
+        return cursor.rowcount
+    
+    def delete_missing(self, collection: str, keep: Iterable[int]) -> int:
+        """Remove items whose id is not in ``keep`` (deleted or trashed upstream)"""
+        present = self.ids(collection)
+        return self.delete(collection, present - set(keep))
+    
+    def ids(self, collection: str) -> set:
+        """Ids currently mirrored for a collection"""
+        return {row[0] for row in self.db.execute("SELECT id FROM items WHERE collection = ?",
+                                                  (collection,))}
+    
+    def get(self, collection: str, item_id: int) -> Optional[Dict]:
+        """One mirrored item"""
+        row = self.db.execute("SELECT data FROM items WHERE collection = ? AND id = ?",
+                              (collection, item_id)).fetchone()
+        return jsoncodec.loads(row[0]) if row else None
+    
+    def query(self, collection: str, filters: Dict[str, Any], orderby: str = 'date',
+              order: str = 'desc', limit: Optional[int] = None, offset: int = 0,
+              match: Optional[str] = None) -> List[Dict]:
+        """
+        List mirrored items
+        
+        Args:
+            collection: Collection name
+            filters: Top-level field -> value equality filters (names must be trusted,
+                values of the stored type; see coerce_filter)
+            orderby: Key of ORDER_COLUMNS, or 'relevance' together with ``match``
+            order: 'asc' or 'desc'
+            limit: Maximum rows, None for all
+            offset: Rows to skip
+            match: FTS5 query (see fts_query); only items matching it are listed
+        """
+        if match is not None:
+            table = f"search_{collection}"
+            sql = [f"SELECT items.id FROM {table} JOIN items ON items.collection = ? "
+                   f"AND items.id = {table}.rowid WHERE {table} MATCH ?"]
+            args: List[Any] = [collection, match]
+        else:
+            sql = ["SELECT items.id FROM items WHERE items.collection = ?"]
+            args = [collection]
+        for field, value in filters.items():
+            column = 'items.status' if field == 'status' else f"json_extract(items.data, '$.{field}')"
+            sql.append(f"AND {column} = ?")
+            args.append(value)
+        direction = 'ASC' if order == 'asc' else 'DESC'
+        if orderby == 'relevance':
+            # bm25() is lower for better matches
+            weights = ', '.join(str(w) for w in SEARCH_WEIGHTS)
+            sql.append(f"ORDER BY bm25({table}, {weights}), items.id DESC")
+        else:
+            sql.append(f"ORDER BY {ORDER_COLUMNS[orderby]} {direction}, items.id {direction}")
+        if limit is not None:
+            sql.append("LIMIT ? OFFSET ?")
+            args.extend((limit, offset))
+        
+        # Order ids first so the sorter does not carry every matching body
+        ids = [row[0] for row in self.db.execute(' '.join(sql), args)]
+        return self._load(collection, ids)
+    
+    def _load(self, collection: str, ids: List[int]) -> List[Dict]:
+        """Decode items in the order of ``ids``"""
+        bodies = {}
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            marks = ', '.join('?' * len(chunk))
+            bodies.update(self.db.execute(
+                f"SELECT id, data FROM items WHERE collection = ? AND id IN ({marks})",
+                [collection, *chunk]
+            ))
+        return [jsoncodec.loads(bodies[i]) for i in ids if i in bodies]
+    
+    def count(self, collection: str) -> int:
+        """Number of mirrored items in a collection"""
+        return self.db.execute("SELECT COUNT(*) FROM items WHERE collection = ?",
+                               (collection,)).fetchone()[0]
+    
+    def state(self, collection: str) -> Tuple[Optional[str], Optional[float]]:
+        """(cursor, synced_at) of a collection"""
+        row = self.db.execute("SELECT cursor, synced_at FROM sync_state WHERE collection = ?",
+                              (collection,)).fetchone()
+        return (row[0], row[1]) if row else (None, None)
+    
+    def set_state(self, collection: str, cursor: Optional[str], synced_at: float) -> None:
+        """Record the newest modified value seen and when the sync finished"""
+        with self.db:
+            self.db.execute("INSERT OR REPLACE INTO sync_state (collection, cursor, synced_at) "
+                            "VALUES (?, ?, ?)", (collection, cursor, synced_at))
+    
+    def close(self) -> None:
+        self.db.close()
+
+
+class SyncEngine:
+    """Keeps a MirrorStore in step with the site and answers reads from it
+    
+    The first refresh of a collection reads it in full; later refreshes ask
+    only for items with ``modified_after`` the newest value already stored.
+    Deletions do not show up in deltas, so every ``reconcile_every``
+    refreshes the id list is read with ``_fields=id`` and missing items are
+    dropped. Writes made through the client mark their collection dirty and
+    wake the refresh loop; reads go to the site until the next refresh.
+    """
+    
+    def __init__(self, client, store: Optional[MirrorStore] = None,
+                 collections: Optional[Iterable[str]] = None,
+                 interval: Optional[float] = None, max_staleness: Optional[float] = None,
+                 reconcile_every: int = 10, metrics=None):
+        """
+        Initialize sync engine
+        
+        Args:
+            client: WordPressClient used for sync requests; the engine attaches
+                itself as ``client.mirror``
+            store: Backing store (default WP_SYNC_DB or an in-memory database)
+            collections: Names from COLLECTIONS (default WP_SYNC_COLLECTIONS or all)
+            interval: Seconds between refreshes (default WP_SYNC_INTERVAL or 60)
+            max_staleness: Seconds after the last refresh that reads are still
+                served from the mirror (default WP_SYNC_MAX_STALENESS or 300)
+            reconcile_every: Refreshes between deletion checks
+            metrics: Optional MetricsCollector receiving mirror_* counters
+        """
+        if collections is None:
+            collections = os.getenv('WP_SYNC_COLLECTIONS', ','.join(COLLECTIONS)).split(',')
+        unknown = [name for name in collections if name.strip() not in COLLECTIONS]
+        if unknown:
+            raise ValueError(f"Unknown sync collections: {', '.join(unknown)}")
+        
+        self.client = client
+        self.store = store or MirrorStore(os.getenv('WP_SYNC_DB', ':memory:'))
+        self.collections = [COLLECTIONS[name.strip()] for name in collections]
+        self.interval = interval if interval is not None else float(os.getenv('WP_SYNC_INTERVAL', '60'))
+        self.max_staleness = (max_staleness if max_staleness is not None
+                              else float(os.getenv('WP_SYNC_MAX_STALENESS', '300')))
+        self.reconcile_every = max(1, reconcile_every)
+        self.metrics = metrics
+        
+        self._by_route = {spec.route: spec for spec in self.collections}
+        self._writes: Dict[str, int] = {spec.name: 0 for spec in self.collections}
+        self._synced_writes: Dict[str, int] = dict(self._writes)
+        self._refreshes: Dict[str, int] = {spec.name: 0 for spec in self.collections}
+        self._wake = asyncio.Event()
+        self.stats = {'hits': 0, 'misses': 0, 'synced_items': 0, 'deleted_items': 0}
+        
+        client.mirror = self
+    
+    # Sync
+    
+    async def refresh(self, spec: MirrorCollection, full: bool = False) -> int:
+        """
+        Fetch changes to one collection
+        
+        Args:
+            spec: Collection to refresh
+            full: Ignore the cursor and read the whole collection
+        
+        Returns:
+            Number of items written
+        """
+        writes = self._writes[spec.name]
+        cursor, _ = self.store.state(spec.name)
+        full = full or cursor is None
+        
+        params = dict(spec.params)
+        if not full:
+            params['modified_after'] = _overlap(cursor)
+            if spec.gmt:
+                params['dates_are_gmt'] = 'true'
+        
+        written, seen, batch = 0, [], []
+        newest = cursor
+        async for item in self.client.iter_collection(spec.endpoint, params, mirror=False):
+            batch.append(item)
+            seen.append(item['id'])
+            modified = _text(item.get(spec.modified_field))
+            if modified and (newest is None or modified > newest):
+                newest = modified
+            if len(batch) >= MAX_PER_PAGE:
+                written += self.store.upsert(spec, batch)
+                batch = []
+        if batch:
+            written += self.store.upsert(spec, batch)
+        
+        self._refreshes[spec.name] += 1
+        deleted = 0
+        if full:
+            deleted = self.store.delete_missing(spec.name, seen)
+        elif self._refreshes[spec.name] % self.reconcile_every == 0:
+            ids = [item['id'] async for item in self.client.iter_collection(
+                spec.endpoint, {**spec.params, '_fields': 'id'}, mirror=False)]
+            deleted = self.store.delete_missing(spec.name, ids)
+        
+        self.store.set_state(spec.name, newest, time.time())
+        self._synced_writes[spec.name] = writes
+        self._count('synced_items', written)
+        self._count('deleted_items', deleted)
+        logger.debug(f"Mirror {spec.name}: {written} updated, {deleted} removed")
+        return written
+    
+    async def refresh_all(self) -> None:
+        """Refresh every collection; one failing collection does not stop the rest"""
+        for spec in self.collections:
+            try:
+                await self.refresh(spec)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Mirror refresh of {spec.name} failed: {e}")
+    
+    async def run(self) -> None:
+        """Refresh forever, every ``interval`` seconds or sooner after a write"""
+        while True:
+            self._wake.clear()
+            await self.refresh_all()
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+    
+    # Client hooks
+    
+    def invalidate(self, url: str, deleted: bool = False) -> None:
+        """Called by the client after a write to ``url``"""
+        route = ResponseCache.route_for(url)
+        spec = self._by_route.get(ResponseCache.family_for(route))
+        if spec is None:
+            return
+        self._writes[spec.name] += 1
+        if deleted:
+            item_id = route[len(spec.route) + 1:]
+            if item_id.isdigit():
+                self.store.delete(spec.name, [int(item_id)])
+        self._wake.set()
+    
+    def lookup(self, url: str, params: Optional[Dict] = None, paginate: bool = True) -> Optional[Any]:
+        """
+        Answer a GET from the mirror
+        
+        Args:
+            url: Request URL
+            params: Query parameters
+            paginate: Apply per_page/page; False returns every matching item
+        
+        Returns:
+            The response body WordPress would send, or None when the mirror
+            cannot answer (collection not mirrored, stale, dirty, or a
+            parameter it does not understand). ``search`` is answered from
+            the full-text index, best matches first unless ``orderby`` is
+            given.
+        """
+        route = ResponseCache.route_for(url)
+        spec = self._by_route.get(ResponseCache.family_for(route))
+        if spec is None:
+            return None
+        if not self.is_fresh(spec):
+            return self._miss()
+        
+        params = {k: v for k, v in (params or {}).items() if v is not None}
+        fields = [f for f in str(params.get('_fields', '')).split(',') if f]
+        if any('.' in f for f in fields):
+            return self._miss()
+        
+        if route != spec.route:
+            item_id = route[len(spec.route) + 1:]
+            if not item_id.isdigit() or set(params) - {'_fields'}:
+                return self._miss()
+            item = self.store.get(spec.name, int(item_id))
+            if item is None:
+                return self._miss()
+            return self._hit(self._project(item, fields))
+        
+        # Searches are ranked by relevance unless an order is asked for
+        match = None
+        if 'search' in params:
+            match = fts_query(str(params['search']))
+            if match is None or not self.store.fts or spec.name not in SEARCHABLE:
+                return self._miss()
+        
+        filters = {**spec.defaults, **{k: v for k, v in params.items() if k not in PAGING_PARAMS}}
+        orderby = params.get('orderby', 'relevance' if match else 'date')
+        order = params.get('order', 'desc')
+        per_page = int(params.get('per_page', 10))
+        page = int(params.get('page', 1))
+        if orderby == 'relevance' and match is None:
+            return self._miss()
+        if (set(filters) - spec.filters or (orderby not in ORDER_COLUMNS and orderby != 'relevance')
+                or order not in ('asc', 'desc') or not 1 <= per_page <= MAX_PER_PAGE or page < 1):
+            return self._miss()
+        # Lists such as status=publish,draft are left to the site
+        if any(isinstance(v, (list, tuple, dict)) or (isinstance(v, str) and ',' in v)
+               for v in filters.values()):
+            return self._miss()
+        if filters.get('status') == 'any':
+            del filters['status']
+        try:
+            filters = {field: coerce_filter(field, value) for field, value in filters.items()}
+        except ValueError:
+            return self._miss()
+        
+        if paginate:
+            items = self.store.query(spec.name, filters, orderby, order, per_page,
+                                     (page - 1) * per_page, match=match)
+        else:
+            items = self.store.query(spec.name, filters, orderby, order, match=match)
+        return self._hit([self._project(item, fields) for item in items])
+    
+    def is_fresh(self, spec: MirrorCollection) -> bool:
+        """Synced recently and not written to since"""
+        _, synced_at = self.store.state(spec.name)
+        return (synced_at is not None
+                and time.time() - synced_at <= self.max_staleness
+                and self._writes[spec.name] == self._synced_writes[spec.name])
+    
+    def status(self) -> Dict[str, Any]:
+        """Per-collection item counts and sync age"""
+        now = time.time()
+        collections = {}
+        for spec in self.collections:
+            cursor, synced_at = self.store.state(spec.name)
+            collections[spec.name] = {
+                'items': self.store.count(spec.name),
+                'cursor': cursor,
+                'age_seconds': round(now - synced_at, 1) if synced_at else None,
+                'fresh': self.is_fresh(spec)
+            }
+        return {'collections': collections, **self.stats}
+    
+    @staticmethod
+    def _project(item: Dict, fields: List[str]) -> Dict:
+        return {k: item[k] for k in fields if k in item} if fields else item
+    
+    def _hit(self, data: Any) -> Any:
+        self._count('hits')
+        return data
+    
+    def _miss(self) -> None:
+        self._count('misses')
+        return None
+    
+    def _count(self, stat: str, value: int = 1) -> None:
+        self.stats[stat] += value
+        if self.metrics is not None and value:
+            self.metrics.increment(f"mirror_{stat}", value)
@@ -3,9 +3,19 @@ Media Tools for WordPress MCP
 Handles media library operations
 """
 
+import os
+import time
+from pathlib import Path
+from functools import partial
 from typing import List, Dict, Any
 from mcp.types import Tool
 
+from bulk import BulkExecutor, fetch_by_ids
+from fields import FIELDS_SCHEMA, fields_param, project
+
+# REST fields read by _summarize_media
+MEDIA_LIST_FIELDS = ("id", "title", "source_url", "media_type", "mime_type", "date")
+
 class MediaTools:
     """Tools for managing WordPress media"""
     
@@ -13,7 +23,9 @@ class MediaTools:
         self.wp = wp_client
         self.tools = {
             "wp_get_media": self.get_media,
+            "wp_get_media_by_ids": self.get_media_by_ids,
             "wp_upload_media": self.upload_media,
+            "wp_upload_media_batch": self.upload_media_batch,
             "wp_delete_media": self.delete_media
         }
     
@@ -35,13 +47,35 @@ class MediaTools:
                             "type": "string",
                             "description": "Filter by type (image, video, audio)",
                             "default": "image"
-                        }
+                        },
+                        "fetch_all": {
+                            "type": "boolean",
+                            "description": "Fetch every matching media item across all pages (per_page is ignored)",
+                            "default": False
+                        },
+                        "fields": FIELDS_SCHEMA
                     }
                 }
             ),
+            Tool(
+                name="wp_get_media_by_ids",
+                description="Get several media library items by ID in one call; returns them keyed by ID and lists IDs that were not found",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "ids": {
+                            "type": "array",
+                            "items": {"type": "integer"},
+                            "description": "Media item IDs"
+                        },
+                        "fields": FIELDS_SCHEMA
+                    },
+                    "required": ["ids"]
+                }
+            ),
             Tool(
                 name="wp_upload_media",
-                description="Upload media file (placeholder - needs implementation)",
+                description="Upload a local file to the media library",
                 inputSchema={
                     "type": "object",
                     "properties": {
@@ -52,11 +86,47 @@ class MediaTools:
                         "title": {
                             "type": "string",
                             "description": "Media title"
+                        },
+                        "alt_text": {
+                            "type": "string",
+                            "description": "Alternative text for images"
+                        },
+                        "mime_type": {
+                            "type": "string",
+                            "description": "Content type (guessed from the file name if omitted)"
                         }
                     },
                     "required": ["file_path"]
                 }
             ),
+            Tool(
+                name="wp_upload_media_batch",
+                description="Upload every matching file in a local directory to the media library",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "directory": {
+                            "type": "string",
+                            "description": "Local directory to upload from"
+                        },
+                        "pattern": {
+                            "type": "string",
+                            "description": "Glob pattern for file names",
+                            "default": "*"
+                        },
+                        "recursive": {
+                            "type": "boolean",
+                            "description": "Include files in subdirectories",
+                            "default": False
+                        },
+                        "concurrency": {
+                            "type": "integer",
+                            "description": "Maximum uploads in flight (default BULK_CONCURRENCY)"
+                        }
+                    },
+                    "required": ["directory"]
+                }
+            ),
             Tool(
                 name="wp_delete_media",
                 description="Delete media item",
@@ -89,28 +159,90 @@ class MediaTools:
         else:
             raise ValueError(f"Unknown tool: {tool_name}")
     
-    async def get_media(self, per_page=20, media_type="image"):
+    async def get_media(self, per_page=20, media_type="image", fetch_all=False, fields=None):
         """Get media library items"""
         params = {"per_page": per_page}
         if media_type:
             params["media_type"] = media_type
+        
+        params.update(fields_param(MEDIA_LIST_FIELDS, fields))
+        shape = partial(project, fields=fields) if fields else self._summarize_media
+        
+        if fetch_all:
+            return [shape(item)
+                    async for item in self.wp.iter_collection("media", params)]
             
         media_items = await self.wp.get("media", params)
-        return [{
+        return [shape(item) for item in media_items]
+    
+    async def get_media_by_ids(self, ids: List[int], fields=None):
+        """Get several media items in ceil(len(ids) / 100) concurrent requests"""
+        items, report = await fetch_by_ids(self.wp, "media", ids, fields_param(MEDIA_LIST_FIELDS, fields))
+        shape = partial(project, fields=fields) if fields else self._summarize_media
+        return {**report, "media": {media_id: shape(item) for media_id, item in items.items()}}
+    
+    def _summarize_media(self, item: Dict) -> Dict:
+        """Reduce a REST media object to the fields returned by wp_get_media"""
+        return {
             "id": item["id"],
             "title": item["title"]["rendered"],
             "url": item["source_url"],
             "type": item["media_type"],
             "mime_type": item["mime_type"],
             "date": item["date"]
-        } for item in media_items]
+        }
+    
+    async def upload_media(self, file_path: str, title="", alt_text="", mime_type=None):
+        """Upload a local file and report transfer throughput"""
+        size = os.path.getsize(file_path) if os.path.isfile(file_path) else 0
+        start = time.perf_counter()
+        media = await self.wp.upload_media(file_path, title=title or None,
+                                           alt_text=alt_text or None, mime_type=mime_type)
+        elapsed = time.perf_counter() - start
+        
+        return {
+            "success": True,
+            "id": media["id"],
+            "url": media.get("source_url"),
+            "mime_type": media.get("mime_type"),
+            **self._throughput(size, elapsed)
+        }
+    
+    async def upload_media_batch(self, directory: str, pattern="*", recursive=False,
+                                 concurrency=None):
+        """Upload a directory of files concurrently"""
+        root = Path(directory)
+        if not root.is_dir():
+            raise ValueError(f"Not a directory: {directory}")
+        
+        matches = root.rglob(pattern) if recursive else root.glob(pattern)
+        files = sorted(str(path) for path in matches if path.is_file())
+        
+        # Requests still pass through the client's rate limiter one by one
+        executor = BulkExecutor.for_client(self.wp, concurrency)
+        results, stats = await executor.map(files, self.upload_media)
+        
+        total_bytes = sum(r["size_bytes"] for r in results if not isinstance(r, Exception))
+        formatted = []
+        for path, result in zip(files, results):
+            if isinstance(result, Exception):
+                formatted.append({"file": path, "success": False, "error": str(result)})
+            else:
+                formatted.append({"file": path, **result})
+        
+        return {
+            **stats,
+            **self._throughput(total_bytes, stats["elapsed_seconds"]),
+            "results": formatted
+        }
     
-    async def upload_media(self, file_path: str, title=""):
-        """Upload media file - placeholder"""
-        # This would need actual file upload implementation
+    @staticmethod
+    def _throughput(size: int, elapsed: float) -> Dict:
+        """Transfer size and rate for upload responses"""
         return {
-            "success": False,
-            "message": "Media upload not yet implemented - requires file handling"
+            "size_bytes": size,
+            "elapsed_seconds": round(elapsed, 3),
+            "megabytes_per_second": round(size / elapsed / 1_000_000, 2) if elapsed > 0 else 0.0
         }
     
     async def delete_media(self, media_id: int, force=True):
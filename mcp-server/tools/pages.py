@@ -3,9 +3,16 @@ Page Tools for WordPress MCP
 Handles all page-related operations
 """
 
+from functools import partial
 from typing import List, Dict, Any
 from mcp.types import Tool
 
+from bulk import bulk_response, fetch_by_ids
+from fields import FIELDS_SCHEMA, fields_param, project
+
+# REST fields read by _summarize_page
+PAGE_LIST_FIELDS = ("id", "title", "slug", "status", "parent", "link")
+
 class PageTools:
     """Tools for managing WordPress pages"""
     
@@ -13,7 +20,9 @@ class PageTools:
         self.wp = wp_client
         self.tools = {
             "wp_get_pages": self.get_pages,
+            "wp_get_pages_by_ids": self.get_pages_by_ids,
             "wp_create_page": self.create_page,
+            "wp_bulk_create_pages": self.bulk_create_pages,
             "wp_update_page": self.update_page,
             "wp_delete_page": self.delete_page
         }
@@ -36,10 +45,37 @@ class PageTools:
                             "type": "integer",
                             "description": "Get child pages of specific parent",
                             "default": 0
-                        }
+                        },
+                        "fetch_all": {
+                            "type": "boolean",
+                            "description": "Fetch every matching page across all pages (per_page is ignored)",
+                            "default": False
+                        },
+                        "fields": FIELDS_SCHEMA
                     }
                 }
             ),
+            Tool(
+                name="wp_get_pages_by_ids",
+                description="Get several WordPress pages by ID in one call; returns them keyed by ID and lists IDs that were not found",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "ids": {
+                            "type": "array",
+                            "items": {"type": "integer"},
+                            "description": "Page IDs"
+                        },
+                        "status": {
+                            "type": "string",
+                            "description": "Only return items with this status (any, publish, draft, ...)",
+                            "default": "any"
+                        },
+                        "fields": FIELDS_SCHEMA
+                    },
+                    "required": ["ids"]
+                }
+            ),
             Tool(
                 name="wp_create_page",
                 description="Create a new WordPress page",
@@ -68,6 +104,31 @@ class PageTools:
                     "required": ["title", "content"]
                 }
             ),
+            Tool(
+                name="wp_bulk_create_pages",
+                description="Create many WordPress pages using batch requests (25 pages per request)",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "pages": {
+                            "type": "array",
+                            "description": "Array of page objects (same fields as wp_create_page)",
+                            "items": {
+                                "type": "object",
+                                "properties": {
+                                    "title": {"type": "string"},
+                                    "content": {"type": "string"},
+                                    "status": {"type": "string"},
+                                    "parent": {"type": "integer"},
+                                    "slug": {"type": "string"}
+                                },
+                                "required": ["title", "content"]
+                            }
+                        }
+                    },
+                    "required": ["pages"]
+                }
+            ),
             Tool(
                 name="wp_update_page",
                 description="Update an existing WordPress page",
@@ -124,22 +185,40 @@ class PageTools:
     
     # Tool implementations (simplified for now)
     
-    async def get_pages(self, per_page=10, parent=0):
+    async def get_pages(self, per_page=10, parent=0, fetch_all=False, fields=None):
         """Get list of pages"""
         params = {
             "per_page": per_page,
             "parent": parent,
             "type": "page"
         }
+        params.update(fields_param(PAGE_LIST_FIELDS, fields))
+        shape = partial(project, fields=fields) if fields else self._summarize_page
+        
+        if fetch_all:
+            return [shape(page)
+                    async for page in self.wp.iter_collection("pages", params)]
+        
         pages = await self.wp.get("pages", params)
-        return [{
+        return [shape(page) for page in pages]
+    
+    async def get_pages_by_ids(self, ids: List[int], status="any", fields=None):
+        """Get several pages in ceil(len(ids) / 100) concurrent requests"""
+        params = {"status": status, **fields_param(PAGE_LIST_FIELDS, fields)}
+        pages, report = await fetch_by_ids(self.wp, "pages", ids, params)
+        shape = partial(project, fields=fields) if fields else self._summarize_page
+        return {**report, "pages": {page_id: shape(page) for page_id, page in pages.items()}}
+    
+    def _summarize_page(self, page: Dict) -> Dict:
+        """Reduce a REST page object to the fields returned by wp_get_pages"""
+        return {
             "id": page["id"],
             "title": page["title"]["rendered"],
             "slug": page["slug"],
             "status": page["status"],
             "parent": page["parent"],
             "link": page["link"]
-        } for page in pages]
+        }
     
     async def create_page(self, title: str, content: str, status="draft", parent=0):
         """Create new page"""
@@ -157,6 +236,20 @@ class PageTools:
             "link": result["link"]
         }
     
+    async def bulk_create_pages(self, pages: List[Dict]):
+        """Create many pages through batch/v1"""
+        requests = [self.wp.batch_request("POST", "pages", {"status": "draft", "parent": 0, **page})
+                    for page in pages]
+        results, stats = await self.wp.batch(requests)
+        
+        def identify(page, result):
+            entry = {"title": page.get("title")}
+            if result:
+                entry.update({"page_id": result.get("id"), "link": result.get("link")})
+            return entry
+        
+        return bulk_response(pages, results, stats, identify)
+    
     async def update_page(self, page_id: int, **kwargs):
         """Update existing page"""
         result = await self.wp.put(f"pages/{page_id}", kwargs)
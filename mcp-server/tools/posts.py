@@ -6,6 +6,16 @@ Handles all post-related operations
 from typing import List, Dict, Any
 from mcp.types import Tool
 import json
+from functools import partial
+
+from bulk import bulk_response, fetch_by_ids, summarize
+from fields import FIELDS_SCHEMA, fields_param, project
+
+# REST fields read by each summary; sent as _fields so nothing else is downloaded
+POST_LIST_FIELDS = ("id", "title", "slug", "status", "date", "modified", "link", "excerpt")
+POST_DETAIL_FIELDS = ("id", "title", "content", "slug", "status", "date", "modified",
+                      "link", "categories", "tags", "featured_media")
+POST_SEARCH_FIELDS = ("id", "title", "link", "excerpt")
 
 class PostTools:
     """Tools for managing WordPress posts"""
@@ -15,10 +25,13 @@ class PostTools:
         self.tools = {
             "wp_get_posts": self.get_posts,
             "wp_get_post": self.get_post,
+            "wp_get_posts_by_ids": self.get_posts_by_ids,
             "wp_create_post": self.create_post,
             "wp_update_post": self.update_post,
             "wp_delete_post": self.delete_post,
-            "wp_search_posts": self.search_posts
+            "wp_search_posts": self.search_posts,
+            "wp_bulk_update_posts": self.bulk_update_posts,
+            "wp_bulk_assign_terms": self.bulk_assign_terms
         }
     
     def get_tools(self) -> List[Tool]:
@@ -54,7 +67,13 @@ class PostTools:
                             "type": "string",
                             "description": "Order direction (asc, desc)",
                             "default": "desc"
-                        }
+                        },
+                        "fetch_all": {
+                            "type": "boolean",
+                            "description": "Fetch every matching post across all pages (per_page is ignored)",
+                            "default": False
+                        },
+                        "fields": FIELDS_SCHEMA
                     }
                 }
             ),
@@ -67,11 +86,33 @@ class PostTools:
                         "post_id": {
                             "type": "integer",
                             "description": "The post ID"
-                        }
+                        },
+                        "fields": FIELDS_SCHEMA
                     },
                     "required": ["post_id"]
                 }
             ),
+            Tool(
+                name="wp_get_posts_by_ids",
+                description="Get several WordPress posts by ID in one call; returns them keyed by ID and lists IDs that were not found",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "ids": {
+                            "type": "array",
+                            "items": {"type": "integer"},
+                            "description": "Post IDs"
+                        },
+                        "status": {
+                            "type": "string",
+                            "description": "Only return items with this status (any, publish, draft, ...)",
+                            "default": "any"
+                        },
+                        "fields": FIELDS_SCHEMA
+                    },
+                    "required": ["ids"]
+                }
+            ),
             Tool(
                 name="wp_create_post",
                 description="Create a new WordPress post",
@@ -164,22 +205,86 @@ class PostTools:
             ),
             Tool(
                 name="wp_search_posts",
-                description="Search WordPress posts by keyword",
+                description="Search WordPress posts by keyword (best matches first when the local mirror is enabled)",
                 inputSchema={
                     "type": "object",
                     "properties": {
                         "search": {
                             "type": "string",
-                            "description": "Search keyword"
+                            "description": "Search keywords; \"quoted phrase\", prefix* and -excluded terms are supported"
                         },
                         "per_page": {
                             "type": "integer",
                             "description": "Number of results",
                             "default": 10
-                        }
+                        },
+                        "page": {
+                            "type": "integer",
+                            "description": "Page of results",
+                            "default": 1
+                        },
+                        "fields": FIELDS_SCHEMA
                     },
                     "required": ["search"]
                 }
+            ),
+            Tool(
+                name="wp_bulk_update_posts",
+                description="Update many WordPress posts using batch requests (25 posts per request)",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "posts": {
+                            "type": "array",
+                            "description": "Array of {id, ...fields to change} (same fields as wp_update_post, plus categories and tags)",
+                            "items": {
+                                "type": "object",
+                                "properties": {
+                                    "id": {"type": "integer"},
+                                    "title": {"type": "string"},
+                                    "content": {"type": "string"},
+                                    "status": {"type": "string"},
+                                    "slug": {"type": "string"},
+                                    "categories": {"type": "array", "items": {"type": "integer"}},
+                                    "tags": {"type": "array", "items": {"type": "integer"}}
+                                },
+                                "required": ["id"]
+                            }
+                        }
+                    },
+                    "required": ["posts"]
+                }
+            ),
+            Tool(
+                name="wp_bulk_assign_terms",
+                description="Add, remove or replace categories and tags on many posts using batch requests",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "post_ids": {
+                            "type": "array",
+                            "items": {"type": "integer"},
+                            "description": "Posts to change"
+                        },
+                        "categories": {
+                            "type": "array",
+                            "items": {"type": "integer"},
+                            "description": "Category IDs"
+                        },
+                        "tags": {
+                            "type": "array",
+                            "items": {"type": "integer"},
+                            "description": "Tag IDs"
+                        },
+                        "mode": {
+                            "type": "string",
+                            "description": "add to the current terms, remove from them, or replace them",
+                            "enum": ["add", "remove", "replace"],
+                            "default": "add"
+                        }
+                    },
+                    "required": ["post_ids"]
+                }
             )
         ]
     
@@ -197,7 +302,7 @@ class PostTools:
     # Tool implementations
     
     async def get_posts(self, per_page=10, page=1, status="publish", 
-                       orderby="date", order="desc", **kwargs):
+                       orderby="date", order="desc", fetch_all=False, fields=None, **kwargs):
         """Get list of posts"""
         params = {
             "per_page": per_page,
@@ -205,12 +310,23 @@ class PostTools:
             "status": status,
             "orderby": orderby,
             "order": order,
-            **kwargs
+            **kwargs,
+            **fields_param(POST_LIST_FIELDS, fields)
         }
+        shape = partial(project, fields=fields) if fields else self._summarize_post
+        
+        if fetch_all:
+            return [shape(post)
+                    async for post in self.wp.iter_collection("posts", params)]
+        
         posts = await self.wp.get_posts(**params)
         
         # Simplify the response
-        return [{
+        return [shape(post) for post in posts]
+    
+    def _summarize_post(self, post: Dict) -> Dict:
+        """Reduce a REST post object to the fields returned by wp_get_posts"""
+        return {
             "id": post["id"],
             "title": post["title"]["rendered"],
             "slug": post["slug"],
@@ -219,11 +335,24 @@ class PostTools:
             "modified": post["modified"],
             "link": post["link"],
             "excerpt": post["excerpt"]["rendered"][:200] + "..." if len(post["excerpt"]["rendered"]) > 200 else post["excerpt"]["rendered"]
-        } for post in posts]
+        }
     
-    async def get_post(self, post_id: int):
+    async def get_post(self, post_id: int, fields=None):
         """Get single post with full details"""
-        post = await self.wp.get_post(post_id)
+        post = await self.wp.get_post(post_id, **fields_param(POST_DETAIL_FIELDS, fields))
+        if fields:
+            return project(post, fields)
+        return self._detail_post(post)
+    
+    async def get_posts_by_ids(self, ids: List[int], status="any", fields=None):
+        """Get several posts in ceil(len(ids) / 100) concurrent requests"""
+        params = {"status": status, **fields_param(POST_DETAIL_FIELDS, fields)}
+        posts, report = await fetch_by_ids(self.wp, "posts", ids, params)
+        shape = partial(project, fields=fields) if fields else self._detail_post
+        return {**report, "posts": {post_id: shape(post) for post_id, post in posts.items()}}
+    
+    def _detail_post(self, post: Dict) -> Dict:
+        """Reduce a REST post object to the fields returned by wp_get_post"""
         return {
             "id": post["id"],
             "title": post["title"]["rendered"],
@@ -273,14 +402,22 @@ class PostTools:
             "message": f"Post {post_id} {'permanently deleted' if force else 'moved to trash'}"
         }
     
-    async def search_posts(self, search: str, per_page=10):
+    async def search_posts(self, search: str, per_page=10, page=1, fields=None):
         """Search posts by keyword"""
         params = {
             "search": search,
-            "per_page": per_page
+            "per_page": per_page,
+            "page": page,
+            **fields_param(POST_SEARCH_FIELDS, fields)
         }
         posts = await self.wp.get_posts(**params)
         
+        if fields:
+            return {
+                "found": len(posts),
+                "posts": [project(post, fields) for post in posts]
+            }
+        
         return {
             "found": len(posts),
             "posts": [{
@@ -290,3 +427,68 @@ class PostTools:
                 "excerpt": post["excerpt"]["rendered"][:200] + "..."
             } for post in posts]
         }
+    
+    async def bulk_update_posts(self, posts: List[Dict]):
+        """Update many posts through batch/v1"""
+        requests = [self.wp.batch_request("PUT", f"posts/{post['id']}",
+                                          {k: v for k, v in post.items() if k != "id"})
+                    for post in posts]
+        results, stats = await self.wp.batch(requests)
+        
+        def identify(post, result):
+            entry = {"id": post["id"]}
+            if result:
+                entry["link"] = result.get("link")
+            return entry
+        
+        return bulk_response(posts, results, stats, identify)
+    
+    async def bulk_assign_terms(self, post_ids: List[int], categories=None, tags=None, mode="add"):
+        """Change the categories and tags of many posts through batch/v1
+        
+        add and remove read the posts' current terms first (in include=
+        requests of 100), since the REST API only accepts the full list.
+        """
+        if mode not in ("add", "remove", "replace"):
+            raise ValueError(f"Unknown mode: {mode}")
+        changes = {taxonomy: terms for taxonomy, terms in
+                   (("categories", categories), ("tags", tags)) if terms is not None}
+        if not changes:
+            raise ValueError("Provide categories and/or tags")
+        post_ids = list(dict.fromkeys(post_ids))
+        
+        current = {}
+        if mode != "replace":
+            current, _ = await fetch_by_ids(self.wp, "posts", post_ids,
+                                            {"status": "any", "_fields": ",".join(["id", *changes])})
+        
+        def terms_for(post_id):
+            data = {}
+            for taxonomy, terms in changes.items():
+                existing = current[post_id].get(taxonomy, []) if mode != "replace" else []
+                if mode == "add":
+                    data[taxonomy] = list(dict.fromkeys([*existing, *terms]))
+                elif mode == "remove":
+                    data[taxonomy] = [term for term in existing if term not in terms]
+                else:
+                    data[taxonomy] = list(terms)
+            return data
+        
+        targets = [post_id for post_id in post_ids if mode == "replace" or post_id in current]
+        results, stats = await self.wp.batch(
+            [self.wp.batch_request("PUT", f"posts/{post_id}", terms_for(post_id)) for post_id in targets]
+        )
+        by_id = dict(zip(targets, results))
+        results = [by_id.get(post_id, Exception("Post not found")) for post_id in post_ids]
+        # Count posts that were not found as failures too
+        stats.update(summarize(results, stats["elapsed_seconds"]))
+        
+        def identify(post_id, result):
+            entry = {"id": post_id}
+            if result:
+                entry.update({taxonomy: result.get(taxonomy) for taxonomy in changes})
+            return entry
+        
+        response = bulk_response(post_ids, results, stats, identify)
+        response["mode"] = mode
+        return response
@@ -0,0 +1,153 @@
+"""
+Tool Registry for WordPress MCP
+Maps tool names to their handlers so dispatch does not scan every module
+"""
+
+import logging
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from mcp.types import Tool
+
+logger = logging.getLogger(__name__)
+
+# Tool modules of this package, shared by both servers:
+# module name -> (class name, substrings of its tool names so a call loads only the module it needs)
+TOOL_MODULES: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    'posts': ('PostTools', ('post', 'terms')),
+    'pages': ('PageTools', ('page',)),
+    'media': ('MediaTools', ('media',)),
+    'woocommerce': ('WooCommerceTools', ('wc_',)),
+    'templates': ('TemplateTools', ('template', 'child_theme')),
+    'system': ('SystemTools', ('system', 'plugin', 'theme', 'cache'))
+}
+
+
+class RegisteredTool:
+    """A tool definition bound to the coroutine that executes it"""
+    
+    __slots__ = ('name', 'module', 'handler', 'tool')
+    
+    def __init__(self, name: str, module: str, handler, tool: Tool):
+        self.name = name
+        self.module = module
+        self.handler = handler
+        self.tool = tool
+    
+    async def __call__(self, arguments: Optional[Dict]) -> Any:
+        return await self.handler(**(arguments or {}))
+
+
+class ToolRegistry:
+    """Name → handler index built once from the tool modules
+    
+    Modules can be registered eagerly (an instance) or lazily (a loader).
+    Lazy modules are imported and instantiated the first time a tool
+    lookup misses or the tool list is requested, so server startup does
+    not pay for modules that are not used yet. Name hints let a lookup
+    load the module that owns a tool first instead of every module
+    registered before it.
+    """
+    
+    def __init__(self):
+        self._entries: Dict[str, RegisteredTool] = {}
+        self._tool_list: Optional[List[Tool]] = None
+        self._pending: Dict[str, Callable[[], Any]] = {}
+        self._hints: Dict[str, Tuple[str, ...]] = {}
+        self.load_times: Dict[str, float] = {}
+    
+    def register_lazy(self, module_name: str, loader: Callable[[], Any],
+                      hints: Iterable[str] = ()) -> None:
+        """
+        Register a tool module to be loaded on first use
+        
+        Args:
+            module_name: Key used for the module (e.g. 'posts')
+            loader: Zero-argument callable returning the module instance
+            hints: Substrings of the module's tool names (e.g. 'wc_'); a
+                lookup loads modules whose hints match the name first
+        """
+        if module_name in self._pending or module_name in self.load_times:
+            raise ValueError(f"Duplicate tool module: {module_name}")
+        self._pending[module_name] = loader
+        self._hints[module_name] = tuple(hints)
+        self._tool_list = None
+    
+    def load(self, module_name: str) -> int:
+        """Load one pending module now; returns the number of tools it added"""
+        loader = self._pending.pop(module_name)
+        start = time.perf_counter()
+        module = loader()
+        count = self.register_module(module_name, module)
+        self.load_times[module_name] = time.perf_counter() - start
+        logger.debug(f"Loaded tool module {module_name} in {self.load_times[module_name] * 1000:.1f}ms")
+        return count
+    
+    def load_all(self) -> None:
+        """Load every pending module"""
+        for module_name in list(self._pending):
+            self.load(module_name)
+    
+    @property
+    def pending(self) -> List[str]:
+        """Names of modules registered lazily and not loaded yet"""
+        return list(self._pending)
+    
+    def register_module(self, module_name: str, module) -> int:
+        """
+        Index every tool a module exposes
+        
+        Args:
+            module_name: Key used for the module (e.g. 'posts')
+            module: Tool module with get_tools() and a ``tools`` handler map
+            
+        Returns:
+            Number of tools registered
+        """
+        count = 0
+        for tool in module.get_tools():
+            if tool.name in self._entries:
+                raise ValueError(f"Duplicate tool name: {tool.name}")
+            handler = module.tools.get(tool.name)
+            if handler is None:
+                raise ValueError(f"Tool {tool.name} has no handler in module {module_name}")
+            self._entries[tool.name] = RegisteredTool(tool.name, module_name, handler, tool)
+            count += 1
+        
+        # Rebuild the cached listing on next request
+        self._tool_list = None
+        logger.debug(f"Registered {count} tools from {module_name}")
+        return count
+    
+    def get(self, name: str) -> Optional[RegisteredTool]:
+        """
+        Look up a tool by name, loading pending modules until it is found
+        
+        Modules whose hints match the name are loaded first, the others
+        afterwards in registration order.
+        """
+        entry = self._entries.get(name)
+        if entry is not None or not self._pending:
+            return entry
+        likely = [module_name for module_name in self._pending
+                  if any(hint in name for hint in self._hints[module_name])]
+        for module_name in likely + [m for m in self._pending if m not in likely]:
+            self.load(module_name)
+            entry = self._entries.get(name)
+            if entry is not None:
+                break
+        return entry
+    
+    def list_tools(self) -> List[Tool]:
+        """All registered tool definitions, built once and reused"""
+        self.load_all()
+        if self._tool_list is None:
+            self._tool_list = [entry.tool for entry in self._entries.values()]
+        return self._tool_list
+    
+    def __contains__(self, name: str) -> bool:
+        return self.get(name) is not None
+    
+    def __len__(self) -> int:
+        self.load_all()
+        return len(self._entries)
@@ -6,6 +6,12 @@ Handles system information and advanced operations
 from typing import List, Dict, Any
 from mcp.types import Tool
 
+from fields import FIELDS_SCHEMA, fields_param, project
+
+# REST fields read by the plugin and theme listings
+PLUGIN_LIST_FIELDS = ("name", "plugin", "version", "status", "author")
+THEME_LIST_FIELDS = ("name", "stylesheet", "version", "status", "author")
+
 class SystemTools:
     """Tools for system operations"""
     
@@ -39,7 +45,8 @@ class SystemTools:
                             "type": "string",
                             "description": "Filter by status (active, inactive)",
                             "default": "active"
-                        }
+                        },
+                        "fields": FIELDS_SCHEMA
                     }
                 }
             ),
@@ -48,7 +55,9 @@ class SystemTools:
                 description="Get list of installed themes",
                 inputSchema={
                     "type": "object",
-                    "properties": {}
+                    "properties": {
+                        "fields": FIELDS_SCHEMA
+                    }
                 }
             ),
             Tool(
@@ -104,16 +113,16 @@ class SystemTools:
         
         return formatted
     
-    async def get_plugins(self, status="active"):
+    async def get_plugins(self, status="active", fields=None):
         """Get installed plugins"""
-        # This uses standard WP REST API
-        plugins = await self.wp.get("plugins")
+        # This uses standard WP REST API, which filters by status itself
+        params = fields_param(PLUGIN_LIST_FIELDS, fields)
+        if status in ("active", "inactive"):
+            params["status"] = status
+        plugins = await self.wp.get("plugins", params)
         
-        # Filter by status if requested
-        if status == "active":
-            plugins = [p for p in plugins if p["status"] == "active"]
-        elif status == "inactive":
-            plugins = [p for p in plugins if p["status"] == "inactive"]
+        if fields:
+            return [project(p, fields) for p in plugins]
         
         return [{
             "name": p["name"],
@@ -123,9 +132,12 @@ class SystemTools:
             "author": p["author"]
         } for p in plugins]
     
-    async def get_themes(self):
+    async def get_themes(self, fields=None):
         """Get installed themes"""
-        themes = await self.wp.get("themes")
+        themes = await self.wp.get("themes", fields_param(THEME_LIST_FIELDS, fields))
+        
+        if fields:
+            return [project(t, fields) for t in themes]
         
         return [{
             "name": t["name"]["rendered"],
@@ -3,17 +3,41 @@ WooCommerce Tools for WordPress MCP
 Handles all WooCommerce operations
 """
 
-from typing import List, Dict, Any
+import time
+from functools import partial
+from typing import List, Dict, Any, Callable, Tuple
 from mcp.types import Tool
 
+from bulk import BulkExecutor, bulk_response, chunked, fetch_by_ids, summarize, unpack_chunks
+from fields import FIELDS_SCHEMA, fields_param, project
+
+# REST fields read by the list summaries
+PRODUCT_LIST_FIELDS = ("id", "name", "sku", "price", "regular_price", "sale_price",
+                       "stock_quantity", "stock_status", "status")
+ORDER_LIST_FIELDS = ("id", "status", "total", "customer_id", "date_created", "billing")
+CUSTOMER_LIST_FIELDS = ("id", "email", "first_name", "last_name", "username")
+
+# WooCommerce accepts at most 100 create/update/delete items per batch request
+WC_BATCH_LIMIT = 100
+
+BULK_BACKEND_SCHEMA = {
+    "type": "string",
+    "description": "How to send updates: 'batch' (wc/v3 products/batch), "
+                   "'plugin' (mcp/v1 woocommerce/bulk-update) or 'individual' (one request per product)",
+    "enum": ["batch", "plugin", "individual"],
+    "default": "batch"
+}
+
 class WooCommerceTools:
     """Tools for managing WooCommerce"""
     
     def __init__(self, wp_client):
         self.wp = wp_client
+        self.bulk = BulkExecutor.for_client(wp_client)
         self.tools = {
             # Products
             "wc_get_products": self.get_products,
+            "wc_get_products_by_ids": self.get_products_by_ids,
             "wc_create_product": self.create_product,
             "wc_update_product": self.update_product,
             "wc_delete_product": self.delete_product,
@@ -24,7 +48,9 @@ class WooCommerceTools:
             "wc_get_customers": self.get_customers,
             # Bulk operations
             "wc_bulk_update_prices": self.bulk_update_prices,
-            "wc_bulk_update_stock": self.bulk_update_stock
+            "wc_bulk_update_stock": self.bulk_update_stock,
+            "wc_bulk_create_products": self.bulk_create_products,
+            "wc_bulk_delete_products": self.bulk_delete_products
         }
     
     def get_tools(self) -> List[Tool]:
@@ -50,10 +76,37 @@ class WooCommerceTools:
                         "stock_status": {
                             "type": "string",
                             "description": "Stock status (instock, outofstock)"
-                        }
+                        },
+                        "fetch_all": {
+                            "type": "boolean",
+                            "description": "Fetch every matching product across all pages (per_page is ignored)",
+                            "default": False
+                        },
+                        "fields": FIELDS_SCHEMA
                     }
                 }
             ),
+            Tool(
+                name="wc_get_products_by_ids",
+                description="Get several WooCommerce products by ID in one call; returns them keyed by ID and lists IDs that were not found",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "ids": {
+                            "type": "array",
+                            "items": {"type": "integer"},
+                            "description": "Product IDs"
+                        },
+                        "status": {
+                            "type": "string",
+                            "description": "Only return items with this status (any, publish, draft, ...)",
+                            "default": "any"
+                        },
+                        "fields": FIELDS_SCHEMA
+                    },
+                    "required": ["ids"]
+                }
+            ),
             Tool(
                 name="wc_create_product",
                 description="Create a new WooCommerce product",
@@ -161,7 +214,13 @@ class WooCommerceTools:
                         "customer": {
                             "type": "integer",
                             "description": "Customer ID"
-                        }
+                        },
+                        "fetch_all": {
+                            "type": "boolean",
+                            "description": "Fetch every matching order across all pages (per_page is ignored)",
+                            "default": False
+                        },
+                        "fields": FIELDS_SCHEMA
                     }
                 }
             ),
@@ -202,7 +261,13 @@ class WooCommerceTools:
                         "search": {
                             "type": "string",
                             "description": "Search term"
-                        }
+                        },
+                        "fetch_all": {
+                            "type": "boolean",
+                            "description": "Fetch every matching customer across all pages (per_page is ignored)",
+                            "default": False
+                        },
+                        "fields": FIELDS_SCHEMA
                     }
                 }
             ),
@@ -224,7 +289,8 @@ class WooCommerceTools:
                                     "sale_price": {"type": "string"}
                                 }
                             }
-                        }
+                        },
+                        "backend": BULK_BACKEND_SCHEMA
                     },
                     "required": ["products"]
                 }
@@ -245,10 +311,54 @@ class WooCommerceTools:
                                     "stock_quantity": {"type": "integer"}
                                 }
                             }
+                        },
+                        "backend": BULK_BACKEND_SCHEMA
+                    },
+                    "required": ["products"]
+                }
+            ),
+            Tool(
+                name="wc_bulk_create_products",
+                description="Create many WooCommerce products using batch requests",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "products": {
+                            "type": "array",
+                            "description": "Array of product objects (same fields as wc_create_product)",
+                            "items": {
+                                "type": "object",
+                                "properties": {
+                                    "name": {"type": "string"},
+                                    "type": {"type": "string"},
+                                    "regular_price": {"type": "string"},
+                                    "description": {"type": "string"},
+                                    "short_description": {"type": "string"},
+                                    "sku": {"type": "string"},
+                                    "manage_stock": {"type": "boolean"},
+                                    "stock_quantity": {"type": "integer"}
+                                },
+                                "required": ["name", "regular_price"]
+                            }
                         }
                     },
                     "required": ["products"]
                 }
+            ),
+            Tool(
+                name="wc_bulk_delete_products",
+                description="Permanently delete many WooCommerce products using batch requests",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "product_ids": {
+                            "type": "array",
+                            "description": "Product IDs to delete",
+                            "items": {"type": "integer"}
+                        }
+                    },
+                    "required": ["product_ids"]
+                }
             )
         ]
     
@@ -264,14 +374,33 @@ class WooCommerceTools:
             raise ValueError(f"Unknown tool: {tool_name}")
     
     # Product methods
-    async def get_products(self, per_page=10, status="publish", stock_status=None):
+    async def get_products(self, per_page=10, status="publish", stock_status=None, fetch_all=False,
+                           fields=None):
         """Get products"""
         params = {"per_page": per_page, "status": status}
         if stock_status:
             params["stock_status"] = stock_status
+        
+        params.update(fields_param(PRODUCT_LIST_FIELDS, fields))
+        shape = partial(project, fields=fields) if fields else self._summarize_product
+        
+        if fetch_all:
+            return [shape(p)
+                    async for p in self.wp.iter_collection("wc/products", params)]
             
         products = await self.wp.get_products(**params)
-        return [{
+        return [shape(p) for p in products]
+    
+    async def get_products_by_ids(self, ids: List[int], status="any", fields=None):
+        """Get several products in ceil(len(ids) / 100) concurrent requests"""
+        params = {"status": status, **fields_param(PRODUCT_LIST_FIELDS, fields)}
+        products, report = await fetch_by_ids(self.wp, "wc/products", ids, params, executor=self.bulk)
+        shape = partial(project, fields=fields) if fields else self._summarize_product
+        return {**report, "products": {product_id: shape(p) for product_id, p in products.items()}}
+    
+    def _summarize_product(self, p: Dict) -> Dict:
+        """Reduce a REST product object to the fields returned by wc_get_products"""
+        return {
             "id": p["id"],
             "name": p["name"],
             "sku": p["sku"],
@@ -281,7 +410,7 @@ class WooCommerceTools:
             "stock_quantity": p.get("stock_quantity"),
             "stock_status": p["stock_status"],
             "status": p["status"]
-        } for p in products]
+        }
     
     async def create_product(self, name: str, regular_price: str, **kwargs):
         """Create product"""
@@ -317,23 +446,35 @@ class WooCommerceTools:
         }
     
     # Order methods
-    async def get_orders(self, per_page=10, status=None, customer=None):
+    async def get_orders(self, per_page=10, status=None, customer=None, fetch_all=False,
+                         fields=None):
         """Get orders"""
         params = {"per_page": per_page}
         if status:
             params["status"] = status
         if customer:
             params["customer"] = customer
+        
+        params.update(fields_param(ORDER_LIST_FIELDS, fields))
+        shape = partial(project, fields=fields) if fields else self._summarize_order
+        
+        if fetch_all:
+            return [shape(o)
+                    async for o in self.wp.iter_collection("wc/orders", params)]
             
         orders = await self.wp.get_orders(**params)
-        return [{
+        return [shape(o) for o in orders]
+    
+    def _summarize_order(self, o: Dict) -> Dict:
+        """Reduce a REST order object to the fields returned by wc_get_orders"""
+        return {
             "id": o["id"],
             "status": o["status"],
             "total": o["total"],
             "customer_id": o["customer_id"],
             "date_created": o["date_created"],
             "billing": o["billing"]
-        } for o in orders]
+        }
     
     async def update_order(self, order_id: int, status: str, note=""):
         """Update order status"""
@@ -349,58 +490,170 @@ class WooCommerceTools:
         }
     
     # Customer methods
-    async def get_customers(self, per_page=10, search=None):
+    async def get_customers(self, per_page=10, search=None, fetch_all=False, fields=None):
         """Get customers"""
         params = {"per_page": per_page}
         if search:
             params["search"] = search
+        
+        params.update(fields_param(CUSTOMER_LIST_FIELDS, fields))
+        shape = partial(project, fields=fields) if fields else self._summarize_customer
+        
+        if fetch_all:
+            return [shape(c)
+                    async for c in self.wp.iter_collection("wc/customers", params)]
             
         customers = await self.wp.get_customers(**params)
-        return [{
+        return [shape(c) for c in customers]
+    
+    def _summarize_customer(self, c: Dict) -> Dict:
+        """Reduce a REST customer object to the fields returned by wc_get_customers"""
+        return {
             "id": c["id"],
             "email": c["email"],
             "first_name": c["first_name"],
             "last_name": c["last_name"],
             "username": c["username"]
-        } for c in customers]
+        }
     
     # Bulk operations
-    async def bulk_update_prices(self, products: List[Dict]):
-        """Bulk update product prices"""
-        results = []
+    async def _batch_products(self, operation: str, items: List[Any]) -> Tuple[List[Any], Dict]:
+        """
+        Send items through wc/v3/products/batch
+        
+        Items are split into chunks of WC_BATCH_LIMIT and the chunks are sent
+        concurrently. WooCommerce answers each chunk with one entry per item in
+        request order; entries carrying an "error" object become exceptions so
+        the caller sees the same value-or-exception list as BulkExecutor.map.
+        """
+        chunks = chunked(items, WC_BATCH_LIMIT)
+        
+        async def send(chunk):
+            response = await self.wp.post("wc/products/batch", {operation: chunk})
+            return response.get(operation, []) if isinstance(response, dict) else []
+        
+        def resolve(item, index, entries):
+            entry = entries[index] if index < len(entries) else None
+            if not isinstance(entry, dict):
+                return Exception("Missing item in batch response")
+            if entry.get("error"):
+                error = entry["error"]
+                return Exception(error.get("message", "Batch item failed") if isinstance(error, dict) else str(error))
+            return entry
+        
+        start = time.perf_counter()
+        chunk_results, chunk_stats = await self.bulk.map(chunks, send)
+        return unpack_chunks(chunks, chunk_results, chunk_stats, time.perf_counter() - start, resolve)
+    
+    async def _plugin_bulk_update(self, operation: str, products: List[Dict]) -> Tuple[List[Any], Dict]:
+        """
+        Send updates through the plugin's mcp/v1/woocommerce/bulk-update route
+        
+        The plugin reports results by product ID (and silently skips items
+        without one), so results are matched back to the inputs by ID.
+        """
+        chunks = chunked(products, WC_BATCH_LIMIT)
+        
+        async def send(chunk):
+            response = await self.wp.post("mcp/woocommerce/bulk-update", {
+                "operation": operation,
+                "items": chunk
+            })
+            return {r.get("id"): r for r in response.get("results", [])}
+        
+        def resolve(product, index, by_id):
+            entry = by_id.get(product.get("id"))
+            if entry is None:
+                return Exception("Product skipped by bulk-update route")
+            if not entry.get("success"):
+                return Exception(entry.get("error", "Update failed"))
+            return entry
+        
+        start = time.perf_counter()
+        chunk_results, chunk_stats = await self.bulk.map(chunks, send)
+        return unpack_chunks(chunks, chunk_results, chunk_stats, time.perf_counter() - start, resolve)
+    
+    async def _bulk_update(self, products: List[Dict], backend: str, plugin_operation: str,
+                           build: Callable[[Dict], Dict]) -> Dict:
+        """
+        Run a bulk product update through the selected backend
+        
+        An input that ``build`` cannot turn into an update (no "id", a
+        missing or malformed field) fails on its own; only the valid items
+        are sent.
+        """
+        if backend not in ("batch", "plugin", "individual"):
+            raise ValueError(f"Unknown bulk backend: {backend}")
+        
+        results: List[Any] = []
         for product in products:
             try:
-                data = {}
-                if "regular_price" in product:
-                    data["regular_price"] = product["regular_price"]
-                if "sale_price" in product:
-                    data["sale_price"] = product["sale_price"]
-                    
-                await self.wp.put(f"wc/products/{product['id']}", data)
-                results.append({"id": product["id"], "success": True})
-            except Exception as e:
-                results.append({"id": product["id"], "success": False, "error": str(e)})
-                
-        return {
-            "processed": len(results),
-            "results": results
-        }
+                results.append({"id": product["id"], **build(product)})
+            except KeyError as e:
+                results.append(ValueError(f"Missing field {e}"))
+            except (TypeError, ValueError) as e:
+                results.append(ValueError(f"Invalid product: {e}"))
+        valid = [index for index, result in enumerate(results) if not isinstance(result, Exception)]
+        
+        start = time.perf_counter()
+        if backend == "batch":
+            sent, stats = await self._batch_products("update", [results[i] for i in valid])
+        elif backend == "plugin":
+            sent, stats = await self._plugin_bulk_update(plugin_operation, [products[i] for i in valid])
+        else:
+            async def update(payload):
+                data = dict(payload)
+                return await self.wp.put(f"wc/products/{data.pop('id')}", data)
+            
+            sent, stats = await self.bulk.map([results[i] for i in valid], update)
+            stats["requests"] = len(valid)
+        
+        for index, result in zip(valid, sent):
+            results[index] = result
+        stats.update(summarize(results, time.perf_counter() - start))
+        
+        response = bulk_response(products, results, stats,
+                                 lambda product, result: {"id": product.get("id")})
+        response["backend"] = backend
+        return response
+    
+    async def bulk_update_prices(self, products: List[Dict], backend="batch"):
+        """Bulk update product prices"""
+        def build(product):
+            data = {}
+            if "regular_price" in product:
+                data["regular_price"] = product["regular_price"]
+            if "sale_price" in product:
+                data["sale_price"] = product["sale_price"]
+            return data
+        
+        return await self._bulk_update(products, backend, "update_prices", build)
     
-    async def bulk_update_stock(self, products: List[Dict]):
+    async def bulk_update_stock(self, products: List[Dict], backend="batch"):
         """Bulk update product stock"""
-        results = []
-        for product in products:
-            try:
-                data = {
-                    "stock_quantity": product["stock_quantity"],
-                    "stock_status": "instock" if product["stock_quantity"] > 0 else "outofstock"
-                }
-                await self.wp.put(f"wc/products/{product['id']}", data)
-                results.append({"id": product["id"], "success": True})
-            except Exception as e:
-                results.append({"id": product["id"], "success": False, "error": str(e)})
-                
-        return {
-            "processed": len(results),
-            "results": results
-        }
+        def build(product):
+            return {
+                "stock_quantity": product["stock_quantity"],
+                "stock_status": "instock" if product["stock_quantity"] > 0 else "outofstock"
+            }
+        
+        return await self._bulk_update(products, backend, "update_stock", build)
+    
+    async def bulk_create_products(self, products: List[Dict]):
+        """Bulk create products"""
+        payload = [{"type": "simple", **p} for p in products]
+        results, stats = await self._batch_products("create", payload)
+        
+        def identify(product, result):
+            entry = {"name": product.get("name"), "sku": product.get("sku", "")}
+            if result:
+                entry["product_id"] = result.get("id")
+            return entry
+        
+        return bulk_response(products, results, stats, identify)
+    
+    async def bulk_delete_products(self, product_ids: List[int]):
+        """Bulk delete products (WooCommerce batch deletes bypass the trash)"""
+        results, stats = await self._batch_products("delete", list(product_ids))
+        return bulk_response(product_ids, results, stats,
+                             lambda product_id, result: {"id": product_id})
@@ -5,17 +5,38 @@ Handles all communication with WordPress REST API and WooCommerce API
 
 import aiohttp
 import base64
-import json
 import logging
+import mimetypes
 import os
 import hashlib
-from typing import Dict, List, Optional, Any
-from urllib.parse import urljoin
+import random
+import ssl
+import time
+from typing import Dict, List, Optional, Any, AsyncIterator, Awaitable, Callable, Tuple
+from urllib.parse import quote, urljoin
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
 import asyncio
+from collections import deque
 from contextlib import asynccontextmanager
+from functools import partial
+
+from breaker import OPEN, CircuitBreakers, CircuitOpenError
+from bulk import BulkExecutor, chunked, unpack_chunks
+from cache import ResponseCache
+from concurrency import AdaptiveLimiter
+import jsoncodec
 
 logger = logging.getLogger(__name__)
 
+# Sub-requests WordPress core runs per batch/v1 call (rest_get_max_batch_size)
+BATCH_LIMIT = 25
+
+# Bytes read per chunk, and parsed items queued ahead of the consumer, when
+# a collection page is streamed
+STREAM_CHUNK_SIZE = 64 * 1024
+STREAM_QUEUE_ITEMS = 16
+
 # SECURITY: Configure logging to never log sensitive data
 class SanitizedFormatter(logging.Formatter):
     """Custom formatter that removes sensitive data from logs"""
@@ -40,7 +61,13 @@ for handler in logger.handlers:
 class WordPressClient:
     """Client for WordPress REST API communication with enhanced security"""
     
-    def __init__(self, site_url: str, username: str, app_password: str, timeout: int = 30):
+    def __init__(self, site_url: str, username: str, app_password: str, timeout: int = 30,
+                 keepalive: Optional[bool] = None, pool_limit: Optional[int] = None,
+                 pool_limit_per_host: Optional[int] = None,
+                 keepalive_timeout: Optional[float] = None,
+                 dns_cache_ttl: Optional[int] = None,
+                 cache: Optional[ResponseCache] = None, metrics=None,
+                 connector_factory: Optional[Callable[[], aiohttp.BaseConnector]] = None):
         # SECURITY: Validate HTTPS usage
         self.site_url = site_url.rstrip('/')
         if not self.site_url.startswith('https://') and not os.getenv('WP_ALLOW_HTTP', '').lower() == 'true':
@@ -50,6 +77,12 @@ class WordPressClient:
         # SECURITY: Store password hash for verification, not the actual password
         self._password_hash = hashlib.sha256(app_password.encode()).hexdigest()
         self.timeout = aiohttp.ClientTimeout(total=timeout)
+        # Uploads get no overall deadline, since sending a large file can take minutes;
+        # connecting and each wait for the server to answer are still bounded
+        self.upload_timeout = aiohttp.ClientTimeout(
+            total=None, sock_connect=timeout,
+            sock_read=float(os.getenv('WP_UPLOAD_TIMEOUT', '120'))
+        )
         
         # SECURITY: Create auth header without storing password
         app_password_clean = app_password.replace(' ', '')
@@ -66,14 +99,74 @@ class WordPressClient:
         self.wc_api = f"{self.site_url}/wp-json/wc/v3"
         self.custom_api = f"{self.site_url}/wp-json/mcp/v1"
         
-        # Session for connection pooling
+        # Session for connection pooling; with a connector_factory the
+        # connector is shared with other clients (sites.SitePool) and not closed here
         self.session: Optional[aiohttp.ClientSession] = None
+        self.connector_factory = connector_factory
+        
+        # Connection pool settings (keep-alive is on unless WP_KEEPALIVE=false)
+        if keepalive is None:
+            keepalive = os.getenv('WP_KEEPALIVE', 'true').lower() == 'true'
+        self.keepalive = keepalive
+        self.pool_limit = pool_limit or int(os.getenv('WP_POOL_LIMIT', '30'))
+        self.pool_limit_per_host = pool_limit_per_host or int(os.getenv('WP_POOL_LIMIT_PER_HOST', '10'))
+        self.keepalive_timeout = keepalive_timeout or float(os.getenv('WP_KEEPALIVE_TIMEOUT', '30'))
+        self.dns_cache_ttl = dns_cache_ttl or int(os.getenv('WP_DNS_CACHE_TTL', '300'))
+        
+        # One SSL context per client: CA certificates are loaded once and
+        # every pooled connection verifies against the same context
+        self._ssl_context: Optional[ssl.SSLContext] = None
+        
+        # Response cache for read-only GETs (disable with WP_CACHE=false)
+        self.metrics = metrics
+        if cache is None and os.getenv('WP_CACHE', 'true').lower() == 'true':
+            cache = ResponseCache(metrics=metrics)
+        self.cache = cache
+        if metrics is not None:
+            self._register_gauges(metrics)
+        
+        # Identical GETs already on the wire share one request (WP_COALESCE=false disables)
+        self.coalesce = os.getenv('WP_COALESCE', 'true').lower() == 'true'
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.coalesced_requests = 0
+        # Writes per collection; a GET that overlapped a write does not cache its answer
+        self._generations: Dict[str, int] = {}
+        
+        # Local mirror (sync.SyncEngine) that answers reads while it is fresh
+        self.mirror = None
+        
+        # Collections parsed item by item instead of buffered (WP_STREAM_COLLECTIONS=true);
+        # a streamed body larger than WP_MAX_RESPONSE_BYTES is refused
+        self.stream_collections = os.getenv('WP_STREAM_COLLECTIONS', 'false').lower() == 'true'
+        self.max_response_bytes = int(os.getenv('WP_MAX_RESPONSE_BYTES', str(64 * 1024 * 1024)))
+        
+        # Fail fast while an API namespace keeps failing (WP_BREAKER=false disables)
+        self.breakers = CircuitBreakers()
+        if metrics is not None:
+            metrics.register_gauge("circuit_state", "Circuit breaker state per API namespace "
+                                   "(0 closed, 1 half-open, 2 open)", self.breakers.samples)
         
         # Rate limiting
         self.rate_limiter = RateLimiter(
             max_requests=int(os.getenv('RATE_LIMIT', '60')),
-            time_window=60  # per minute
+            time_window=60,  # per minute
+            burst=int(os.getenv('RATE_LIMIT_BURST', '10'))
         )
+        
+        # Retries: jittered backoff between WP_RETRY_BASE and WP_RETRY_CAP
+        # seconds, drawn from a budget shared by every client in the process
+        self.retry_base = float(os.getenv('WP_RETRY_BASE', '0.5'))
+        self.retry_cap = float(os.getenv('WP_RETRY_CAP', '10'))
+        self.retry_budget = RetryBudget.shared()
+        
+        # Requests in flight adapt to the site between 1 and WP_POOL_LIMIT_PER_HOST
+        # (WP_ADAPTIVE_CONCURRENCY=false leaves only the connection pool limit)
+        self.concurrency = AdaptiveLimiter.from_env(self.pool_limit_per_host)
+        if metrics is not None and self.concurrency is not None:
+            metrics.register_gauge("concurrency_limit", "Adaptive limit on concurrent WordPress requests",
+                                   lambda: self.concurrency.current)
+            metrics.register_gauge("requests_in_flight", "WordPress requests currently in flight",
+                                   lambda: self.concurrency.in_flight)
     
     @asynccontextmanager
     async def get_session(self):
@@ -89,12 +182,9 @@ class WordPressClient:
             self.session = aiohttp.ClientSession(
                 headers=headers,
                 timeout=self.timeout,
-                connector=aiohttp.TCPConnector(
-                    limit=30,
-                    limit_per_host=10,
-                    force_close=True,  # Security: Force connection close
-                    enable_cleanup_closed=True
-                )
+                connector=self.connector_factory() if self.connector_factory else self._create_connector(),
+                connector_owner=self.connector_factory is None,
+                json_serialize=jsoncodec.dumps
             )
         try:
             yield self.session
@@ -102,6 +192,57 @@ class WordPressClient:
             logger.error(f"Session error: {str(e)}")  # Don't log full exception which might contain auth
             raise
     
+    def _register_gauges(self, metrics) -> None:
+        """Expose cache and connection pool state as gauges"""
+        if self.cache is not None:
+            metrics.register_gauge("cache_entries", "Cached GET responses",
+                                   lambda: len(self.cache))
+            metrics.register_gauge("cache_bytes", "Bytes held by the response cache",
+                                   lambda: self.cache.total_bytes)
+        metrics.register_gauge("pool_connections", "Connections to WordPress by state",
+                               self._pool_connection_samples)
+        metrics.register_gauge("pool_limit", "Maximum open connections to WordPress",
+                               lambda: self.pool_limit)
+    
+    def _pool_connection_samples(self) -> List[Tuple[Dict[str, str], int]]:
+        """In-use and idle connection counts of the shared connector"""
+        connector = self.session.connector if self.session and not self.session.closed else None
+        if connector is None:
+            return [({"state": "in_use"}, 0), ({"state": "idle"}, 0)]
+        # aiohttp has no public accessor for these; read them defensively
+        in_use = len(getattr(connector, '_acquired', ()))
+        idle = sum(len(conns) for conns in getattr(connector, '_conns', {}).values())
+        return [({"state": "in_use"}, in_use), ({"state": "idle"}, idle)]
+    
+    def _create_connector(self) -> aiohttp.TCPConnector:
+        """Build the TCP connector for the shared session
+        
+        In keep-alive mode idle connections stay in the pool for
+        ``keepalive_timeout`` seconds so consecutive tool calls skip the
+        TCP and TLS handshakes. With keep-alive disabled every request
+        opens and closes its own connection.
+        """
+        if not self.keepalive:
+            return aiohttp.TCPConnector(
+                limit=self.pool_limit,
+                limit_per_host=self.pool_limit_per_host,
+                force_close=True,
+                enable_cleanup_closed=True
+            )
+        
+        if self._ssl_context is None:
+            self._ssl_context = ssl.create_default_context()
+        
+        return aiohttp.TCPConnector(
+            limit=self.pool_limit,
+            limit_per_host=self.pool_limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            use_dns_cache=True,
+            ttl_dns_cache=self.dns_cache_ttl,
+            ssl=self._ssl_context,
+            enable_cleanup_closed=True
+        )
+    
     async def close(self):
         """Close the session properly"""
         if self.session and not self.session.closed:
@@ -120,22 +261,17 @@ class WordPressClient:
     async def test_connection(self) -> bool:
         """Test if we can connect to WordPress"""
         try:
-            # Check rate limit
-            if not await self.rate_limiter.acquire():
-                logger.error("Rate limit exceeded during connection test")
-                return False
+            # Wait for a rate limit token
+            await self.rate_limiter.wait()
             
-            async with aiohttp.ClientSession() as session:
-                headers = {"Authorization": self._auth_header}
-                
+            # Use the shared session so the handshake warms the pool
+            async with self.get_session() as session:
                 async with session.get(
                     f"{self.wp_api}/users/me",
-                    headers=headers,
-                    timeout=self.timeout,
                     ssl=True  # Force SSL verification
                 ) as response:
                     if response.status == 200:
-                        user = await response.json()
+                        user = jsoncodec.loads(await response.read())
                         logger.info(f"Connected as: {user.get('name', 'Unknown')}")
                         # Don't log capabilities as they might reveal security info
                         return True
@@ -149,67 +285,508 @@ class WordPressClient:
             logger.error(f"Connection error: {type(e).__name__}")  # Don't log full error
             return False
     
-    async def _request_with_retry(self, method: str, url: str, max_retries: int = 3, **kwargs):
-        """Make HTTP request with exponential backoff retry"""
+    async def _request_with_retry(self, method: str, url: str, max_retries: int = 3,
+                                  return_meta: bool = False,
+                                  handler: Optional[Callable[[aiohttp.ClientResponse], Awaitable[Any]]] = None,
+                                  **kwargs):
+        """Make HTTP request, retrying failures that are safe to repeat
+        
+        Only errors accepted by ``is_retryable`` are retried, after a
+        decorrelated-jitter backoff or the server's Retry-After, and only
+        while the shared RetryBudget allows it; anything else is raised at
+        once. With ``return_meta`` the result is a ``(data, meta)`` tuple
+        where meta holds the response ``status``, ``headers`` and body
+        ``size`` in bytes. ``handler`` replaces _handle_response for reading
+        the response (it must not be combined with ``return_meta``). While
+        the circuit breaker for the URL's
+        namespace is open, attempts raise CircuitOpenError without touching
+        the network.
+        """
+        breaker = self.breakers.for_url(url)
+        self.retry_budget.record_request()
+        delay = self.retry_base
         for attempt in range(max_retries):
             try:
-                # Check rate limit
-                if not await self.rate_limiter.acquire():
-                    raise Exception("Rate limit exceeded")
+                if breaker is not None:
+                    breaker.before_request()
                 
-                async with self.get_session() as session:
-                    async with session.request(method, url, **kwargs) as response:
-                        return await self._handle_response(response)
-            
-            except asyncio.TimeoutError:
-                if attempt == max_retries - 1:
+                start = None
+                elapsed = None
+                status = None
+                slot = None
+                try:
+                    # Wait for a rate limit token, then for a concurrency slot
+                    await self.rate_limiter.wait()
+                    if self.concurrency is not None:
+                        slot = await self.concurrency.acquire()
+                    
+                    start = time.perf_counter()
+                    status = "error"
+                    async with self.get_session() as session:
+                        async with session.request(method, url, **kwargs) as response:
+                            status = str(response.status)
+                            if handler is not None:
+                                # A handler may read the body at its consumer's pace;
+                                # upstream latency is the time to the response headers
+                                elapsed = time.perf_counter() - start
+                            data = await (handler or self._handle_response)(response)
+                            if return_meta:
+                                # Body is already buffered, read() does not touch the network
+                                body = await response.read()
+                                return data, {
+                                    "status": response.status,
+                                    "headers": response.headers,
+                                    "size": len(body or b"")
+                                }
+                            return data
+                except asyncio.CancelledError:
+                    # Abandoned, not failed: the probe slot is released without a verdict
+                    status = None
                     raise
-                wait_time = (2 ** attempt) * 1  # Exponential backoff: 1, 2, 4 seconds
-                logger.warning(f"Request timeout, retrying in {wait_time} seconds...")
-                await asyncio.sleep(wait_time)
+                finally:
+                    if start is not None and elapsed is None:
+                        elapsed = time.perf_counter() - start
+                    if slot is not None:
+                        self.concurrency.release(slot, status, elapsed)
+                    if breaker is not None:
+                        breaker.record(status)
+                    if self.metrics is not None and start is not None:
+                        self.metrics.record_upstream(method, url, status or "error", elapsed)
+            
+            except CircuitOpenError:
+                raise
             
             except Exception as e:
-                if attempt == max_retries - 1:
+                if (attempt == max_retries - 1 or self._circuit_open(breaker)
+                        or not is_retryable(method, e) or not self._spend_retry()):
                     raise
-                if "rate limit" in str(e).lower():
-                    wait_time = 10  # Longer wait for rate limits
+                
+                if isinstance(e, WordPressAPIError) and e.retry_after is not None:
+                    delay = min(e.retry_after, RateLimiter.MAX_PAUSE)
                 else:
-                    wait_time = (2 ** attempt) * 1
-                logger.warning(f"Request failed, retrying in {wait_time} seconds...")
-                await asyncio.sleep(wait_time)
+                    delay = self._backoff(delay)
+                
+                if isinstance(e, RateLimitError):
+                    # Hold every caller of this client until the server's
+                    # Retry-After has passed; the next wait() sleeps exactly that long
+                    self.rate_limiter.pause(delay)
+                    logger.warning(f"Rate limited by server, retrying in {delay:.1f} seconds...")
+                    continue
+                
+                logger.warning(f"{method} failed ({describe_error(e)}), retrying in {delay:.2f} seconds...")
+                await asyncio.sleep(delay)
+    
+    def _backoff(self, previous: float) -> float:
+        """Decorrelated jitter: uniform between the base and 3x the previous delay, capped"""
+        return min(self.retry_cap, random.uniform(self.retry_base, max(self.retry_base, previous * 3)))
+    
+    def _spend_retry(self) -> bool:
+        """Take a retry from the shared budget, counting the outcome"""
+        allowed = self.retry_budget.try_spend()
+        if self.metrics is not None:
+            self.metrics.increment('retries' if allowed else 'retries_denied')
+        if not allowed:
+            logger.warning("Retry budget exhausted, failing without retry")
+        return allowed
+    
+    @staticmethod
+    def _circuit_open(breaker) -> bool:
+        """True when the last failure opened the breaker, so backing off is pointless"""
+        return breaker is not None and breaker.state == OPEN
     
     async def get(self, endpoint: str, params: Optional[Dict] = None) -> Any:
         """GET request to API with retry logic"""
         url = self._build_url(endpoint)
         logger.debug(f"GET {url}")  # Don't log params which might contain sensitive data
         
+        if self.cache is None or self.cache.ttl_for(url) <= 0:
+            fetch = partial(self._mirrored_get, url, params)
+        else:
+            fetch = partial(self._cached_get, url, params)
+        
+        if not self.coalesce:
+            return await fetch()
+        return await self._single_flight(ResponseCache.make_key(url, params), fetch)
+    
+    async def _single_flight(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Share one in-flight request between callers asking for the same key
+        
+        The first caller starts ``fetch`` as a task; callers arriving before
+        it finishes await the same task and receive the same result or
+        exception. The task is shielded so one caller being cancelled does
+        not cancel the request for the others.
+        """
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced_requests += 1
+            if self.metrics is not None:
+                self.metrics.increment("coalesced_requests")
+            return await asyncio.shield(task)
+        
+        task = asyncio.ensure_future(fetch())
+        self._inflight[key] = task
+        
+        def forget(done: asyncio.Future) -> None:
+            if self._inflight.get(key) is done:
+                del self._inflight[key]
+            if not done.cancelled():
+                done.exception()  # Mark retrieved when every caller was cancelled
+        
+        task.add_done_callback(forget)
+        return await asyncio.shield(task)
+    
+    async def _mirrored_get(self, url: str, params: Optional[Dict]) -> Any:
+        """GET from the local mirror when it can answer, otherwise from the site"""
+        if self.mirror is not None:
+            data = self.mirror.lookup(url, params)
+            if data is not None:
+                return data
         return await self._request_with_retry('GET', url, params=params)
     
-    async def post(self, endpoint: str, data: Dict) -> Any:
-        """POST request to API with retry logic"""
-        url = self._build_url(endpoint)
-        logger.debug(f"POST {url}")
+    async def _cached_get(self, url: str, params: Optional[Dict]) -> Any:
+        """GET through the response cache, revalidating stale entries"""
+        key = self.cache.make_key(url, params)
+        entry, fresh = self.cache.lookup(key)
+        if fresh:
+            return entry.data
         
-        # SECURITY: Sanitize data before sending
-        sanitized_data = self._sanitize_data(data)
+        mirrored = self.mirror.lookup(url, params) if self.mirror is not None else None
+        if mirrored is not None:
+            return mirrored
+        
+        family = self._cache_family(url)
+        generation = self._generations.get(family, 0)
+        headers = entry.validators() if entry else {}
+        data, meta = await self._request_with_retry(
+            'GET', url, params=params, headers=headers, return_meta=True
+        )
         
-        return await self._request_with_retry('POST', url, json=sanitized_data)
+        if meta["status"] == 304 and entry is not None:
+            self.cache.revalidated(key, url)
+            return entry.data
+        
+        # The body may predate a write that finished while it was on the wire
+        if self._generations.get(family, 0) == generation:
+            self.cache.store(key, url, data, meta["size"], meta["headers"])
+        return data
     
-    async def put(self, endpoint: str, data: Dict) -> Any:
-        """PUT request to API with retry logic"""
+    async def get_page(self, endpoint: str, params: Optional[Dict] = None) -> Tuple[Any, Any]:
+        """GET one page of a collection, returning (items, response headers)"""
         url = self._build_url(endpoint)
-        logger.debug(f"PUT {url}")
+        logger.debug(f"GET {url}")
+        
+        data, meta = await self._request_with_retry('GET', url, params=params, return_meta=True)
+        return data, meta["headers"]
+    
+    async def iter_collection(self, endpoint: str, params: Optional[Dict] = None,
+                              per_page: int = 100, prefetch: Optional[int] = None,
+                              mirror: bool = True, stream: Optional[bool] = None) -> AsyncIterator[Dict]:
+        """
+        Iterate over every item of a paginated collection
+        
+        The first page is read to learn ``X-WP-TotalPages``; the following
+        pages are then fetched concurrently, at most ``prefetch`` pages ahead
+        of the consumer, and their items are yielded in collection order.
+        When the header is missing, pages are read one after another until a
+        short page is returned.
+        
+        Args:
+            endpoint: Collection endpoint, e.g. "posts" or "wc/products"
+            params: Query parameters applied to every page
+            per_page: Items per request (WordPress caps this at 100)
+            prefetch: Pages fetched ahead (default WP_PREFETCH_PAGES or 3)
+            mirror: Serve the whole listing from the local mirror when it is fresh
+            stream: Parse each page item by item as it arrives instead of
+                buffering it (default WP_STREAM_COLLECTIONS). Pages are
+                then read one after another, without prefetching, so memory
+                stays flat however large a page is.
+        """
+        if mirror and self.mirror is not None:
+            items = self.mirror.lookup(self._build_url(endpoint), params, paginate=False)
+            if items is not None:
+                for item in items:
+                    yield item
+                return
         
-        sanitized_data = self._sanitize_data(data)
+        params = dict(params or {})
+        params.pop('page', None)
+        params['per_page'] = per_page
+        window = max(1, prefetch or int(os.getenv('WP_PREFETCH_PAGES', '3')))
         
-        return await self._request_with_retry('PUT', url, json=sanitized_data)
+        if self.stream_collections if stream is None else stream:
+            url = self._build_url(endpoint)
+            page = 1
+            while True:
+                meta: Dict[str, Any] = {}
+                count = 0
+                items = self._stream_page(url, {**params, 'page': page}, meta)
+                try:
+                    async for item in items:
+                        count += 1
+                        yield item
+                finally:
+                    # Close now rather than when collected, so the request is cancelled
+                    await items.aclose()
+                total_pages = self._total_pages(meta.get('headers'))
+                if (count < per_page) if total_pages is None else (page >= total_pages):
+                    return
+                page += 1
+        
+        items, headers = await self.get_page(endpoint, {**params, 'page': 1})
+        total_pages = self._total_pages(headers)
+        for item in items or []:
+            yield item
+        
+        if total_pages is None:
+            page = 1
+            while items and len(items) >= per_page:
+                page += 1
+                items, _ = await self.get_page(endpoint, {**params, 'page': page})
+                for item in items or []:
+                    yield item
+            return
+        
+        next_page = 2
+        pending = deque()
+        try:
+            while next_page <= total_pages or pending:
+                while next_page <= total_pages and len(pending) < window:
+                    pending.append(asyncio.ensure_future(
+                        self.get_page(endpoint, {**params, 'page': next_page})
+                    ))
+                    next_page += 1
+                
+                items, _ = await pending.popleft()
+                for item in items or []:
+                    yield item
+        finally:
+            # Consumer stopped early or a page failed: drop the prefetches
+            for task in pending:
+                task.cancel()
+    
+    async def _stream_page(self, url: str, params: Dict, meta: Dict[str, Any]) -> AsyncIterator[Any]:
+        """
+        GET one collection page, yielding its items as they are parsed
+        
+        The body is read in chunks through jsoncodec.ArrayStream and the
+        items are handed over through a small queue, so only a few of them
+        are in memory at once. The response headers are stored in
+        ``meta['headers']``. Upstream latency is timed to the response
+        headers, not to the last item the consumer took. A body over
+        ``max_response_bytes`` raises
+        ResponseTooLargeError. Failures before the first item are retried
+        as usual; once items have been handed over the request is not
+        repeated and a broken body raises WordPressAPIError.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=STREAM_QUEUE_ITEMS)
+        finished = object()
+        sent = 0
+        
+        async def read(response: aiohttp.ClientResponse) -> None:
+            nonlocal sent
+            meta['headers'] = response.headers
+            if response.status != 200 or 'application/json' not in response.headers.get('Content-Type', ''):
+                data = await self._handle_response(response)
+                for item in data if isinstance(data, list) else []:
+                    await queue.put(item)
+                    sent += 1
+                return
+            
+            if (response.content_length or 0) > self.max_response_bytes:
+                raise ResponseTooLargeError(self.max_response_bytes, response.status)
+            parser = jsoncodec.ArrayStream()
+            received = 0
+            try:
+                async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+                    received += len(chunk)
+                    if received > self.max_response_bytes:
+                        raise ResponseTooLargeError(self.max_response_bytes, response.status)
+                    for item in parser.feed(chunk):
+                        await queue.put(item)
+                        sent += 1
+                for item in parser.close():
+                    await queue.put(item)
+                    sent += 1
+            except ResponseTooLargeError:
+                raise
+            except Exception as e:
+                if not sent:
+                    raise
+                raise WordPressAPIError(f"Response broke off after {sent} items: {describe_error(e)}",
+                                        response.status) from e
+        
+        async def produce() -> None:
+            try:
+                await self._request_with_retry('GET', url, params=params, handler=read)
+            except asyncio.CancelledError:
+                # The consumer stopped early: nobody reads the (possibly full) queue
+                raise
+            except Exception:
+                await queue.put(finished)
+                raise
+            await queue.put(finished)
+        
+        logger.debug(f"GET {url} (streamed)")
+        task = asyncio.ensure_future(produce())
+        try:
+            while True:
+                item = await queue.get()
+                if item is finished:
+                    break
+                yield item
+            await task
+        finally:
+            if not task.done():
+                task.cancel()
+                await asyncio.wait([task])
+            elif not task.cancelled():
+                task.exception()  # Retrieved even when the consumer stopped early
+    
+    @staticmethod
+    def _total_pages(headers) -> Optional[int]:
+        """Read X-WP-TotalPages from response headers"""
+        value = headers.get('X-WP-TotalPages') if headers else None
+        try:
+            return int(value) if value is not None else None
+        except (TypeError, ValueError):
+            return None
+    
+    async def post(self, endpoint: str, data: Dict) -> Any:
+        """POST request to API with retry logic"""
+        # SECURITY: Sanitize data before sending
+        return await self._write('POST', endpoint, json=self._sanitize_data(data))
+    
+    async def put(self, endpoint: str, data: Dict) -> Any:
+        """PUT request to API with retry logic"""
+        return await self._write('PUT', endpoint, json=self._sanitize_data(data))
     
     async def delete(self, endpoint: str) -> Any:
         """DELETE request to API with retry logic"""
+        return await self._write('DELETE', endpoint)
+    
+    async def _write(self, method: str, endpoint: str, **kwargs) -> Any:
+        """Send a write request, then forget cached reads of the collection it changed"""
         url = self._build_url(endpoint)
-        logger.debug(f"DELETE {url}")
+        logger.debug(f"{method} {url}")
         
-        return await self._request_with_retry('DELETE', url)
+        try:
+            return await self._request_with_retry(method, url, **kwargs)
+        finally:
+            # After the write, so a read racing with it cannot re-cache old data
+            self._invalidate_cache(url, deleted=method == 'DELETE')
+    
+    def batch_request(self, method: str, endpoint: str, body: Optional[Dict] = None) -> Dict:
+        """Build a batch() sub-request, addressing ``endpoint`` like get/post/put/delete"""
+        request = {"method": method, "path": self._build_url(endpoint)[len(f"{self.site_url}/wp-json"):]}
+        if body is not None:
+            request["body"] = body
+        return request
+    
+    async def batch(self, requests: List[Dict],
+                    concurrency: Optional[int] = None) -> Tuple[List[Any], Dict[str, Any]]:
+        """
+        Send write sub-requests through the core batch/v1 endpoint (WordPress 5.6+)
+        
+        Sub-requests are packed BATCH_LIMIT to a call and the calls are sent
+        concurrently. Each sub-request succeeds or fails on its own; only
+        routes registered with ``allow_batch`` (posts, pages, terms, ...)
+        can be batched.
+        
+        Args:
+            requests: Sub-requests built with batch_request
+            concurrency: Batch calls in flight (default BULK_CONCURRENCY, capped to the pool)
+        
+        Returns:
+            Tuple of (results, stats). ``results`` matches ``requests`` and
+            holds each response body, or an exception for sub-requests
+            answered with an error status or lost with their batch call.
+        """
+        url = self._build_url('/wp-json/batch/v1')
+        chunks = chunked(requests, BATCH_LIMIT)
+        
+        async def send(chunk):
+            payload = self._sanitize_data({"validation": "normal", "requests": chunk})
+            try:
+                response = await self._request_with_retry('POST', url, json=payload)
+            finally:
+                for sub in chunk:
+                    self._invalidate_cache(f"{self.site_url}/wp-json{sub['path']}",
+                                           deleted=sub["method"] == "DELETE")
+            return response.get("responses", []) if isinstance(response, dict) else []
+        
+        def resolve(sub, index, responses):
+            entry = responses[index] if index < len(responses) else None
+            if not isinstance(entry, dict):
+                return Exception("Missing response in batch")
+            if entry.get("status", 500) >= 400:
+                body = entry.get("body")
+                message = body.get("message") if isinstance(body, dict) else None
+                return Exception(message or f"API Error {entry.get('status')}")
+            return entry.get("body")
+        
+        start = time.perf_counter()
+        chunk_results, chunk_stats = await BulkExecutor.for_client(self, concurrency).map(chunks, send)
+        return unpack_chunks(chunks, chunk_results, chunk_stats, time.perf_counter() - start, resolve)
+    
+    async def upload_media(self, file_path: str, title: Optional[str] = None,
+                           alt_text: Optional[str] = None, mime_type: Optional[str] = None,
+                           chunk_size: Optional[int] = None) -> Dict:
+        """
+        Upload a local file to the media library
+        
+        The file is sent as the raw request body, the way the REST API
+        expects binary uploads, and is read in chunks while the request is
+        written so memory use does not grow with the file size. The
+        session's overall timeout does not apply: only connecting and
+        waiting for the server (WP_UPLOAD_TIMEOUT) are limited.
+        
+        Args:
+            file_path: Local file to upload
+            title: Optional attachment title
+            alt_text: Optional alternative text
+            mime_type: Content type (guessed from the file name when omitted)
+            chunk_size: Bytes read per chunk (default WP_UPLOAD_CHUNK_SIZE)
+        
+        Returns:
+            The created media object
+        """
+        stream = FileStream(file_path, chunk_size)
+        if mime_type is None:
+            mime_type = mimetypes.guess_type(stream.filename)[0] or 'application/octet-stream'
+        
+        params = {}
+        if title:
+            params['title'] = title
+        if alt_text:
+            params['alt_text'] = alt_text
+        
+        headers = {
+            "Content-Type": mime_type,
+            "Content-Disposition": content_disposition(stream.filename),
+            "Content-Length": str(stream.size)
+        }
+        
+        logger.debug(f"Uploading {stream.filename} ({stream.size} bytes)")
+        return await self._write('POST', "media", params=params, headers=headers, data=stream,
+                                 timeout=self.upload_timeout)
+    
+    def _invalidate_cache(self, url: str, deleted: bool = False) -> None:
+        """Forget cached reads of the collection a write is about to change"""
+        # Reads issued after the write must not join a GET that started before it,
+        # and a GET that started before it must not cache what it read
+        self._inflight.clear()
+        family = self._cache_family(url)
+        self._generations[family] = self._generations.get(family, 0) + 1
+        if self.cache is not None:
+            self.cache.invalidate(url)
+        if self.mirror is not None:
+            self.mirror.invalidate(url, deleted)
+    
+    @staticmethod
+    def _cache_family(url: str) -> str:
+        """Collection whose cached reads a write to ``url`` invalidates"""
+        return ResponseCache.family_for(ResponseCache.route_for(url))
     
     def _build_url(self, endpoint: str) -> str:
         """Build full URL from endpoint"""
@@ -257,7 +834,8 @@ class WordPressClient:
         
         try:
             if 'application/json' in content_type:
-                data = await response.json()
+                # Decode the raw bytes; the fast backends skip the text decode step
+                data = jsoncodec.loads(await response.read())
             else:
                 data = await response.text()
         except Exception as e:
@@ -266,16 +844,21 @@ class WordPressClient:
         
         if response.status >= 400:
             # SECURITY: Don't log full error details that might expose system info
+            code = data.get('code') if isinstance(data, dict) else None
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
             if response.status == 401:
-                raise Exception("Authentication failed. Please check your credentials.")
+                raise AuthenticationError("Authentication failed. Please check your credentials.", 401, code)
             elif response.status == 403:
-                raise Exception("Permission denied. Insufficient privileges.")
+                raise PermissionDeniedError("Permission denied. Insufficient privileges.", 403, code)
             elif response.status == 404:
-                raise Exception("Endpoint not found.")
+                raise NotFoundError("Endpoint not found.", 404, code)
             elif response.status == 429:
-                raise Exception("Rate limit exceeded. Please try again later.")
+                raise RateLimitError("Rate limit exceeded. Please try again later.",
+                                     retry_after=retry_after, code=code)
+            elif response.status >= 500:
+                raise ServerError(f"API Error {response.status}", response.status, code, retry_after)
             else:
-                raise Exception(f"API Error {response.status}")
+                raise WordPressAPIError(f"API Error {response.status}", response.status, code)
         
         return data
     
@@ -285,9 +868,9 @@ class WordPressClient:
         """Get posts with optional filters"""
         return await self.get("posts", params)
     
-    async def get_post(self, post_id: int) -> Dict:
+    async def get_post(self, post_id: int, **params) -> Dict:
         """Get single post"""
-        return await self.get(f"posts/{post_id}")
+        return await self.get(f"posts/{post_id}", params or None)
     
     async def create_post(self, data: Dict) -> Dict:
         """Create new post"""
@@ -304,33 +887,290 @@ class WordPressClient:
             endpoint += "?force=true"
         return await self.delete(endpoint)
     
+    async def get_pages(self, **params) -> List[Dict]:
+        """Get pages with optional filters"""
+        return await self.get("pages", params)
+    
+    async def get_media(self, **params) -> List[Dict]:
+        """Get media items with optional filters"""
+        return await self.get("media", params)
+    
+    async def get_products(self, **params) -> List[Dict]:
+        """Get WooCommerce products with optional filters"""
+        return await self.get("wc/products", params)
+    
+    async def get_orders(self, **params) -> List[Dict]:
+        """Get WooCommerce orders with optional filters"""
+        return await self.get("wc/orders", params)
+    
+    async def get_customers(self, **params) -> List[Dict]:
+        """Get WooCommerce customers with optional filters"""
+        return await self.get("wc/customers", params)
+    
     # Additional methods remain the same...
 
 
+def content_disposition(filename: str) -> str:
+    """Build an attachment Content-Disposition header for ``filename``"""
+    fallback = filename.encode('ascii', 'replace').decode('ascii').replace('"', '')
+    if fallback == filename:
+        return f'attachment; filename="{filename}"'
+    return f'attachment; filename="{fallback}"; filename*=UTF-8\'\'{quote(filename)}'
+
+
+class FileStream:
+    """Async iterable over the chunks of a local file
+    
+    Every iteration reopens the file, so a retried request re-sends the
+    whole body. Reads run in a worker thread to keep the event loop free.
+    """
+    
+    __slots__ = ('path', 'filename', 'size', 'chunk_size')
+    
+    def __init__(self, path: str, chunk_size: Optional[int] = None):
+        if not os.path.isfile(path):
+            raise FileNotFoundError(f"File not found: {path}")
+        self.path = path
+        self.filename = os.path.basename(path)
+        self.size = os.path.getsize(path)
+        self.chunk_size = chunk_size or int(os.getenv('WP_UPLOAD_CHUNK_SIZE', str(256 * 1024)))
+    
+    async def __aiter__(self):
+        handle = await asyncio.to_thread(open, self.path, 'rb')
+        try:
+            while True:
+                chunk = await asyncio.to_thread(handle.read, self.chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            handle.close()
+
+
+class WordPressAPIError(Exception):
+    """WordPress answered with an error status
+    
+    ``status`` is the HTTP status, ``code`` the REST error code from the
+    body (e.g. 'rest_post_invalid_id') when there was one.
+    """
+    
+    def __init__(self, message: str, status: int, code: Optional[str] = None,
+                 retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status = status
+        self.code = code
+        self.retry_after = retry_after
+
+
+class AuthenticationError(WordPressAPIError):
+    """401: the username or application password was rejected"""
+
+
+class PermissionDeniedError(WordPressAPIError):
+    """403: the user may not perform the request"""
+
+
+class NotFoundError(WordPressAPIError):
+    """404: no such route or item"""
+
+
+class ServerError(WordPressAPIError):
+    """5xx: WordPress or something in front of it failed"""
+
+
+class ResponseTooLargeError(WordPressAPIError):
+    """A streamed response body exceeded WP_MAX_RESPONSE_BYTES"""
+    
+    def __init__(self, limit: int, status: int):
+        super().__init__(f"Response larger than {limit} bytes; request fewer items per page", status)
+        self.limit = limit
+
+
+class RateLimitError(WordPressAPIError):
+    """Raised when WordPress answers 429 Too Many Requests"""
+    
+    def __init__(self, message: str, retry_after: Optional[float] = None, code: Optional[str] = None):
+        super().__init__(message, 429, code, retry_after)
+
+
+# Methods that can be sent again without repeating a side effect
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'})
+
+# Statuses worth retrying: timeouts, throttling and transient server failures
+RETRYABLE_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+
+
+def is_retryable(method: str, error: BaseException) -> bool:
+    """
+    Whether a failed attempt may be sent again
+    
+    Requests that never reached WordPress (connection refused, DNS) and
+    429s, which are rejected before any work is done, can always be
+    retried. Anything else is retried only for idempotent methods, and
+    then only for timeouts, dropped connections and RETRYABLE_STATUSES;
+    a POST that timed out may already have created the item.
+    """
+    if isinstance(error, (aiohttp.ClientConnectorError, RateLimitError)):
+        return True
+    if method.upper() not in IDEMPOTENT_METHODS:
+        return False
+    if isinstance(error, WordPressAPIError):
+        return error.status in RETRYABLE_STATUSES
+    return isinstance(error, (asyncio.TimeoutError, aiohttp.ClientConnectionError,
+                              aiohttp.ClientPayloadError))
+
+
+def describe_error(error: BaseException) -> str:
+    """Short description for retry logs"""
+    if isinstance(error, WordPressAPIError):
+        return f"HTTP {error.status}"
+    if isinstance(error, asyncio.TimeoutError):
+        return "timeout"
+    return error.__class__.__name__
+
+
+class RetryBudget:
+    """Caps retries to a share of recent requests
+    
+    Over a sliding ``window`` of seconds, retries may not exceed ``ratio``
+    times the number of requests plus ``minimum``. When WordPress is
+    failing every call, this keeps retry traffic at a fraction of normal
+    traffic instead of multiplying it by the attempt count.
+    """
+    
+    _shared: Optional["RetryBudget"] = None
+    
+    def __init__(self, ratio: Optional[float] = None, minimum: Optional[int] = None, window: float = 10.0):
+        """
+        Initialize retry budget
+        
+        Args:
+            ratio: Retries allowed per request (default WP_RETRY_BUDGET or 0.2)
+            minimum: Retries always allowed per window (default WP_RETRY_BUDGET_MIN or 10)
+            window: Seconds of history considered
+        """
+        self.ratio = ratio if ratio is not None else float(os.getenv('WP_RETRY_BUDGET', '0.2'))
+        self.minimum = minimum if minimum is not None else int(os.getenv('WP_RETRY_BUDGET_MIN', '10'))
+        self.window = window
+        self._requests: deque = deque()
+        self._retries: deque = deque()
+    
+    @classmethod
+    def shared(cls) -> "RetryBudget":
+        """Budget shared by every client in the process"""
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+    
+    def _now(self) -> float:
+        return time.monotonic()
+    
+    def _prune(self, now: float) -> None:
+        horizon = now - self.window
+        for events in (self._requests, self._retries):
+            while events and events[0] < horizon:
+                events.popleft()
+    
+    def record_request(self) -> None:
+        """Count a first attempt"""
+        now = self._now()
+        self._prune(now)
+        self._requests.append(now)
+    
+    def try_spend(self) -> bool:
+        """Take one retry if the budget allows it"""
+        now = self._now()
+        self._prune(now)
+        if len(self._retries) >= self.minimum + self.ratio * len(self._requests):
+            return False
+        self._retries.append(now)
+        return True
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delay in seconds or an HTTP date)"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
 class RateLimiter:
-    """Simple rate limiter using sliding window"""
+    """Token bucket rate limiter
+    
+    Tokens refill continuously at ``max_requests / time_window`` per second
+    up to ``burst``. Callers either take a token without blocking
+    (``acquire``) or sleep until the next token is due (``wait``). Waiters
+    are served in arrival order.
+    """
     
-    def __init__(self, max_requests: int, time_window: int):
+    # Longest server-requested pause honoured before retrying (seconds)
+    MAX_PAUSE = 60.0
+    
+    def __init__(self, max_requests: int, time_window: int, burst: Optional[int] = None):
         self.max_requests = max_requests
         self.time_window = time_window  # in seconds
-        self.requests = []
+        self.rate = max_requests / time_window  # tokens per second
+        self.burst = max(1, burst if burst is not None else max_requests)
+        
+        self.tokens = float(self.burst)
+        self._updated = None
+        self._paused_until = 0.0
         self.lock = asyncio.Lock()
     
+    def _now(self) -> float:
+        return asyncio.get_event_loop().time()
+    
+    def _refill(self, now: float) -> None:
+        if self._updated is not None:
+            self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+    
+    def _delay(self, now: float) -> float:
+        """Seconds until a token can be taken"""
+        if now < self._paused_until:
+            return self._paused_until - now
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+    
     async def acquire(self) -> bool:
-        """Check if request can proceed"""
-        async with self.lock:
-            now = asyncio.get_event_loop().time()
-            
-            # Remove old requests outside the window
-            self.requests = [req_time for req_time in self.requests 
-                           if now - req_time < self.time_window]
-            
-            if len(self.requests) < self.max_requests:
-                self.requests.append(now)
-                return True
-            
+        """Take a token if one is available right now"""
+        now = self._now()
+        self._refill(now)
+        if self.lock.locked() or self._delay(now) > 0:
             return False
+        self.tokens -= 1
+        return True
+    
+    async def wait(self) -> None:
+        """Wait until a token is available, then take it"""
+        async with self.lock:
+            while True:
+                now = self._now()
+                self._refill(now)
+                delay = self._delay(now)
+                if delay <= 0:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep(delay)
+    
+    def pause(self, seconds: float) -> None:
+        """Stop handing out tokens for ``seconds`` (e.g. from Retry-After)"""
+        self._paused_until = max(self._paused_until, self._now() + seconds)
     
     def reset(self):
         """Reset the rate limiter"""
-        self.requests = []
+        self.tokens = float(self.burst)
+        self._updated = None
+        self._paused_until = 0.0
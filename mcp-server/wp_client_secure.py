@@ -14,7 +14,6 @@ import asyncio
 from typing import Dict, List, Optional, Any, Tuple
 from urllib.parse import urljoin
 from contextlib import asynccontextmanager
-from cryptography.fernet import Fernet
 
 # Import our security modules
 from .secure_auth import SecureAuthManager
@@ -0,0 +1,171 @@
+"""
+Unit tests for breaker.py - per-namespace circuit breakers
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+
+import aiohttp
+import pytest
+
+from breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitBreakers, CircuitOpenError
+from monitoring import HealthChecker
+from wp_client import WordPressClient
+
+
+class ManualBreaker(CircuitBreaker):
+    """CircuitBreaker on a clock the test moves by hand"""
+    
+    __slots__ = ('now',)
+    
+    def _now(self):
+        return self.now
+
+
+def make_breaker(threshold=3, reset=30.0):
+    breaker = ManualBreaker("wp/v2", failure_threshold=threshold, reset_timeout=reset)
+    breaker.now = 100.0
+    return breaker
+
+
+def fail(breaker, times=1, status="error"):
+    for _ in range(times):
+        breaker.before_request()
+        breaker.record(status)
+
+
+class TestCircuitBreaker:
+    """Test the closed / open / half-open state machine"""
+    
+    def test_opens_after_consecutive_failures(self):
+        """Test that only an unbroken run of failures opens the circuit"""
+        breaker = make_breaker()
+        
+        fail(breaker, 2)
+        breaker.before_request()
+        breaker.record("200")
+        fail(breaker, 2, status="503")
+        assert breaker.state == CLOSED
+        
+        fail(breaker)
+        assert breaker.state == OPEN
+        with pytest.raises(CircuitOpenError) as error:
+            breaker.before_request()
+        assert error.value.retry_in == 30.0
+    
+    def test_client_errors_do_not_count(self):
+        """Test that 4xx and 429 answers show the host is up"""
+        breaker = make_breaker(threshold=1)
+        
+        for status in ("400", "404", "429"):
+            fail(breaker, status=status)
+        
+        assert breaker.state == CLOSED
+    
+    def test_half_open_admits_one_probe(self):
+        """Test that after the cool-down a single probe decides the state"""
+        breaker = make_breaker(threshold=1)
+        fail(breaker)
+        
+        breaker.now += 30
+        breaker.before_request()
+        assert breaker.state == HALF_OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.before_request()
+        
+        breaker.record("200")
+        assert breaker.state == CLOSED
+        breaker.before_request()
+    
+    def test_failed_probe_reopens(self):
+        """Test that a failing probe starts a new cool-down"""
+        breaker = make_breaker(threshold=1)
+        fail(breaker)
+        breaker.now += 30
+        
+        fail(breaker)
+        
+        assert breaker.state == OPEN
+        assert breaker.retry_in() == 30.0
+        assert breaker.trips == 2
+    
+    def test_abandoned_probe_frees_slot(self):
+        """Test that a cancelled probe lets the next request probe instead"""
+        breaker = make_breaker(threshold=1)
+        fail(breaker)
+        breaker.now += 30
+        
+        breaker.before_request()
+        breaker.record(None)
+        
+        assert breaker.state == HALF_OPEN
+        breaker.before_request()
+
+
+class TestCircuitBreakers:
+    """Test per-namespace breakers and their health export"""
+    
+    def test_one_breaker_per_namespace(self):
+        """Test that routes are grouped by REST namespace"""
+        breakers = CircuitBreakers(failure_threshold=1, reset_timeout=30, enabled=True)
+        
+        posts = breakers.for_url("https://example.com/wp-json/wp/v2/posts/5")
+        
+        assert breakers.for_url("https://example.com/wp-json/wp/v2/pages") is posts
+        assert breakers.for_url("https://example.com/wp-json/wc/v3/products").family == "wc/v3"
+        assert CircuitBreakers(enabled=False).for_url("https://example.com/wp-json/wp/v2/posts") is None
+    
+    def test_health_components(self):
+        """Test that an open circuit makes the health check fail"""
+        breakers = CircuitBreakers(failure_threshold=1, reset_timeout=30, enabled=True)
+        checker = HealthChecker()
+        checker.set_healthy(True)
+        checker.track_breakers(breakers)
+        fail(breakers.for_url("https://example.com/wp-json/wp/v2/posts"), status="502")
+        breakers.for_url("https://example.com/wp-json/wc/v3/products")
+        
+        status = checker.get_status()
+        
+        assert status["status"] == "unhealthy"
+        assert status["components"]["circuit:wp/v2"] is False
+        assert status["components"]["circuit:wc/v3"] is True
+        assert status["circuits"]["wp/v2"]["state"] == OPEN
+
+
+class TestClientFailFast:
+    """Test that WordPressClient stops calling a failing namespace"""
+    
+    def test_open_circuit_skips_network_and_backoff(self, monkeypatch):
+        """Test that requests fail immediately once the breaker has opened"""
+        monkeypatch.setenv("WP_BREAKER_THRESHOLD", "2")
+        client = WordPressClient("https://example.com", "user", "pass")
+        attempts = []
+        
+        @asynccontextmanager
+        async def unreachable():
+            attempts.append(1)
+            raise aiohttp.ClientConnectionError("Connection refused")
+            yield
+        
+        client.get_session = unreachable
+        
+        async def sleep(seconds):
+            pass
+        monkeypatch.setattr(asyncio, "sleep", sleep)
+        
+        async def run():
+            with pytest.raises(aiohttp.ClientConnectionError):
+                await client._request_with_retry("GET", "https://example.com/wp-json/wp/v2/posts")
+            with pytest.raises(CircuitOpenError):
+                await client._request_with_retry("GET", "https://example.com/wp-json/wp/v2/pages")
+            await client._request_with_retry("GET", "https://example.com/wp-json/wc/v3/products",
+                                             max_retries=1)
+        
+        with pytest.raises(aiohttp.ClientConnectionError):
+            asyncio.run(run())
+        
+        # Two attempts open wp/v2 and end the retry loop; wc/v3 is still tried
+        assert len(attempts) == 3
+
+
+# Run tests with: pytest tests/unit/test_breaker.py -v
@@ -0,0 +1,185 @@
+"""
+Unit tests for bulk.py - BulkExecutor ordering and concurrency
+"""
+
+import asyncio
+from unittest.mock import Mock
+
+from bulk import BulkExecutor, chunked, fetch_by_ids, summarize, unpack_chunks
+
+
+class TestBulkExecutor:
+    """Test BulkExecutor scheduling behaviour"""
+    
+    def test_results_preserve_input_order(self):
+        """Test that results line up with inputs even when workers finish out of order"""
+        executor = BulkExecutor(concurrency=4)
+        
+        async def worker(item):
+            await asyncio.sleep(0.001 * (10 - item))
+            return item * 2
+        
+        results, stats = asyncio.run(executor.map(range(10), worker))
+        
+        assert results == [i * 2 for i in range(10)]
+        assert stats['processed'] == 10
+        assert stats['succeeded'] == 10
+        assert stats['failed'] == 0
+    
+    def test_concurrency_is_bounded(self):
+        """Test that no more than `concurrency` workers run at once"""
+        executor = BulkExecutor(concurrency=3)
+        in_flight = 0
+        peak = 0
+        
+        async def worker(item):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.001)
+            in_flight -= 1
+        
+        asyncio.run(executor.map(range(20), worker))
+        
+        assert peak == 3
+    
+    def test_exceptions_are_returned_in_place(self):
+        """Test that a failing item does not stop the rest"""
+        executor = BulkExecutor(concurrency=2)
+        
+        async def worker(item):
+            if item == 1:
+                raise ValueError("boom")
+            return item
+        
+        results, stats = asyncio.run(executor.map([0, 1, 2], worker))
+        
+        assert results[0] == 0
+        assert isinstance(results[1], ValueError)
+        assert results[2] == 2
+        assert stats['failed'] == 1
+    
+    def test_empty_input(self):
+        """Test that an empty item list returns immediately"""
+        executor = BulkExecutor()
+        
+        async def worker(item):
+            return item
+        
+        results, stats = asyncio.run(executor.map([], worker))
+        
+        assert results == []
+        assert stats['processed'] == 0
+        assert stats['items_per_second'] == 0.0
+    
+    def test_for_client_caps_to_pool_size(self):
+        """Test that workers never outnumber the client's per-host connections"""
+        client = Mock(pool_limit_per_host=4)
+        
+        assert BulkExecutor.for_client(client, concurrency=10).concurrency == 4
+        assert BulkExecutor.for_client(client, concurrency=2).concurrency == 2
+
+
+
+class TestBulkHelpers:
+    """Test chunking and summary helpers used by batch tools"""
+    
+    def test_chunked_splits_evenly(self):
+        """Test chunking into fixed-size groups"""
+        assert chunked(list(range(6)), 3) == [[0, 1, 2], [3, 4, 5]]
+    
+    def test_chunked_remainder(self):
+        """Test that the last chunk holds the remainder"""
+        chunks = chunked(list(range(250)), 100)
+        
+        assert [len(c) for c in chunks] == [100, 100, 50]
+        assert chunks[2][0] == 200
+    
+    def test_chunked_empty(self):
+        """Test chunking an empty list"""
+        assert chunked([], 100) == []
+    
+    def test_summarize_counts_failures(self):
+        """Test that exceptions are counted as failures"""
+        stats = summarize([1, ValueError("x"), 3, RuntimeError("y")], 2.0)
+        
+        assert stats['processed'] == 4
+        assert stats['succeeded'] == 2
+        assert stats['failed'] == 2
+        assert stats['items_per_second'] == 2.0
+    
+    def test_unpack_chunks_maps_items(self):
+        """Test that chunk answers are resolved per item and failed chunks fail every item"""
+        chunks = [[1, 2], [3, 4], [5]]
+        outcomes = [["a"], RuntimeError("down"), ["e"]]
+        
+        def resolve(item, index, answer):
+            return answer[index] if index < len(answer) else KeyError(item)
+        
+        results, stats = unpack_chunks(chunks, outcomes, {"concurrency": 2}, 1.0, resolve)
+        
+        assert results[0] == "a" and results[4] == "e"
+        assert isinstance(results[1], KeyError)
+        assert results[2] is results[3] is outcomes[1]
+        assert (stats['processed'], stats['failed'], stats['requests'], stats['concurrency']) == (5, 3, 3, 2)
+
+
+
+class FakeCollection:
+    """Answers include= list requests from a dict of items"""
+    
+    def __init__(self, ids, fail_containing=None):
+        self.items = {i: {"id": i, "title": f"Item {i}"} for i in ids}
+        self.fail_containing = fail_containing
+        self.requests = []
+    
+    async def get(self, endpoint, params):
+        self.requests.append((endpoint, params))
+        wanted = [int(i) for i in params["include"].split(",")]
+        if self.fail_containing in wanted:
+            raise RuntimeError("Server error")
+        await asyncio.sleep(0)
+        return [self.items[i] for i in reversed(wanted) if i in self.items]
+
+
+class TestFetchByIds:
+    """Test include= batch reads used by the *_by_ids tools"""
+    
+    def test_chunks_and_keys_by_id(self):
+        """Test that IDs are de-duplicated, chunked by 100 and returned in request order"""
+        site = FakeCollection(range(1, 251))
+        ids = list(range(250, 0, -1)) + [5, 5]
+        
+        items, report = asyncio.run(fetch_by_ids(site, "posts", ids, {"status": "any"},
+                                                 executor=BulkExecutor(concurrency=3)))
+        
+        assert list(items) == list(range(250, 0, -1))
+        assert [len(p["include"].split(",")) for _, p in site.requests] == [100, 100, 50]
+        assert all(p["per_page"] == len(p["include"].split(",")) for _, p in site.requests)
+        assert report["requests"] == 3
+        assert report["concurrency"] == 3
+        assert report["found"] == report["requested"] == 250
+        assert report["missing"] == []
+    
+    def test_missing_and_failed_ids_reported(self):
+        """Test that absent IDs and failed chunks are reported separately"""
+        site = FakeCollection([1, 2, 150, 200], fail_containing=200)
+        
+        items, report = asyncio.run(fetch_by_ids(site, "posts", [1, 2, 3] + list(range(101, 201)),
+                                                 executor=BulkExecutor(concurrency=2)))
+        
+        assert list(items) == [1, 2, 150]
+        assert report["missing"] == [3] + [i for i in range(101, 198) if i != 150]
+        assert report["failed"][0]["error"] == "Server error"
+        assert report["failed"][0]["ids"] == list(range(198, 201))
+    
+    def test_fields_always_include_id(self):
+        """Test that a _fields projection still returns the ID used as key"""
+        site = FakeCollection([1])
+        
+        asyncio.run(fetch_by_ids(site, "media", [1], {"_fields": "title"}, executor=BulkExecutor(1)))
+        
+        assert site.requests[0][1]["_fields"] == "title,id"
+
+
+# Run tests with: pytest tests/unit/test_bulk.py -v
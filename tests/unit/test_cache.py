@@ -0,0 +1,137 @@
+"""
+Unit tests for cache.py - ResponseCache keys, TTLs, eviction and invalidation
+"""
+
+from unittest.mock import Mock, patch
+
+from cache import ResponseCache
+
+
+BASE = "https://example.com/wp-json"
+
+
+class TestCacheKeys:
+    """Test URL normalization and route matching"""
+    
+    def test_make_key_sorts_params(self):
+        """Test that parameter order does not change the key"""
+        key1 = ResponseCache.make_key(f"{BASE}/wp/v2/posts", {"page": 1, "per_page": 10})
+        key2 = ResponseCache.make_key(f"{BASE}/wp/v2/posts", {"per_page": 10, "page": 1})
+        
+        assert key1 == key2
+    
+    def test_make_key_merges_query_string(self):
+        """Test that query strings and params are treated alike"""
+        key1 = ResponseCache.make_key(f"{BASE}/wp/v2/posts?page=2")
+        key2 = ResponseCache.make_key(f"{BASE}/wp/v2/posts", {"page": 2})
+        
+        assert key1 == key2
+    
+    def test_make_key_ignores_none_params(self):
+        """Test that unset parameters are dropped"""
+        key1 = ResponseCache.make_key(f"{BASE}/wp/v2/posts", {"search": None})
+        key2 = ResponseCache.make_key(f"{BASE}/wp/v2/posts")
+        
+        assert key1 == key2
+    
+    def test_route_for(self):
+        """Test extracting the REST route from a URL"""
+        assert ResponseCache.route_for(f"{BASE}/wp/v2/posts/5") == "wp/v2/posts/5"
+        assert ResponseCache.route_for(f"{BASE}/mcp/v1/system/info") == "mcp/v1/system/info"
+    
+    def test_family_for(self):
+        """Test collection family of a route"""
+        assert ResponseCache.family_for("wp/v2/posts/5") == "wp/v2/posts"
+        assert ResponseCache.family_for("wc/v3/products/batch") == "wc/v3/products"
+    
+    def test_ttl_for_known_and_unknown_routes(self):
+        """Test per-endpoint TTL lookup"""
+        cache = ResponseCache(ttls=[("wp/v2/posts", 30), ("wp/v2/themes", 300)])
+        
+        assert cache.ttl_for(f"{BASE}/wp/v2/posts") == 30
+        assert cache.ttl_for(f"{BASE}/wp/v2/posts/5") == 30
+        assert cache.ttl_for(f"{BASE}/wp/v2/themes") == 300
+        assert cache.ttl_for(f"{BASE}/wp/v2/postsx") == 0
+        assert cache.ttl_for(f"{BASE}/wp/v2/users/me") == 0
+
+
+class TestCacheStorage:
+    """Test lookups, expiry and byte-bounded eviction"""
+    
+    def setup_method(self):
+        self.metrics = Mock()
+        self.cache = ResponseCache(max_bytes=100, ttls=[("wp/v2", 30)], metrics=self.metrics)
+        self.url = f"{BASE}/wp/v2/posts/1"
+        self.key = ResponseCache.make_key(self.url)
+    
+    def test_miss_then_hit(self):
+        """Test that a stored entry is served while fresh"""
+        assert self.cache.lookup(self.key) == (None, False)
+        
+        self.cache.store(self.key, self.url, {"id": 1}, 10)
+        entry, fresh = self.cache.lookup(self.key)
+        
+        assert fresh is True
+        assert entry.data == {"id": 1}
+        assert self.cache.stats['hits'] == 1
+        assert self.cache.stats['misses'] == 1
+        self.metrics.increment.assert_any_call("cache_hits", 1)
+    
+    @patch('cache.time.monotonic')
+    def test_stale_entry_keeps_validators(self, mock_time):
+        """Test that expired entries are returned for revalidation"""
+        mock_time.return_value = 1000.0
+        self.cache.store(self.key, self.url, {"id": 1}, 10, {"ETag": '"abc"'})
+        
+        mock_time.return_value = 1031.0
+        entry, fresh = self.cache.lookup(self.key)
+        
+        assert fresh is False
+        assert entry.validators() == {"If-None-Match": '"abc"'}
+        
+        self.cache.revalidated(self.key, self.url)
+        assert self.cache.lookup(self.key)[1] is True
+    
+    def test_evicts_least_recently_used(self):
+        """Test that the byte budget evicts the oldest entries first"""
+        for i in range(5):
+            url = f"{BASE}/wp/v2/posts/{i}"
+            self.cache.store(ResponseCache.make_key(url), url, {"id": i}, 30)
+        
+        assert self.cache.total_bytes <= 100
+        assert len(self.cache) == 3
+        assert self.cache.stats['evictions'] == 2
+        assert self.cache.lookup(ResponseCache.make_key(f"{BASE}/wp/v2/posts/0"))[0] is None
+    
+    def test_oversized_entry_not_stored(self):
+        """Test that bodies larger than the budget are skipped"""
+        self.cache.store(self.key, self.url, {"id": 1}, 500)
+        
+        assert len(self.cache) == 0
+    
+    def test_uncacheable_route_not_stored(self):
+        """Test that routes without a TTL are skipped"""
+        url = f"{BASE}/wc/v3/orders"
+        self.cache.store(ResponseCache.make_key(url), url, [], 10)
+        
+        assert len(self.cache) == 0
+
+
+class TestCacheInvalidation:
+    """Test invalidation after writes"""
+    
+    def test_write_invalidates_collection(self):
+        """Test that a write drops the item and its collection listings"""
+        cache = ResponseCache(ttls=[("wp/v2", 30)])
+        urls = [f"{BASE}/wp/v2/posts", f"{BASE}/wp/v2/posts/5", f"{BASE}/wp/v2/pages/5"]
+        for url in urls:
+            cache.store(ResponseCache.make_key(url), url, {}, 10)
+        
+        removed = cache.invalidate(f"{BASE}/wp/v2/posts/5")
+        
+        assert removed == 2
+        assert len(cache) == 1
+        assert cache.lookup(ResponseCache.make_key(urls[2]))[1] is True
+
+
+# Run tests with: pytest tests/unit/test_cache.py -v
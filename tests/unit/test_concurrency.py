@@ -0,0 +1,152 @@
+"""
+Unit tests for concurrency.py - AIMD adaptive concurrency limit
+"""
+
+import asyncio
+
+import pytest
+
+from concurrency import AdaptiveLimiter
+from monitoring import MetricsCollector
+from wp_client import WordPressClient
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+async def complete(limiter, count, latency=0.1, status="200"):
+    """Run ``count`` requests through the limiter, keeping it full"""
+    for _ in range(count):
+        tokens = [await limiter.acquire() for _ in range(limiter.current)]
+        for token in tokens:
+            limiter.release(token, status, latency)
+
+
+class TestAdaptiveLimiter:
+    """Test additive increase, multiplicative decrease and slot handling"""
+    
+    def test_grows_while_latency_flat(self):
+        """Test that a saturated limit grows by one per flat window"""
+        limiter = AdaptiveLimiter(maximum=6, initial=2, minimum=1, window=4)
+        
+        run(complete(limiter, 10))
+        
+        assert limiter.current == 6
+        assert limiter.decreases == 0
+    
+    def test_idle_limit_does_not_grow(self):
+        """Test that the limit only grows when it was actually reached"""
+        limiter = AdaptiveLimiter(maximum=10, initial=3, minimum=1, window=4)
+        
+        async def one_at_a_time():
+            for _ in range(20):
+                limiter.release(await limiter.acquire(), "200", 0.1)
+        
+        run(one_at_a_time())
+        
+        assert limiter.current == 3
+    
+    def test_overload_cuts_once_per_epoch(self):
+        """Test that a burst of 429s sent before a cut only cuts once"""
+        limiter = AdaptiveLimiter(maximum=10, initial=10, minimum=2, window=4)
+        
+        async def burst():
+            tokens = [await limiter.acquire() for _ in range(10)]
+            for token in tokens:
+                limiter.release(token, "429", 0.1)
+            limiter.release(await limiter.acquire(), "503", 0.1)
+            limiter.release(await limiter.acquire(), "error", 0.1)
+        
+        run(burst())
+        
+        assert limiter.current == 3
+        assert limiter.decreases == 3
+        assert limiter.in_flight == 0
+    
+    def test_client_errors_keep_limit(self):
+        """Test that 4xx answers other than 429 are not overload"""
+        limiter = AdaptiveLimiter(maximum=10, initial=5, minimum=1, window=4)
+        
+        run(complete(limiter, 1, status="404"))
+        
+        assert limiter.decreases == 0
+    
+    def test_rising_p90_backs_off(self):
+        """Test that latency well above the baseline cuts the limit"""
+        limiter = AdaptiveLimiter(maximum=10, initial=8, minimum=1, window=4)
+        
+        async def slow_down():
+            await complete(limiter, 1, latency=0.1)
+            tokens = [await limiter.acquire() for _ in range(4)]
+            for token in tokens:
+                limiter.release(token, "200", 0.3)
+        
+        run(slow_down())
+        
+        assert limiter.current == 6
+        assert limiter.decreases == 1
+        assert limiter.baseline == pytest.approx(0.1, rel=0.2)
+    
+    def test_waiters_served_in_order(self):
+        """Test that queued requests get freed slots first come first served"""
+        limiter = AdaptiveLimiter(maximum=1, initial=1, minimum=1)
+        order = []
+        
+        async def request(name):
+            token = await limiter.acquire()
+            order.append(name)
+            await asyncio.sleep(0)
+            limiter.release(token, "200", 0.01)
+        
+        async def main():
+            await asyncio.gather(*(request(name) for name in "abc"))
+        
+        run(main())
+        
+        assert order == ["a", "b", "c"]
+        assert limiter.in_flight == 0
+    
+    def test_cancelled_waiter_frees_slot(self):
+        """Test that cancelling a queued request does not leak its slot"""
+        limiter = AdaptiveLimiter(maximum=1, initial=1, minimum=1)
+        
+        async def main():
+            token = await limiter.acquire()
+            waiter = asyncio.ensure_future(limiter.acquire())
+            await asyncio.sleep(0)
+            limiter.release(token, "200", 0.01)
+            waiter.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+            limiter.release(await limiter.acquire(), "200", 0.01)
+        
+        run(main())
+        
+        assert limiter.in_flight == 0
+
+
+class TestClientConcurrency:
+    """Test the limiter's wiring into WordPressClient"""
+    
+    def test_limit_bounded_by_pool_and_exported(self, monkeypatch):
+        """Test that the limit is capped per host and exported as a gauge"""
+        monkeypatch.setenv("WP_POOL_LIMIT_PER_HOST", "16")
+        metrics = MetricsCollector()
+        
+        client = WordPressClient("https://example.com", "user", "pass", metrics=metrics)
+        
+        assert client.concurrency.maximum == 16
+        assert client.concurrency.current == 8
+        prometheus = metrics.export_prometheus()
+        assert "wordpress_mcp_concurrency_limit 8" in prometheus
+        assert "wordpress_mcp_requests_in_flight 0" in prometheus
+    
+    def test_can_be_disabled(self, monkeypatch):
+        """Test that WP_ADAPTIVE_CONCURRENCY=false removes the limiter"""
+        monkeypatch.setenv("WP_ADAPTIVE_CONCURRENCY", "false")
+        
+        assert WordPressClient("https://example.com", "user", "pass").concurrency is None
+
+
+# Run tests with: pytest tests/unit/test_concurrency.py -v
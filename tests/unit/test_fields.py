@@ -0,0 +1,60 @@
+"""
+Unit tests for fields.py - _fields projection helpers and their use in tools
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+from fields import fields_param, project
+from tools.posts import PostTools, POST_LIST_FIELDS
+
+
+class TestFieldHelpers:
+    """Test building and applying field projections"""
+
+    def test_default_fields(self):
+        """Test that the tool's summary fields are used when none are requested"""
+        assert fields_param(("id", "title")) == {"_fields": "id,title"}
+
+    def test_requested_fields_replace_default(self):
+        """Test that caller fields override the summary fields"""
+        assert fields_param(("id", "title"), ["id", "meta.footnotes"]) == {"_fields": "id,meta.footnotes"}
+
+    def test_project_keeps_top_level_keys(self):
+        """Test that nested field names keep their top-level object"""
+        item = {"id": 1, "title": {"rendered": "Hi"}, "content": {"rendered": "Long"}, "meta": {"a": 1}}
+
+        assert project(item, ["id", "meta.a"]) == {"id": 1, "meta": {"a": 1}}
+
+
+class TestToolProjection:
+    """Test that tools push _fields down to the REST API"""
+
+    def _post(self):
+        return {
+            "id": 5, "title": {"rendered": "Post"}, "slug": "post", "status": "publish",
+            "date": "2024-01-01T00:00:00", "modified": "2024-01-02T00:00:00",
+            "link": "https://example.com/post", "excerpt": {"rendered": "Short"}
+        }
+
+    def test_get_posts_requests_summary_fields(self):
+        """Test that wp_get_posts asks only for the fields its summary reads"""
+        wp = Mock()
+        wp.get_posts = AsyncMock(return_value=[self._post()])
+        tools = PostTools(wp)
+
+        result = asyncio.run(tools.get_posts())
+
+        assert wp.get_posts.call_args.kwargs["_fields"] == ",".join(POST_LIST_FIELDS)
+        assert result[0]["title"] == "Post"
+
+    def test_get_posts_with_caller_fields(self):
+        """Test that explicit fields are sent and returned as raw objects"""
+        wp = Mock()
+        wp.get_posts = AsyncMock(return_value=[{"id": 5, "slug": "post"}])
+        tools = PostTools(wp)
+
+        result = asyncio.run(tools.get_posts(fields=["id", "slug"]))
+
+        assert wp.get_posts.call_args.kwargs["_fields"] == "id,slug"
+        assert result == [{"id": 5, "slug": "post"}]
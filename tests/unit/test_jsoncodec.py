@@ -0,0 +1,100 @@
+"""
+Unit tests for jsoncodec.py - JSON backend selection, size estimation and streaming
+"""
+
+import json
+
+import pytest
+
+import jsoncodec
+from jsoncodec import ArrayStream, dumps, encoded_size, loads
+
+
+class TestJsonCodec:
+    """Test encoding and decoding through the selected backend"""
+    
+    def test_backend_is_known(self):
+        """Test that a backend was selected"""
+        assert jsoncodec.BACKEND in ('orjson', 'ujson', 'json')
+    
+    def test_round_trip(self):
+        """Test that bytes and text decode to the encoded value"""
+        value = {"id": 1, "title": "Café", "tags": [1, 2], "meta": None, "sticky": False}
+        
+        assert loads(dumps(value)) == value
+        assert loads(dumps(value).encode()) == value
+    
+    def test_compact_and_pretty(self):
+        """Test compact output has no whitespace and pretty output is indented"""
+        assert dumps({"a": [1, 2]}) == '{"a":[1,2]}'
+        assert dumps({"a": 1}, pretty=True) == '{\n  "a": 1\n}'
+    
+    def test_wide_integers_fall_back(self):
+        """Test values the fast backend rejects still encode"""
+        assert loads(dumps({"n": 2 ** 70})) == {"n": 2 ** 70}
+    
+    def test_integer_keys_stay_on_fast_path(self, monkeypatch):
+        """Test dicts keyed by ID encode like the standard library without falling back to it"""
+        value = {12: {"id": 12, "title": "Café"}, 7: None}
+        expected = json.dumps(value, separators=(',', ':'), ensure_ascii=False)
+        if jsoncodec.BACKEND != 'json':
+            monkeypatch.setattr(jsoncodec.json, "dumps", None)
+        
+        assert dumps(value) == expected
+        assert loads(dumps(value, pretty=True)) == {"12": value[12], "7": None}
+        assert encoded_size(value) == len(expected.encode())
+
+
+class TestEncodedSize:
+    """Test request size measurement"""
+    
+    def test_matches_utf8_encoding(self):
+        """Test the size equals the compact UTF-8 encoding, escapes and non-ASCII included"""
+        value = {
+            "title": 'Say "hi"\n\tCafé ☕',
+            "path": "C:\\temp\x01",
+            "items": [1, 2.5, None, True, False, [], {}],
+            "nested": {"a": {"b": "c"}}
+        }
+        expected = len(json.dumps(value, separators=(',', ':'), ensure_ascii=False).encode())
+        
+        assert encoded_size(value) == expected
+    
+    def test_wide_integers(self):
+        """Test values the fast backend rejects are still measured"""
+        assert encoded_size({"n": 2 ** 70}) == len('{"n":%d}' % 2 ** 70)
+
+
+class TestArrayStream:
+    """Test incremental parsing of JSON arrays"""
+    
+    def _parse(self, body, chunk_size):
+        stream = ArrayStream()
+        items = []
+        for start in range(0, len(body), chunk_size):
+            items.extend(stream.feed(body[start:start + chunk_size]))
+        return items + stream.close()
+    
+    def test_items_across_chunk_boundaries(self):
+        """Test that any chunking yields the same elements, split UTF-8 included"""
+        value = [{"id": i, "title": 'Café "{[,]}" \\', "meta": {"a": [1, None]}} for i in range(20)]
+        value += [12345, "text", None, []]
+        body = json.dumps(value, ensure_ascii=False).encode()
+        
+        for chunk_size in (1, 7, 64, len(body)):
+            assert self._parse(body, chunk_size) == value
+    
+    def test_items_returned_as_completed(self):
+        """Test that finished elements come out before the array ends"""
+        stream = ArrayStream()
+        
+        assert stream.feed(b'[{"id": 1}, {"id"') == [{"id": 1}]
+        assert stream.feed(b': 2}, 3') == [{"id": 2}]
+        assert stream.feed(b'4]') == [34]
+        assert stream.close() == []
+    
+    def test_invalid_bodies(self):
+        """Test that non-arrays, truncated and malformed arrays fail"""
+        for body in (b'{"code": "error"}', b'[1, 2', b'[1 2]', b'[1,,2]', b''):
+            with pytest.raises(ValueError):
+                self._parse(body, 3)
@@ -0,0 +1,89 @@
+"""
+Unit tests for launcher.py - cached dependency check
+"""
+
+import subprocess
+
+import pytest
+
+import launcher
+
+
+@pytest.fixture
+def cache_file(tmp_path, monkeypatch):
+    """Point the launcher cache at a temporary file"""
+    path = tmp_path / ".launcher_cache.json"
+    monkeypatch.setattr(launcher, "CACHE_FILE", path)
+    return path
+
+
+@pytest.fixture
+def no_pip(monkeypatch):
+    """Fail the test if the launcher tries to run pip"""
+    def check_call(*args, **kwargs):
+        raise AssertionError("pip should not run")
+    monkeypatch.setattr(subprocess, "check_call", check_call)
+
+
+class TestLauncherDependencyCheck:
+    """Test the fingerprint cache around the dependency check"""
+
+    def test_fingerprint_reads_metadata(self):
+        """Test that the fingerprint records the interpreter and package versions"""
+        fingerprint = launcher.environment_fingerprint()
+
+        assert fingerprint["python"]
+        assert set(fingerprint["packages"]) == {name for _, name in launcher.REQUIRED}
+        assert fingerprint["packages"]["aiohttp"] is not None
+
+    def test_verified_environment_is_cached(self, cache_file, monkeypatch, no_pip):
+        """Test that a passing check is recorded and skips the probe next time"""
+        fingerprint = {"python": "py", "version": "3", "packages": {"mcp": "1.0"}}
+        monkeypatch.setattr(launcher, "environment_fingerprint", lambda: fingerprint)
+        monkeypatch.setattr(launcher, "find_missing", lambda fp: [])
+        launcher.install_dependencies()
+
+        assert launcher.load_cached_fingerprint() == fingerprint
+
+        def probe(fp):
+            raise AssertionError("probe should be skipped")
+        monkeypatch.setattr(launcher, "find_missing", probe)
+        launcher.install_dependencies()
+
+    def test_changed_environment_is_probed(self, cache_file, monkeypatch, no_pip):
+        """Test that a different package version triggers a fresh probe"""
+        launcher.save_fingerprint({"python": "py", "version": "3", "packages": {"mcp": "1.0"}})
+        current = {"python": "py", "version": "3", "packages": {"mcp": "1.1"}}
+        probed = []
+        monkeypatch.setattr(launcher, "environment_fingerprint", lambda: current)
+        monkeypatch.setattr(launcher, "find_missing", lambda fp: probed.append(fp) or [])
+
+        launcher.install_dependencies()
+
+        assert probed == [current]
+        assert launcher.load_cached_fingerprint() == current
+
+    def test_failed_install_not_cached(self, cache_file, monkeypatch):
+        """Test that an environment with missing packages is not recorded"""
+        monkeypatch.setattr(launcher, "environment_fingerprint",
+                            lambda: {"python": "py", "version": "3", "packages": {"mcp": None}})
+        monkeypatch.setattr(launcher, "find_missing", lambda fp: ["mcp"])
+
+        def check_call(*args, **kwargs):
+            raise subprocess.CalledProcessError(1, args[0])
+        monkeypatch.setattr(subprocess, "check_call", check_call)
+
+        launcher.install_dependencies()
+
+        assert not cache_file.exists()
+
+    def test_clear_fingerprint(self, cache_file):
+        """Test that clearing removes the cache and tolerates a missing file"""
+        launcher.save_fingerprint({"python": "py"})
+        launcher.clear_fingerprint()
+        launcher.clear_fingerprint()
+
+        assert launcher.load_cached_fingerprint() is None
+
+
+# Run tests with: pytest tests/unit/test_launcher.py -v
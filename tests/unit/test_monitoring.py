@@ -9,7 +9,7 @@ import time
 from datetime import datetime
 
 # Import modules to test
-from monitoring import MetricsCollector, HealthChecker, AlertManager
+from monitoring import MetricsCollector, HealthChecker, AlertManager, LatencyHistogram, normalize_endpoint
 
 
 class TestMetricsCollector:
@@ -73,6 +73,141 @@ class TestMetricsCollector:
         assert collector._format_uptime(61.9) == "1m 1s"
 
 
+class TestLatencyHistogram:
+    """Test LatencyHistogram streaming statistics"""
+    
+    def test_exact_count_sum_min_max(self):
+        """Test that aggregate values are exact"""
+        histogram = LatencyHistogram()
+        for value in [0.1, 0.2, 0.3, 0.4]:
+            histogram.record(value)
+        
+        assert histogram.count == 4
+        assert histogram.sum == pytest.approx(1.0)
+        assert histogram.mean == pytest.approx(0.25)
+        assert histogram.min == 0.1
+        assert histogram.max == 0.4
+    
+    def test_quantiles_within_relative_error(self):
+        """Test that quantiles stay within the bucket growth factor"""
+        histogram = LatencyHistogram(growth=1.05)
+        samples = [i / 1000 for i in range(1, 1001)]  # 1ms .. 1s
+        for value in samples:
+            histogram.record(value)
+        
+        for q, expected in [(0.5, 0.5), (0.9, 0.9), (0.99, 0.99)]:
+            assert abs(histogram.quantile(q) - expected) / expected <= 0.05
+    
+    def test_memory_is_constant(self):
+        """Test that recording does not grow the bucket array"""
+        histogram = LatencyHistogram()
+        buckets = len(histogram.buckets)
+        for i in range(10000):
+            histogram.record(i * 0.001)
+        
+        assert len(histogram.buckets) == buckets
+    
+    def test_out_of_range_values(self):
+        """Test values below and above the configured range"""
+        histogram = LatencyHistogram(min_value=0.001, max_value=1.0)
+        histogram.record(0.0)
+        histogram.record(50.0)
+        
+        assert histogram.buckets[0] == 1
+        assert histogram.buckets[-1] == 1
+        assert histogram.quantile(1.0) == 50.0
+    
+    def test_empty_histogram(self):
+        """Test summary of a histogram with no samples"""
+        summary = LatencyHistogram().summary()
+        
+        assert summary['count'] == 0
+        assert summary['avg'] == 0.0
+        assert summary['p99'] == 0.0
+    
+    def test_collector_summary_uses_histogram(self):
+        """Test that get_summary reports per-tool quantiles"""
+        collector = MetricsCollector()
+        for value in [0.1, 0.2, 0.3]:
+            collector.record_request('wp_get_posts', value, True)
+        
+        stats = collector.get_summary()['response_times']['wp_get_posts']
+        
+        assert stats['count'] == 3
+        assert stats['avg'] == pytest.approx(0.2)
+        assert stats['min'] == 0.1
+        assert stats['max'] == 0.3
+        assert 'p99' in stats
+
+
+class TestPrometheusExport:
+    """Test Prometheus exposition output"""
+    
+    def test_request_histogram_with_labels(self):
+        """Test labelled tool duration histogram lines"""
+        collector = MetricsCollector()
+        collector.record_request('wp_get_posts', 0.02, True, backend='posts')
+        collector.record_request('wp_get_posts', 3.0, False, backend='posts')
+        
+        output = collector.export_prometheus()
+        
+        assert "# TYPE wordpress_mcp_request_duration_seconds histogram" in output
+        assert ('wordpress_mcp_request_duration_seconds_bucket{tool="wp_get_posts",'
+                'status="success",backend="posts",le="0.025"} 1') in output
+        assert ('wordpress_mcp_request_duration_seconds_bucket{tool="wp_get_posts",'
+                'status="error",backend="posts",le="2.5"} 0') in output
+        assert ('wordpress_mcp_request_duration_seconds_count{tool="wp_get_posts",'
+                'status="error",backend="posts"} 1') in output
+    
+    def test_buckets_are_cumulative(self):
+        """Test that bucket counts never decrease and end at the total"""
+        histogram = LatencyHistogram()
+        for value in [0.001, 0.01, 0.1, 1.0, 100.0]:
+            histogram.record(value)
+        
+        counts = [count for _, count in histogram.cumulative_buckets()]
+        
+        assert counts == sorted(counts)
+        assert histogram.cumulative_buckets()[-1] == ("+Inf", 5)
+        assert dict(histogram.cumulative_buckets())["0.01"] == 2
+    
+    def test_upstream_endpoint_normalized(self):
+        """Test that resource IDs are folded out of endpoint labels"""
+        collector = MetricsCollector()
+        collector.record_upstream('GET', 'https://example.com/wp-json/wp/v2/posts/42?x=1', '200', 0.01)
+        collector.record_upstream('GET', 'https://example.com/wp-json/wp/v2/posts/43', '200', 0.01)
+        
+        output = collector.export_prometheus()
+        
+        assert ('wordpress_mcp_upstream_request_duration_seconds_count{method="GET",'
+                'endpoint="wp/v2/posts/:id",status="200"} 2') in output
+    
+    def test_normalize_endpoint(self):
+        """Test endpoint label normalization"""
+        assert normalize_endpoint('https://x/wp-json/wc/v3/products/12/variations/3') == 'wc/v3/products/:id/variations/:id'
+        assert normalize_endpoint('https://x/wp-json/mcp/v1/system/info') == 'mcp/v1/system/info'
+    
+    def test_gauges_and_cache_counters(self):
+        """Test registered gauges and cache event counters"""
+        collector = MetricsCollector()
+        collector.increment('cache_hits', 3)
+        collector.register_gauge('cache_bytes', 'Bytes cached', lambda: 512)
+        collector.register_gauge('pool_connections', 'Connections', lambda: [({'state': 'idle'}, 2)])
+        
+        output = collector.export_prometheus()
+        
+        assert 'wordpress_mcp_cache_events_total{event="hits"} 3' in output
+        assert 'wordpress_mcp_cache_bytes 512' in output
+        assert 'wordpress_mcp_pool_connections{state="idle"} 2' in output
+    
+    def test_failing_gauge_is_skipped(self):
+        """Test that a broken gauge callback does not break the export"""
+        collector = MetricsCollector()
+        collector.register_gauge('broken', 'Broken', lambda: 1 / 0)
+        
+        assert 'wordpress_mcp_broken' not in collector.export_prometheus()
+
+
 class TestHealthChecker:
     """Test HealthChecker pure functions"""
     
@@ -0,0 +1,149 @@
+"""
+Unit tests for tools/registry.py - ToolRegistry indexing and dispatch
+"""
+
+import asyncio
+import importlib
+import pytest
+from mcp.types import Tool
+
+from tools.registry import TOOL_MODULES, ToolRegistry
+
+
+class FakeModule:
+    """Minimal tool module exposing get_tools() and a handler map"""
+    
+    def __init__(self, *names):
+        self.calls = []
+        self.tools = {name: self._make_handler(name) for name in names}
+        self.get_tools_calls = 0
+    
+    def _make_handler(self, name):
+        async def handler(**kwargs):
+            self.calls.append((name, kwargs))
+            return {"tool": name, "args": kwargs}
+        return handler
+    
+    def get_tools(self):
+        self.get_tools_calls += 1
+        return [Tool(name=name, description=name, inputSchema={"type": "object", "properties": {}})
+                for name in self.tools]
+
+
+class TestToolRegistry:
+    """Test ToolRegistry behaviour"""
+    
+    def test_register_and_dispatch(self):
+        """Test that a registered tool runs its handler with the arguments"""
+        module = FakeModule("wp_a", "wp_b")
+        registry = ToolRegistry()
+        
+        assert registry.register_module("fake", module) == 2
+        result = asyncio.run(registry.get("wp_b")({"x": 1}))
+        
+        assert result == {"tool": "wp_b", "args": {"x": 1}}
+        assert "wp_a" in registry
+        assert len(registry) == 2
+    
+    def test_none_arguments(self):
+        """Test that missing arguments are treated as empty"""
+        registry = ToolRegistry()
+        registry.register_module("fake", FakeModule("wp_a"))
+        
+        assert asyncio.run(registry.get("wp_a")(None)) == {"tool": "wp_a", "args": {}}
+    
+    def test_unknown_tool(self):
+        """Test that unknown names return None"""
+        registry = ToolRegistry()
+        
+        assert registry.get("missing") is None
+    
+    def test_duplicate_names_rejected(self):
+        """Test that two modules cannot claim the same tool"""
+        registry = ToolRegistry()
+        registry.register_module("one", FakeModule("wp_a"))
+        
+        with pytest.raises(ValueError):
+            registry.register_module("two", FakeModule("wp_a"))
+    
+    def test_list_tools_built_once(self):
+        """Test that the tool listing is cached between calls"""
+        module = FakeModule("wp_a", "wp_b")
+        registry = ToolRegistry()
+        registry.register_module("fake", module)
+        
+        first = registry.list_tools()
+        second = registry.list_tools()
+        
+        assert first is second
+        assert [t.name for t in first] == ["wp_a", "wp_b"]
+        assert module.get_tools_calls == 1
+    
+    def test_listing_refreshed_after_new_module(self):
+        """Test that registering a module invalidates the cached listing"""
+        registry = ToolRegistry()
+        registry.register_module("one", FakeModule("wp_a"))
+        registry.list_tools()
+        registry.register_module("two", FakeModule("wc_b"))
+        
+        assert [t.name for t in registry.list_tools()] == ["wp_a", "wc_b"]
+
+    
+    def test_lazy_module_not_loaded_until_used(self):
+        """Test that a lazy loader runs only when a tool is needed"""
+        loads = []
+        registry = ToolRegistry()
+        registry.register_lazy("fake", lambda: loads.append("fake") or FakeModule("wp_a"))
+        
+        assert loads == []
+        assert registry.pending == ["fake"]
+        assert [t.name for t in registry.list_tools()] == ["wp_a"]
+        assert loads == ["fake"]
+        assert registry.pending == []
+        assert "fake" in registry.load_times
+    
+    def test_get_loads_until_found(self):
+        """Test that lookups load pending modules in order and stop at the match"""
+        loads = []
+        registry = ToolRegistry()
+        for name, tool in (("one", "wp_a"), ("two", "wp_b"), ("three", "wp_c")):
+            registry.register_lazy(name, lambda name=name, tool=tool: loads.append(name) or FakeModule(tool))
+        
+        assert registry.get("wp_b").module == "two"
+        assert loads == ["one", "two"]
+        assert registry.pending == ["three"]
+        assert registry.get("missing") is None
+        assert loads == ["one", "two", "three"]
+    
+    def test_get_loads_hinted_module_first(self):
+        """Test that a name hint skips modules registered before the owner"""
+        loads = []
+        registry = ToolRegistry()
+        for name, tool, hints in (("posts", "wp_get_posts", ("post",)), ("media", "wp_get_media", ("media",)),
+                                  ("shop", "wc_get_products", ("wc_",)), ("misc", "wp_misc", ())):
+            registry.register_lazy(name, lambda name=name, tool=tool: loads.append(name) or FakeModule(tool),
+                                   hints)
+        
+        assert registry.get("wc_get_products").module == "shop"
+        assert loads == ["shop"]
+        assert registry.get("wp_misc").module == "misc"
+        assert loads == ["shop", "posts", "media", "misc"]
+    
+    def test_duplicate_lazy_module_rejected(self):
+        """Test that a module name can only be registered once"""
+        registry = ToolRegistry()
+        registry.register_lazy("fake", lambda: FakeModule("wp_a"))
+        
+        with pytest.raises(ValueError):
+            registry.register_lazy("fake", lambda: FakeModule("wp_b"))
+    
+    @pytest.mark.parametrize("module_name", sorted(TOOL_MODULES))
+    def test_tool_names_match_module_hints(self, module_name):
+        """Test that every tool of a shipped module matches one of its name hints"""
+        class_name, hints = TOOL_MODULES[module_name]
+        module = getattr(importlib.import_module(f"tools.{module_name}"), class_name)(object())
+        
+        assert [tool.name for tool in module.get_tools() if not any(hint in tool.name for hint in hints)] == []
+
+
+# Run tests with: pytest tests/unit/test_registry.py -v
@@ -0,0 +1,137 @@
+"""
+Unit tests for sites.py - multi-site client pool and fan-out
+"""
+
+import asyncio
+
+import pytest
+from mcp.types import Tool
+
+from sites import ALL_SITES, DEFAULT_SITE, SitePool, load_sites, with_site_argument
+
+CREDENTIALS = {"username": "user", "app_password": "pass"}
+
+
+def site(url):
+    return {"site_url": url, **CREDENTIALS}
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+class TestLoadSites:
+    """Test reading single and multi-site configurations"""
+    
+    def test_single_site_config(self):
+        """Test that a plain config becomes the default site"""
+        sites = load_sites({**site("https://a.example"), "extra": 1})
+        
+        assert sites == {DEFAULT_SITE: site("https://a.example")}
+    
+    def test_multi_site_config_keeps_order(self):
+        """Test that named sites are returned in configuration order"""
+        sites = load_sites({"sites": {"b": site("https://b.example"), "a": site("https://a.example")}})
+        
+        assert list(sites) == ["b", "a"]
+    
+    def test_invalid_sites_rejected(self):
+        """Test that missing credentials and the reserved name fail"""
+        with pytest.raises(ValueError, match="app_password"):
+            load_sites({"sites": {"a": {"site_url": "https://a.example", "username": "user"}}})
+        with pytest.raises(ValueError, match="reserved"):
+            load_sites({"sites": {ALL_SITES: site("https://a.example")}})
+        with pytest.raises(ValueError):
+            load_sites({})
+
+
+class TestSitePool:
+    """Test site resolution, shared connections and fan-out"""
+    
+    def _pool(self, names=("shop", "blog", "docs"), **kwargs):
+        return SitePool({name: site(f"https://{name}.example") for name in names}, **kwargs)
+    
+    def test_resolve(self):
+        """Test that missing site names fall back to the default and unknown ones fail"""
+        pool = self._pool(default="blog")
+        
+        assert pool.resolve(None) == "blog"
+        assert pool.resolve("docs") == "docs"
+        with pytest.raises(ValueError, match="Unknown site"):
+            pool.resolve("nope")
+        with pytest.raises(ValueError):
+            self._pool(default="nope")
+    
+    def test_clients_share_one_connector(self):
+        """Test that every site's session draws from the same connection pool"""
+        async def sessions():
+            pool = self._pool()
+            try:
+                async with pool.client("shop").get_session() as shop, \
+                        pool.client("blog").get_session() as blog:
+                    return shop.connector, blog.connector, pool.client("shop")
+            finally:
+                await pool.close()
+        
+        shop, blog, client = run(sessions())
+        
+        assert shop is blog
+        assert shop.closed
+        assert client.site_url == "https://shop.example"
+    
+    def test_fan_out_captures_errors(self):
+        """Test that a failing site is reported without stopping the others"""
+        async def call(name):
+            if name == "blog":
+                raise RuntimeError("boom")
+            return name.upper()
+        
+        result = run(self._pool().fan_out(call))
+        
+        assert result["sites"]["shop"] == {"success": True, "result": "SHOP",
+                                           "elapsed_seconds": result["sites"]["shop"]["elapsed_seconds"]}
+        assert result["sites"]["blog"]["error"] == "boom"
+        assert result["summary"]["succeeded"] == 2
+        assert result["summary"]["failed"] == 1
+    
+    def test_fan_out_bounded_and_reports_progress(self):
+        """Test the concurrency limit and per-site completion callbacks"""
+        active = []
+        peak = []
+        progress = []
+        
+        async def call(name):
+            active.append(name)
+            peak.append(len(active))
+            await asyncio.sleep({"shop": 0.03, "blog": 0.01, "docs": 0.0}[name])
+            active.remove(name)
+            return name
+        
+        async def on_result(name, result, done, total):
+            progress.append((name, done, total))
+        
+        pool = self._pool(fanout_concurrency=2)
+        result = run(pool.fan_out(call, on_result=on_result))
+        
+        assert max(peak) == 2
+        assert [name for name, _, _ in progress] == list(result["sites"])
+        assert [(done, total) for _, done, total in progress] == [(1, 3), (2, 3), (3, 3)]
+        assert progress[-1][0] == "shop"
+
+
+class TestSiteArgument:
+    """Test the site argument added to tool schemas"""
+    
+    def test_with_site_argument(self):
+        """Test that tools gain a site enum without modifying the originals"""
+        tool = Tool(name="wp_get_posts", description="Get posts",
+                    inputSchema={"type": "object", "properties": {"per_page": {"type": "integer"}}})
+        
+        [copy] = with_site_argument([tool], ["shop", "blog"], "shop")
+        
+        assert copy.inputSchema["properties"]["site"]["enum"] == ["shop", "blog", ALL_SITES]
+        assert "per_page" in copy.inputSchema["properties"]
+        assert "site" not in tool.inputSchema["properties"]
+
+
+# Run tests with: pytest tests/unit/test_sites.py -v
@@ -0,0 +1,274 @@
+"""
+Unit tests for sync.py - local mirror store and incremental sync
+"""
+
+import asyncio
+from unittest.mock import Mock
+
+import pytest
+
+from sync import COLLECTIONS, MirrorStore, SyncEngine, coerce_filter, fts_query
+from wp_client import WordPressClient
+
+SITE = "https://example.com"
+
+
+def make_post(post_id, modified="2024-01-01T00:00:00", status="publish"):
+    return {
+        "id": post_id,
+        "date": f"2024-01-{post_id:02d}T00:00:00",
+        "modified": modified,
+        "status": status,
+        "slug": f"post-{post_id}",
+        "title": {"rendered": f"Post {post_id}"},
+        "_links": {"self": []}
+    }
+
+
+class FakeSite:
+    """Stands in for WordPressClient.iter_collection over an in-memory site"""
+    
+    def __init__(self, posts):
+        self.posts = {post["id"]: post for post in posts}
+        self.requests = []
+        self.mirror = None
+    
+    async def iter_collection(self, endpoint, params=None, mirror=True):
+        self.requests.append((endpoint, dict(params or {})))
+        after = (params or {}).get("modified_after")
+        for post in self.posts.values():
+            if after is None or post["modified"] > after:
+                if params.get("_fields") == "id":
+                    yield {"id": post["id"]}
+                else:
+                    yield post
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+class TestSyncEngine:
+    """Test incremental refresh and mirror lookups"""
+    
+    def _engine(self, site, **kwargs):
+        return SyncEngine(site, store=MirrorStore(), collections=["posts"],
+                          interval=60, max_staleness=300, **kwargs)
+    
+    def test_first_refresh_is_full_then_incremental(self):
+        """Test that the cursor limits later refreshes to modified items"""
+        site = FakeSite([make_post(1), make_post(2)])
+        engine = self._engine(site)
+        
+        assert run(engine.refresh(COLLECTIONS["posts"])) == 2
+        assert "modified_after" not in site.requests[0][1]
+        
+        site.posts[2] = make_post(2, modified="2024-02-01T00:00:00")
+        assert run(engine.refresh(COLLECTIONS["posts"])) == 2  # one-second overlap re-reads the cursor
+        assert site.requests[1][1]["modified_after"] == "2023-12-31T23:59:59"
+        
+        assert run(engine.refresh(COLLECTIONS["posts"])) == 1
+        assert site.requests[2][1]["modified_after"] == "2024-01-31T23:59:59"
+    
+    def test_lookup_lists_and_gets(self):
+        """Test that fresh mirrors answer lists and single items like the REST API"""
+        site = FakeSite([make_post(i) for i in range(1, 6)] + [make_post(6, status="draft")])
+        engine = self._engine(site)
+        run(engine.refresh(COLLECTIONS["posts"]))
+        
+        page = engine.lookup(f"{SITE}/wp-json/wp/v2/posts", {"per_page": 2, "page": 2})
+        assert [p["id"] for p in page] == [3, 2]
+        assert "_links" not in page[0]
+        
+        drafts = engine.lookup(f"{SITE}/wp-json/wp/v2/posts", {"status": "draft"})
+        assert [p["id"] for p in drafts] == [6]
+        
+        item = engine.lookup(f"{SITE}/wp-json/wp/v2/posts/4", {"_fields": "id,slug"})
+        assert item == {"id": 4, "slug": "post-4"}
+        assert engine.stats["hits"] == 3
+    
+    def test_lookup_misses_unsupported_queries(self):
+        """Test that unknown parameters and list values go to the site"""
+        engine = self._engine(FakeSite([make_post(1)]))
+        run(engine.refresh(COLLECTIONS["posts"]))
+        url = f"{SITE}/wp-json/wp/v2/posts"
+        
+        assert engine.lookup(url, {"search": "-post"}) is None
+        assert engine.lookup(url, {"orderby": "relevance"}) is None
+        assert engine.lookup(url, {"status": "publish,draft"}) is None
+        assert engine.lookup(url, {"orderby": "relevance"}) is None
+        assert engine.lookup(url, {"_fields": "title.rendered"}) is None
+        assert engine.lookup(f"{SITE}/wp-json/wp/v2/categories", {}) is None
+    
+    def test_lookup_coerces_text_filters(self):
+        """Test that numbers and booleans sent as text match like the REST API"""
+        posts = [{**make_post(i), "author": i % 2 + 1, "sticky": i == 1} for i in range(1, 5)]
+        engine = self._engine(FakeSite(posts))
+        run(engine.refresh(COLLECTIONS["posts"]))
+        url = f"{SITE}/wp-json/wp/v2/posts"
+        
+        for author in (1, "1"):
+            assert [p["id"] for p in engine.lookup(url, {"author": author})] == [4, 2]
+        for sticky in (False, "false", "0"):
+            assert [p["id"] for p in engine.lookup(url, {"sticky": sticky})] == [4, 3, 2]
+        assert [p["id"] for p in engine.lookup(url, {"sticky": "true"})] == [1]
+        assert engine.lookup(url, {"author": "me"}) is None
+        assert engine.lookup(url, {"sticky": "maybe"}) is None
+    
+    def test_coerce_filter(self):
+        """Test conversion to the stored field type"""
+        assert coerce_filter("author", " 12 ") == 12
+        assert coerce_filter("featured", 1) is True
+        assert coerce_filter("slug", 2024) == "2024"
+        for field, value in (("author", True), ("parent", "-1"), ("sticky", 2), ("slug", False)):
+            with pytest.raises(ValueError):
+                coerce_filter(field, value)
+    
+    def test_cold_and_stale_mirror_misses(self):
+        """Test that nothing is served before the first sync or after max_staleness"""
+        engine = self._engine(FakeSite([make_post(1)]))
+        url = f"{SITE}/wp-json/wp/v2/posts"
+        
+        assert engine.lookup(url, {}) is None
+        run(engine.refresh(COLLECTIONS["posts"]))
+        engine.max_staleness = -1
+        assert engine.lookup(url, {}) is None
+    
+    def test_write_marks_dirty_until_refresh(self):
+        """Test that a write sends reads to the site until the mirror catches up"""
+        site = FakeSite([make_post(1)])
+        engine = self._engine(site)
+        run(engine.refresh(COLLECTIONS["posts"]))
+        url = f"{SITE}/wp-json/wp/v2/posts"
+        
+        engine.invalidate(f"{url}/1")
+        assert engine.lookup(url, {}) is None
+        assert engine._wake.is_set()
+        
+        run(engine.refresh(COLLECTIONS["posts"]))
+        assert engine.lookup(url, {}) is not None
+    
+    def test_delete_removes_item(self):
+        """Test that deletes through the client drop the item immediately"""
+        site = FakeSite([make_post(1), make_post(2)])
+        engine = self._engine(site)
+        run(engine.refresh(COLLECTIONS["posts"]))
+        
+        engine.invalidate(f"{SITE}/wp-json/wp/v2/posts/2?force=true", deleted=True)
+        
+        assert engine.store.ids("posts") == {1}
+    
+    def test_reconcile_drops_items_deleted_upstream(self):
+        """Test that the periodic id scan removes items missing from the site"""
+        site = FakeSite([make_post(1), make_post(2)])
+        engine = self._engine(site, reconcile_every=2)
+        run(engine.refresh(COLLECTIONS["posts"]))
+        
+        del site.posts[2]
+        run(engine.refresh(COLLECTIONS["posts"]))
+        
+        assert engine.store.ids("posts") == {1}
+        assert site.requests[-1][1]["_fields"] == "id"
+    
+    def test_unknown_collection_rejected(self):
+        """Test that a typo in WP_SYNC_COLLECTIONS fails loudly"""
+        with pytest.raises(ValueError):
+            SyncEngine(FakeSite([]), store=MirrorStore(), collections=["post"])
+
+
+class TestSearchIndex:
+    """Test full-text search over mirrored posts"""
+    
+    def _engine(self, posts):
+        engine = SyncEngine(FakeSite(posts), store=MirrorStore(), collections=["posts"])
+        run(engine.refresh(COLLECTIONS["posts"]))
+        return engine
+    
+    def _post(self, post_id, title, content="", status="publish"):
+        post = make_post(post_id, status=status)
+        post["title"] = {"rendered": title}
+        post["excerpt"] = {"rendered": ""}
+        post["content"] = {"rendered": f"<p>{content}</p>"}
+        return post
+    
+    def _search(self, engine, text, **params):
+        results = engine.lookup(f"{SITE}/wp-json/wp/v2/posts", {"search": text, **params})
+        return None if results is None else [p["id"] for p in results]
+    
+    def test_fts_query(self):
+        """Test translation of search box syntax into quoted FTS5 terms"""
+        assert fts_query("red shoes") == '"red" "shoes"'
+        assert fts_query('"red shoes" size*') == '"red shoes" "size"*'
+        assert fts_query("shoes -red") == '"shoes" NOT "red"'
+        assert fts_query("OR AND") == '"OR" "AND"'
+        assert fts_query("-red") is None
+        assert fts_query("  !! ") is None
+    
+    def test_title_matches_rank_first(self):
+        """Test that bm25 weights title matches above body matches"""
+        engine = self._engine([
+            self._post(1, "Gardening notes", "All about tomatoes and tomato soup"),
+            self._post(2, "Tomato harvest", "Notes from the field"),
+            self._post(3, "Unrelated", "Nothing to see")
+        ])
+        
+        assert self._search(engine, "tomato") == [2, 1]
+        assert self._search(engine, "notes") == [1, 2]
+    
+    def test_phrase_prefix_and_html(self):
+        """Test phrase and prefix queries against text stripped of HTML and entities"""
+        engine = self._engine([
+            self._post(1, "Caf&eacute; guide", "Best <strong>espresso</strong> machines"),
+            self._post(2, "Machines", "espresso is best")
+        ])
+        
+        assert self._search(engine, '"best espresso"') == [1]
+        assert self._search(engine, "espress*") in ([1, 2], [2, 1])
+        assert self._search(engine, "cafe") == [1]
+    
+    def test_search_respects_status_and_order(self):
+        """Test default status filtering and explicit orderby with a search"""
+        engine = self._engine([
+            self._post(1, "Launch plan"),
+            self._post(2, "Launch recap"),
+            self._post(3, "Launch draft", status="draft")
+        ])
+        
+        assert sorted(self._search(engine, "launch")) == [1, 2]
+        assert self._search(engine, "launch", orderby="id", order="asc") == [1, 2]
+        assert self._search(engine, "launch", status="draft") == [3]
+    
+    def test_deleted_posts_leave_index(self):
+        """Test that deletes remove the post from search results"""
+        engine = self._engine([self._post(1, "Launch plan"), self._post(2, "Launch recap")])
+        
+        del engine.client.posts[1]
+        engine.invalidate(f"{SITE}/wp-json/wp/v2/posts/1", deleted=True)
+        run(engine.refresh(COLLECTIONS["posts"]))
+        
+        assert self._search(engine, "launch") == [2]
+
+
+class TestClientMirrorHooks:
+    """Test how WordPressClient consults and notifies the mirror"""
+    
+    def test_get_served_from_mirror(self):
+        """Test that a mirror hit skips the network"""
+        client = WordPressClient(SITE, "user", "pass")
+        client.mirror = Mock()
+        client.mirror.lookup.return_value = [{"id": 1}]
+        
+        assert run(client.get("posts", {"per_page": 5})) == [{"id": 1}]
+        client.mirror.lookup.assert_called_once_with(f"{SITE}/wp-json/wp/v2/posts", {"per_page": 5})
+    
+    def test_writes_notify_mirror(self):
+        """Test that invalidation reaches the mirror with the delete flag"""
+        client = WordPressClient(SITE, "user", "pass")
+        client.mirror = Mock()
+        
+        client._invalidate_cache(f"{SITE}/wp-json/wp/v2/posts/3", deleted=True)
+        
+        client.mirror.invalidate.assert_called_once_with(f"{SITE}/wp-json/wp/v2/posts/3", True)
+
+
+# Run tests with: pytest tests/unit/test_sync.py -v
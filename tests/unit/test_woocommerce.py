@@ -0,0 +1,84 @@
+"""
+Unit tests for tools/woocommerce.py - bulk product updates
+"""
+
+import asyncio
+
+from tools.woocommerce import WooCommerceTools
+
+
+class FakeWP:
+    """Answers batch, plugin and per-product writes, recording what was sent"""
+    
+    pool_limit_per_host = 4
+    
+    def __init__(self):
+        self.posts = []
+        self.puts = []
+    
+    async def post(self, endpoint, data):
+        self.posts.append((endpoint, data))
+        if endpoint == "wc/products/batch":
+            return {"update": [{"id": item["id"]} for item in data["update"]]}
+        return {"results": [{"id": item["id"], "success": True} for item in data["items"]]}
+    
+    async def put(self, endpoint, data):
+        self.puts.append((endpoint, data))
+        return {"id": int(endpoint.rsplit("/", 1)[1])}
+
+
+PRODUCTS = [
+    {"id": 1, "stock_quantity": 5},
+    {"stock_quantity": 3},
+    {"id": 3, "stock_quantity": 0},
+    {"id": 4}
+]
+
+
+class TestBulkUpdate:
+    """Test that malformed inputs fail on their own"""
+    
+    def _update(self, backend):
+        wp = FakeWP()
+        response = asyncio.run(WooCommerceTools(wp).bulk_update_stock(PRODUCTS, backend=backend))
+        return wp, response
+    
+    def _check(self, response):
+        assert [r["success"] for r in response["results"]] == [True, False, True, False]
+        assert [r["id"] for r in response["results"]] == [1, None, 3, 4]
+        assert response["results"][1]["error"] == "Missing field 'id'"
+        assert response["results"][3]["error"] == "Missing field 'stock_quantity'"
+        assert response["processed"] == 4
+        assert response["succeeded"] == 2
+        assert response["failed"] == 2
+    
+    def test_batch_sends_valid_items_only(self):
+        """Test that the batch backend sends only the items it could build"""
+        wp, response = self._update("batch")
+        
+        self._check(response)
+        assert wp.posts == [("wc/products/batch", {"update": [
+            {"id": 1, "stock_quantity": 5, "stock_status": "instock"},
+            {"id": 3, "stock_quantity": 0, "stock_status": "outofstock"}
+        ]})]
+    
+    def test_plugin_sends_valid_items_only(self):
+        """Test that the plugin backend sends only the items it could build"""
+        wp, response = self._update("plugin")
+        
+        self._check(response)
+        assert wp.posts[0][1]["items"] == [PRODUCTS[0], PRODUCTS[2]]
+    
+    def test_individual_sends_valid_items_only(self):
+        """Test that the individual backend writes only the valid products"""
+        wp, response = self._update("individual")
+        
+        self._check(response)
+        assert sorted(wp.puts) == [
+            ("wc/products/1", {"stock_quantity": 5, "stock_status": "instock"}),
+            ("wc/products/3", {"stock_quantity": 0, "stock_status": "outofstock"})
+        ]
+        assert response["requests"] == 2
+
+
+# Run tests with: pytest tests/unit/test_woocommerce.py -v
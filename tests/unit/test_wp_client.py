@@ -3,11 +3,19 @@ Unit tests for wp_client.py - Pure functions only
 Phase 3 of CI Enhancement
 """
 
+import asyncio
+import json
+from contextlib import asynccontextmanager
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 
+import aiohttp
+
 # Import module to test
-from wp_client import WordPressClient
+from wp_client import (WordPressClient, RateLimiter, FileStream, parse_retry_after, RetryBudget,
+                       NotFoundError, RateLimitError, ResponseTooLargeError, ServerError,
+                       WordPressAPIError, is_retryable)
+from monitoring import MetricsCollector
 
 
 class TestWordPressClientPureFunctions:
@@ -177,4 +185,767 @@ class TestWordPressClientPureFunctions:
         assert self.client._sanitize_data(None) == None
 
 
+
+class TestConnectionPool:
+    """Test connector configuration for keep-alive pooling"""
+    
+    def _make_client(self, **kwargs):
+        return WordPressClient(
+            site_url="https://example.com",
+            username="testuser",
+            app_password="testpass",
+            **kwargs
+        )
+    
+    def test_keepalive_enabled_by_default(self):
+        """Test that keep-alive is the default transport mode"""
+        with patch.dict('os.environ', {}, clear=True):
+            client = self._make_client()
+        
+        assert client.keepalive is True
+        assert client.pool_limit == 30
+        assert client.pool_limit_per_host == 10
+    
+    def test_keepalive_disabled_from_env(self):
+        """Test WP_KEEPALIVE=false restores force-close mode"""
+        with patch.dict('os.environ', {'WP_KEEPALIVE': 'false'}):
+            client = self._make_client()
+        
+        assert client.keepalive is False
+    
+    def test_pooled_connector_settings(self):
+        """Test that the pooled connector keeps connections open"""
+        client = self._make_client(keepalive=True, pool_limit=50,
+                                   pool_limit_per_host=20, keepalive_timeout=15)
+        
+        async def build():
+            connector = client._create_connector()
+            try:
+                return (connector.force_close, connector.limit,
+                        connector.limit_per_host, connector.use_dns_cache)
+            finally:
+                await connector.close()
+        
+        force_close, limit, limit_per_host, use_dns_cache = asyncio.run(build())
+        
+        assert force_close is False
+        assert limit == 50
+        assert limit_per_host == 20
+        assert use_dns_cache is True
+        assert client._ssl_context is not None
+    
+    def test_force_close_connector(self):
+        """Test that disabling keep-alive closes every connection"""
+        client = self._make_client(keepalive=False)
+        
+        async def build():
+            connector = client._create_connector()
+            try:
+                return connector.force_close
+            finally:
+                await connector.close()
+        
+        assert asyncio.run(build()) is True
+
+
+
+class TestIterCollection:
+    """Test auto-pagination in iter_collection"""
+    
+    def setup_method(self):
+        self.client = WordPressClient(
+            site_url="https://example.com",
+            username="testuser",
+            app_password="testpass"
+        )
+    
+    def _fake_pages(self, total_items, per_page, send_headers=True):
+        """Build a get_page replacement serving `total_items` items"""
+        total_pages = max(1, -(-total_items // per_page))
+        state = {'in_flight': 0, 'peak': 0, 'requested': []}
+        
+        async def get_page(endpoint, params):
+            state['in_flight'] += 1
+            state['peak'] = max(state['peak'], state['in_flight'])
+            state['requested'].append(params['page'])
+            # Later pages answer faster to prove ordering is preserved
+            await asyncio.sleep(0.001 * (total_pages - params['page'] + 1))
+            state['in_flight'] -= 1
+            start = (params['page'] - 1) * params['per_page']
+            items = [{'id': i} for i in range(start, min(start + params['per_page'], total_items))]
+            headers = {'X-WP-Total': str(total_items), 'X-WP-TotalPages': str(total_pages)}
+            return items, headers if send_headers else {}
+        
+        return get_page, state
+    
+    def _collect(self, **kwargs):
+        async def run():
+            return [item['id'] async for item in self.client.iter_collection('posts', **kwargs)]
+        return asyncio.run(run())
+    
+    def test_yields_every_item_in_order(self):
+        """Test that all pages are read and items keep collection order"""
+        self.client.get_page, state = self._fake_pages(250, 10)
+        
+        ids = self._collect(per_page=10, prefetch=4)
+        
+        assert ids == list(range(250))
+        assert sorted(state['requested']) == list(range(1, 26))
+    
+    def test_prefetch_window_is_bounded(self):
+        """Test that no more than `prefetch` pages are in flight"""
+        self.client.get_page, state = self._fake_pages(100, 5)
+        
+        self._collect(per_page=5, prefetch=3)
+        
+        assert state['peak'] <= 3
+    
+    def test_without_total_pages_header(self):
+        """Test sequential fallback until a short page"""
+        self.client.get_page, state = self._fake_pages(23, 10, send_headers=False)
+        
+        ids = self._collect(per_page=10)
+        
+        assert ids == list(range(23))
+        assert state['requested'] == [1, 2, 3]
+    
+    def test_empty_collection(self):
+        """Test a collection with no items"""
+        self.client.get_page, state = self._fake_pages(0, 10)
+        
+        assert self._collect(per_page=10) == []
+        assert state['requested'] == [1]
+    
+    def test_total_pages_parsing(self):
+        """Test header parsing edge cases"""
+        assert WordPressClient._total_pages({'X-WP-TotalPages': '7'}) == 7
+        assert WordPressClient._total_pages({'X-WP-TotalPages': 'abc'}) is None
+        assert WordPressClient._total_pages({}) is None
+        assert WordPressClient._total_pages(None) is None
+
+
+
+class TestResponseCaching:
+    """Test GET caching and write invalidation in WordPressClient"""
+    
+    def setup_method(self):
+        self.client = WordPressClient(
+            site_url="https://example.com",
+            username="testuser",
+            app_password="testpass"
+        )
+        self.calls = []
+        
+        async def fake_request(method, url, return_meta=False, **kwargs):
+            self.calls.append((method, url, kwargs.get('headers')))
+            data = {"id": len(self.calls)}
+            if return_meta:
+                return data, {"status": 200, "headers": {"ETag": '"v1"'}, "size": 20}
+            return data
+        
+        self.client._request_with_retry = fake_request
+    
+    def test_repeat_get_served_from_cache(self):
+        """Test that a second read of the same post skips the network"""
+        async def run():
+            first = await self.client.get("posts/1")
+            second = await self.client.get("posts/1")
+            return first, second
+        
+        first, second = asyncio.run(run())
+        
+        assert first == second
+        assert len(self.calls) == 1
+    
+    def test_write_invalidates_cached_reads(self):
+        """Test that updating a post forces the next read to the network"""
+        async def run():
+            await self.client.get("posts/1")
+            await self.client.put("posts/1", {"title": "New"})
+            return await self.client.get("posts/1")
+        
+        result = asyncio.run(run())
+        
+        assert [c[0] for c in self.calls] == ['GET', 'PUT', 'GET']
+        assert result == {"id": 3}
+    
+    def test_read_overlapping_write_not_cached(self):
+        """Test that a GET answered before a write but finished after it is not cached"""
+        answered = asyncio.Event()
+        write_done = asyncio.Event()
+        calls = self.calls
+        
+        async def fake_request(method, url, return_meta=False, **kwargs):
+            calls.append((method, url, kwargs.get('headers')))
+            data = {"id": len(calls)}
+            if method == 'GET' and len(calls) == 1:
+                answered.set()
+                await write_done.wait()
+            if return_meta:
+                return data, {"status": 200, "headers": {}, "size": 20}
+            return data
+        
+        self.client._request_with_retry = fake_request
+        
+        async def run():
+            before = asyncio.ensure_future(self.client.get("posts/1"))
+            await answered.wait()
+            await self.client.put("posts/1", {"title": "New"})
+            write_done.set()
+            stale = await before
+            return stale, await self.client.get("posts/1")
+        
+        stale, after = asyncio.run(run())
+        
+        assert stale == {"id": 1}
+        assert after == {"id": 3}
+        assert [c[0] for c in self.calls] == ['GET', 'PUT', 'GET']
+    
+    def test_uncached_route_always_fetched(self):
+        """Test that routes without a TTL bypass the cache"""
+        async def run():
+            await self.client.get("wc/orders")
+            await self.client.get("wc/orders")
+        
+        asyncio.run(run())
+        
+        assert len(self.calls) == 2
+
+
+
+class TestRateLimiter:
+    """Test the token bucket rate limiter"""
+    
+    def test_burst_then_reject(self):
+        """Test that acquire succeeds up to the burst and then refuses"""
+        limiter = RateLimiter(max_requests=60, time_window=60, burst=3)
+        
+        async def run():
+            return [await limiter.acquire() for _ in range(4)]
+        
+        assert asyncio.run(run()) == [True, True, True, False]
+    
+    def test_wait_sleeps_until_next_token(self):
+        """Test that wait blocks for roughly one refill interval"""
+        limiter = RateLimiter(max_requests=20, time_window=1, burst=1)
+        
+        async def run():
+            loop = asyncio.get_running_loop()
+            await limiter.wait()
+            start = loop.time()
+            await limiter.wait()
+            return loop.time() - start
+        
+        elapsed = asyncio.run(run())
+        
+        assert 0.04 <= elapsed < 0.2
+    
+    def test_pause_delays_waiters(self):
+        """Test that a server-requested pause holds back the next token"""
+        limiter = RateLimiter(max_requests=100, time_window=1, burst=5)
+        
+        async def run():
+            loop = asyncio.get_running_loop()
+            limiter.pause(0.1)
+            assert not await limiter.acquire()
+            start = loop.time()
+            await limiter.wait()
+            return loop.time() - start
+        
+        assert asyncio.run(run()) >= 0.09
+    
+    def test_reset_refills_bucket(self):
+        """Test that reset restores the full burst"""
+        limiter = RateLimiter(max_requests=1, time_window=60, burst=2)
+        
+        async def run():
+            await limiter.acquire()
+            await limiter.acquire()
+            limiter.reset()
+            return await limiter.acquire()
+        
+        assert asyncio.run(run()) is True
+    
+    def test_parse_retry_after(self):
+        """Test Retry-After parsing for seconds, dates and junk"""
+        assert parse_retry_after("5") == 5.0
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("soon") is None
+        assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+
+
+class TestRequestCoalescing:
+    """Test single-flight sharing of identical in-flight GETs"""
+    
+    def setup_method(self):
+        self.client = WordPressClient(
+            site_url="https://example.com",
+            username="testuser",
+            app_password="testpass",
+            metrics=MetricsCollector()
+        )
+        self.calls = []
+        
+        async def fake_request(method, url, return_meta=False, params=None, **kwargs):
+            self.calls.append((method, url, params))
+            await asyncio.sleep(0.01)
+            if "fail" in url:
+                raise Exception("API Error 500")
+            data = {"id": len(self.calls)}
+            if return_meta:
+                return data, {"status": 200, "headers": {}, "size": 10}
+            return data
+        
+        self.client._request_with_retry = fake_request
+    
+    def test_identical_gets_share_one_request(self):
+        """Test that concurrent GETs for the same URL and params hit the network once"""
+        async def run():
+            return await asyncio.gather(*(
+                self.client.get("wc/orders", {"status": "processing", "page": 1})
+                for _ in range(5)
+            ))
+        
+        results = asyncio.run(run())
+        
+        assert len(self.calls) == 1
+        assert all(r == {"id": 1} for r in results)
+        assert self.client.coalesced_requests == 4
+        assert self.client.metrics.counters["coalesced_requests"] == 4
+    
+    def test_param_order_is_normalized(self):
+        """Test that parameter order does not defeat coalescing"""
+        async def run():
+            await asyncio.gather(
+                self.client.get("wc/orders", {"a": 1, "b": 2}),
+                self.client.get("wc/orders", {"b": 2, "a": 1}),
+                self.client.get("wc/orders", {"a": 1, "b": 3})
+            )
+        
+        asyncio.run(run())
+        
+        assert len(self.calls) == 2
+    
+    def test_errors_reach_every_waiter(self):
+        """Test that a failed shared request raises in every caller and is not reused"""
+        async def run():
+            first = await asyncio.gather(*(self.client.get("wc/fail") for _ in range(3)),
+                                         return_exceptions=True)
+            await asyncio.gather(self.client.get("wc/fail"), return_exceptions=True)
+            return first
+        
+        results = asyncio.run(run())
+        
+        assert all(isinstance(r, Exception) for r in results)
+        assert len(self.calls) == 2
+        assert self.client._inflight == {}
+    
+    def test_write_starts_fresh_reads(self):
+        """Test that GETs after a write do not join a GET issued before it"""
+        async def run():
+            before = asyncio.ensure_future(self.client.get("wc/orders"))
+            await asyncio.sleep(0.001)  # GET is on the wire, not yet answered
+            await self.client.put("wc/orders/1", {"status": "completed"})
+            after = await self.client.get("wc/orders")
+            return await before, after
+        
+        before, after = asyncio.run(run())
+        
+        assert before != after
+        assert [c[0] for c in self.calls] == ['GET', 'PUT', 'GET']
+
+
+class TestMediaUpload:
+    """Test streamed media uploads"""
+    
+    def test_file_stream_chunks_and_restarts(self, tmp_path):
+        """Test that the stream yields bounded chunks and can be replayed"""
+        path = tmp_path / "photo.jpg"
+        path.write_bytes(b"x" * 2500)
+        stream = FileStream(str(path), chunk_size=1000)
+        
+        async def read():
+            return [chunk async for chunk in stream]
+        
+        first = asyncio.run(read())
+        second = asyncio.run(read())
+        
+        assert [len(c) for c in first] == [1000, 1000, 500]
+        assert first == second
+        assert stream.size == 2500
+    
+    def test_missing_file_rejected(self, tmp_path):
+        """Test that uploading a missing file fails before any request"""
+        with pytest.raises(FileNotFoundError):
+            FileStream(str(tmp_path / "missing.png"))
+    
+    def test_upload_sends_raw_body_with_headers(self, tmp_path):
+        """Test that upload_media posts the file with type and disposition headers"""
+        path = tmp_path / "café.png"
+        path.write_bytes(b"\x89PNG" + b"0" * 100)
+        client = WordPressClient(
+            site_url="https://example.com",
+            username="testuser",
+            app_password="testpass"
+        )
+        sent = {}
+        
+        async def fake_request(method, url, **kwargs):
+            sent.update(kwargs, method=method, url=url)
+            sent["body"] = b"".join([chunk async for chunk in kwargs["data"]])
+            return {"id": 7, "source_url": "https://example.com/cafe.png"}
+        
+        client._request_with_retry = fake_request
+        result = asyncio.run(client.upload_media(str(path), title="Cafe"))
+        
+        assert result["id"] == 7
+        assert sent["method"] == "POST"
+        assert sent["url"].endswith("/wp-json/wp/v2/media")
+        assert sent["params"] == {"title": "Cafe"}
+        assert sent["headers"]["Content-Type"] == "image/png"
+        assert sent["headers"]["Content-Length"] == "104"
+        assert "filename*=UTF-8''caf%C3%A9.png" in sent["headers"]["Content-Disposition"]
+        assert sent["body"] == path.read_bytes()
+        assert sent["timeout"].total is None
+    
+    def test_upload_outlasts_request_timeout(self, tmp_path, monkeypatch):
+        """Test that a slowly read upload is not cut off by the API timeout"""
+        from aiohttp import web
+        
+        monkeypatch.setenv("WP_ALLOW_HTTP", "true")
+        path = tmp_path / "big.bin"
+        path.write_bytes(b"0" * (1024 * 1024))
+        
+        async def media(request):
+            received = 0
+            async for chunk in request.content.iter_chunked(64 * 1024):
+                received += len(chunk)
+                await asyncio.sleep(0.05)
+            return web.json_response({"id": 1, "size": received}, status=201)
+        
+        async def run():
+            app = web.Application(client_max_size=10 * 1024 * 1024)
+            app.router.add_post("/wp-json/wp/v2/media", media)
+            runner = web.AppRunner(app)
+            await runner.setup()
+            site = web.TCPSite(runner, "127.0.0.1", 0)
+            await site.start()
+            port = runner.addresses[0][1]
+            client = WordPressClient(f"http://127.0.0.1:{port}", "user", "pass", timeout=0.3)
+            try:
+                return await client.upload_media(str(path))
+            finally:
+                await client.close()
+                await runner.cleanup()
+        
+        assert asyncio.run(run()) == {"id": 1, "size": 1024 * 1024}
+
+
+
+class TestBatchRequests:
+    """Test packing writes into core batch/v1 calls"""
+    
+    def setup_method(self):
+        self.client = WordPressClient(
+            site_url="https://example.com",
+            username="testuser",
+            app_password="testpass"
+        )
+        self.batches = []
+        
+        async def fake_request(method, url, **kwargs):
+            requests = kwargs["json"]["requests"]
+            self.batches.append((method, url, requests))
+            if any(r["path"].endswith("/999") for r in requests):
+                raise Exception("API Error 500")
+            return {"responses": [
+                {"status": 404, "body": {"code": "rest_post_invalid_id", "message": "Invalid post ID."}}
+                if r["path"].endswith("/404") else {"status": 200, "body": {"id": r["path"]}}
+                for r in requests
+            ]}
+        
+        self.client._request_with_retry = fake_request
+    
+    def test_batch_request_paths(self):
+        """Test that sub-requests use paths relative to /wp-json"""
+        assert self.client.batch_request("PUT", "posts/5", {"title": "x"}) == {
+            "method": "PUT", "path": "/wp/v2/posts/5", "body": {"title": "x"}
+        }
+        assert self.client.batch_request("DELETE", "posts/5?force=true")["path"] == "/wp/v2/posts/5?force=true"
+    
+    def test_chunks_of_25_map_back_to_inputs(self):
+        """Test chunking and per-item status mapping, including a failed chunk"""
+        ids = [404] + list(range(1, 60)) + [999]
+        requests = [self.client.batch_request("PUT", f"posts/{i}", {"status": "draft"}) for i in ids]
+        
+        results, stats = asyncio.run(self.client.batch(requests, concurrency=2))
+        
+        assert [len(batch[2]) for batch in self.batches] == [25, 25, 11]
+        assert all(batch[1] == "https://example.com/wp-json/batch/v1" for batch in self.batches)
+        assert str(results[0]) == "Invalid post ID."
+        assert results[1] == {"id": "/wp/v2/posts/1"}
+        assert [str(r) for r in results[50:]] == ["API Error 500"] * 11
+        assert stats["requests"] == 3
+        assert stats["failed"] == 12
+        assert stats["concurrency"] == 2
+    
+    def test_batch_invalidates_written_routes(self):
+        """Test that every batched route is invalidated like a single write"""
+        invalidated = []
+        self.client._invalidate_cache = lambda url, deleted=False: invalidated.append((url, deleted))
+        
+        asyncio.run(self.client.batch([self.client.batch_request("PUT", "posts/1", {"title": "New"}),
+                                       self.client.batch_request("DELETE", "posts/2")]))
+        
+        assert invalidated == [("https://example.com/wp-json/wp/v2/posts/1", False),
+                               ("https://example.com/wp-json/wp/v2/posts/2", True)]
+
+
+
+class FakeResponse:
+    """Just enough of aiohttp.ClientResponse for _handle_response"""
+    
+    def __init__(self, status, body=None, headers=None):
+        self.status = status
+        self.headers = {"Content-Type": "application/json", **(headers or {})}
+        self._body = json.dumps(body if body is not None else {}).encode()
+    
+    async def read(self):
+        return self._body
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc):
+        return False
+
+
+class TestRetryPolicy:
+    """Test which failures are retried, how long to wait and the retry budget"""
+    
+    def _client(self, monkeypatch, responses, budget=None):
+        client = WordPressClient("https://example.com", "user", "pass")
+        client.retry_budget = budget or RetryBudget(ratio=0.2, minimum=10)
+        self.sent = []
+        self.sleeps = []
+        
+        class Session:
+            def request(session, method, url, **kwargs):
+                self.sent.append(method)
+                response = responses.pop(0)
+                if isinstance(response, Exception):
+                    raise response
+                return response
+        
+        @asynccontextmanager
+        async def get_session():
+            yield Session()
+        
+        async def sleep(seconds):
+            self.sleeps.append(seconds)
+        
+        client.get_session = get_session
+        monkeypatch.setattr(asyncio, "sleep", sleep)
+        return client
+    
+    def test_classification(self):
+        """Test the retryable method and status matrix"""
+        refused = aiohttp.ClientConnectorError(None, OSError(111, "Connection refused"))
+        
+        assert is_retryable("GET", ServerError("API Error 503", 503))
+        assert is_retryable("PUT", asyncio.TimeoutError())
+        assert is_retryable("DELETE", aiohttp.ServerDisconnectedError())
+        assert is_retryable("POST", refused)
+        assert is_retryable("POST", RateLimitError("slow down"))
+        assert not is_retryable("POST", ServerError("API Error 503", 503))
+        assert not is_retryable("POST", asyncio.TimeoutError())
+        assert not is_retryable("GET", NotFoundError("Endpoint not found.", 404))
+        assert not is_retryable("GET", WordPressAPIError("API Error 400", 400))
+        assert not is_retryable("GET", ValueError("bug"))
+    
+    def test_client_errors_fail_immediately(self, monkeypatch):
+        """Test that a 404 is raised as a typed error after a single attempt"""
+        client = self._client(monkeypatch, [FakeResponse(404, {"code": "rest_post_invalid_id"})])
+        
+        with pytest.raises(NotFoundError) as error:
+            asyncio.run(client._request_with_retry("GET", "https://example.com/wp-json/wp/v2/posts/9"))
+        
+        assert error.value.code == "rest_post_invalid_id"
+        assert self.sent == ["GET"]
+        assert self.sleeps == []
+    
+    def test_server_errors_retried_with_jitter(self, monkeypatch):
+        """Test that 5xx GETs are retried with capped, randomized delays"""
+        client = self._client(monkeypatch, [FakeResponse(502), FakeResponse(500), FakeResponse(200, {"id": 1})])
+        
+        result = asyncio.run(client._request_with_retry("GET", "https://example.com/wp-json/wp/v2/posts/1"))
+        
+        assert result == {"id": 1}
+        assert len(self.sleeps) == 2
+        assert all(client.retry_base <= delay <= client.retry_cap for delay in self.sleeps)
+    
+    def test_retry_after_honoured(self, monkeypatch):
+        """Test that a 503 Retry-After replaces the computed backoff"""
+        client = self._client(monkeypatch, [FakeResponse(503, headers={"Retry-After": "4"}),
+                                            FakeResponse(200, {"id": 1})])
+        
+        asyncio.run(client._request_with_retry("GET", "https://example.com/wp-json/wp/v2/posts/1"))
+        
+        assert self.sleeps == [4.0]
+    
+    def test_post_not_repeated_after_server_error(self, monkeypatch):
+        """Test that a failed POST is not sent twice"""
+        client = self._client(monkeypatch, [FakeResponse(500), FakeResponse(201, {"id": 2})])
+        
+        with pytest.raises(ServerError):
+            asyncio.run(client._request_with_retry("POST", "https://example.com/wp-json/wp/v2/posts",
+                                                   json={"title": "x"}))
+        
+        assert self.sent == ["POST"]
+    
+    def test_budget_stops_retry_storm(self, monkeypatch):
+        """Test that retries stop once they exceed the budget"""
+        budget = RetryBudget(ratio=0.0, minimum=2)
+        client = self._client(monkeypatch, [FakeResponse(500)] * 9, budget=budget)
+        
+        async def run():
+            for _ in range(3):
+                with pytest.raises(ServerError):
+                    await client._request_with_retry("GET", "https://example.com/wp-json/wp/v2/posts")
+        
+        asyncio.run(run())
+        
+        # 3 first attempts, but only 2 retries in total
+        assert len(self.sent) == 5
+    
+    def test_budget_scales_with_traffic(self):
+        """Test that each request adds to the retry allowance"""
+        budget = RetryBudget(ratio=0.5, minimum=0)
+        for _ in range(4):
+            budget.record_request()
+        
+        assert [budget.try_spend() for _ in range(3)] == [True, True, False]
+    
+    def test_history_bounded_without_retries(self):
+        """Test that requests outside the window are dropped even if nothing retries"""
+        budget = RetryBudget(ratio=0.2, minimum=10, window=10.0)
+        clock = [0.0]
+        budget._now = lambda: clock[0]
+        for _ in range(100000):
+            clock[0] += 0.01
+            budget.record_request()
+        
+        assert len(budget._requests) <= 1001
+
+
+class StreamedResponse:
+    """A collection page whose body arrives in small pieces"""
+    
+    def __init__(self, items, total_pages=None, break_after=None, content_length=True):
+        self.status = 200
+        self.headers = {"Content-Type": "application/json"}
+        if total_pages is not None:
+            self.headers["X-WP-TotalPages"] = str(total_pages)
+        self.body = json.dumps(items).encode()
+        self.content_length = len(self.body) if content_length else None
+        self.break_after = break_after
+        self.content = self
+    
+    async def iter_chunked(self, size):
+        for start in range(0, len(self.body), 10):
+            if self.break_after is not None and start >= self.break_after:
+                raise aiohttp.ClientPayloadError("Response payload is not completed")
+            yield self.body[start:start + 10]
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc):
+        return False
+
+
+class TestStreamedCollections:
+    """Test item-by-item parsing of collection pages"""
+    
+    def _client(self, pages, max_bytes=None):
+        client = WordPressClient("https://example.com", "user", "pass")
+        if max_bytes is not None:
+            client.max_response_bytes = max_bytes
+        self.requested = []
+        
+        class Session:
+            def request(session, method, url, params=None, **kwargs):
+                self.requested.append(params['page'])
+                return pages[len(self.requested) - 1]
+        
+        @asynccontextmanager
+        async def get_session():
+            yield Session()
+        
+        client.get_session = get_session
+        return client
+    
+    def _collect(self, client, **kwargs):
+        async def run():
+            return [item['id'] async for item in client.iter_collection('posts', stream=True, **kwargs)]
+        return asyncio.run(run())
+    
+    def test_pages_streamed_in_order(self):
+        """Test that every page is read and items keep collection order"""
+        pages = [StreamedResponse([{"id": i} for i in range(start, start + 3)], total_pages=3)
+                 for start in (0, 3, 6)]
+        
+        assert self._collect(self._client(pages), per_page=3) == list(range(9))
+        assert self.requested == [1, 2, 3]
+    
+    def test_without_total_pages_header(self):
+        """Test that pages are read until a short one"""
+        pages = [StreamedResponse([{"id": 0}, {"id": 1}]), StreamedResponse([{"id": 2}])]
+        
+        assert self._collect(self._client(pages), per_page=2) == [0, 1, 2]
+    
+    def test_body_size_guard(self):
+        """Test that oversized bodies fail with or without Content-Length"""
+        items = [{"id": i, "title": "x" * 50} for i in range(10)]
+        
+        for response in (StreamedResponse(items), StreamedResponse(items, content_length=False)):
+            with pytest.raises(ResponseTooLargeError):
+                self._collect(self._client([response], max_bytes=200))
+    
+    def test_early_close_leaves_no_task(self):
+        """Test that stopping after a few items cancels the producer and frees its slot"""
+        client = self._client([StreamedResponse([{"id": i} for i in range(100)], total_pages=1)])
+        
+        async def run():
+            items = client.iter_collection('posts', stream=True)
+            received = [await items.__anext__() for _ in range(2)]
+            await items.aclose()
+            pending = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+            return received, pending
+        
+        received, pending = asyncio.run(run())
+        
+        assert [item['id'] for item in received] == [0, 1]
+        assert pending == []
+        assert client.concurrency.in_flight == 0
+    
+    def test_broken_body_not_retried_after_items(self):
+        """Test that a body failing mid-way is not re-requested once items were yielded"""
+        items = [{"id": i} for i in range(10)]
+        client = self._client([StreamedResponse(items, total_pages=1, break_after=40)] * 3)
+        received = []
+        
+        async def run():
+            async for item in client.iter_collection('posts', stream=True):
+                received.append(item['id'])
+        
+        with pytest.raises(WordPressAPIError, match="broke off"):
+            asyncio.run(run())
+        
+        assert received
+        assert self.requested == [1]
+
+
+
 # Run tests with: pytest tests/unit/test_wp_client.py -v